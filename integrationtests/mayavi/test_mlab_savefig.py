@@ -9,7 +9,8 @@ import numpy
 from mayavi import mlab
 from mayavi.core.engine import Engine
 from mayavi.core.off_screen_engine import OffScreenEngine
-from mayavi.tools.figure import savefig, screenshot
+from mayavi.tools.figure import savefig, screenshot, ScreenCapture
+from mayavi.tools.render_farm import render_batch
 
 from common import TestCase
 
@@ -21,6 +22,13 @@ def create_quiver3d():
     mlab.quiver3d(x, y, z, u, v, w, scalars=s)
 
 
+def build_quiver3d(figure, scale):
+    if scale < 0:
+        raise ValueError('Negative scale')
+    create_quiver3d()
+    mlab.view(distance=30*scale, figure=figure)
+
+
 # Note: the figure(window) size is delibrately set to be smaller than
 # the required size in `savefig`, this forces the re-rendering to
 # occur and catch any potential ill rendering
@@ -96,6 +104,71 @@ class TestMlabSavefigUnitTest(unittest.TestCase):
             # Then
             self.assertEqual(data.shape, (sz[1], sz[0], 4))
 
+    def test_mlab_screenshot_out(self):
+        # Given
+        engine = Engine()
+        self.setup_engine_and_figure(engine)
+        create_quiver3d()
+        sz = self.figure.scene.get_size()
+        out = numpy.zeros((sz[1], sz[0], 3), numpy.uint8)
+
+        # When
+        data = screenshot(mode='rgb', out=out)
+
+        # Then
+        self.assertTrue(data is out)
+        numpy.testing.assert_array_equal(out, screenshot(mode='rgb'))
+
+    def test_screen_capture_reuses_buffers(self):
+        # Given
+        engine = Engine()
+        self.setup_engine_and_figure(engine)
+        create_quiver3d()
+        sz = self.figure.scene.get_size()
+        capture = ScreenCapture(self.figure, double_buffered=True)
+
+        # When
+        first = capture.capture()
+        second = capture.capture()
+        third = capture.capture()
+
+        # Then
+        self.assertEqual(first.shape, (sz[1], sz[0], 3))
+        self.assertFalse(numpy.may_share_memory(first, second))
+        self.assertTrue(numpy.may_share_memory(first, third))
+        numpy.testing.assert_array_equal(second, screenshot(mode='rgb'))
+
+
+class TestRenderBatchUnitTest(unittest.TestCase):
+
+    @unittest.skipIf(os.environ.get("TRAVIS", False),
+                     ("Offscreen rendering is not tested on Travis "
+                      "due to lack of GLX support"))
+    def test_render_batch(self):
+        # Given
+        params = [dict(scale=1), dict(scale=-1), dict(scale=2)]
+
+        # When
+        results = list(render_batch(build_quiver3d, params, n_workers=2,
+                                    size=(90, 100), output='array'))
+
+        # Then
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertFalse(results[0].failed)
+        self.assertEqual(results[0].image.shape, (100, 90, 3))
+        self.assertTrue(results[1].failed)
+        self.assertIn('Negative scale', results[1].error)
+        self.assertIsNone(results[1].image)
+        self.assertTrue(all(r.elapsed >= 0 for r in results))
+
+    @unittest.skipIf(os.environ.get("TRAVIS", False),
+                     ("Offscreen rendering is not tested on Travis "
+                      "due to lack of GLX support"))
+    def test_render_batch_png(self):
+        results = list(render_batch(build_quiver3d, [dict(scale=1)],
+                                    n_workers=1, size=(90, 100)))
+        self.assertTrue(results[0].image.startswith(b'\x89PNG'))
+
 
 class TestMlabSavefig(TestCase):
 
@@ -103,8 +176,11 @@ class TestMlabSavefig(TestCase):
         self.main()
 
     def do(self):
-        suite = unittest.TestLoader().loadTestsFromTestCase(
-            TestMlabSavefigUnitTest)
+        loader = unittest.TestLoader()
+        suite = unittest.TestSuite([
+            loader.loadTestsFromTestCase(TestMlabSavefigUnitTest),
+            loader.loadTestsFromTestCase(TestRenderBatchUnitTest),
+        ])
 
         result = unittest.TextTestRunner().run(suite)
 
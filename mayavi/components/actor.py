@@ -51,6 +51,18 @@ class Actor(Component):
     # Texture coord generator.
     tcoord_generator = Instance(tvtk.Object, allow_none=True)
 
+    # Render a lighter proxy of the data while the user interacts with
+    # the scene, when the `lod_interaction` mode of the scene is on.
+    enable_lod = Bool(True, desc='if a lighter proxy of the data is '
+                                 'rendered while interacting')
+
+    ########################################
+    # Private traits.
+
+    # The mapper and filter rendering the proxy while interacting.
+    _lod_mapper = Instance(tvtk.Mapper)
+    _lod_filter = Instance(tvtk.Object)
+
     ######################################################################
     # `object` interface
     ######################################################################
@@ -58,7 +70,7 @@ class Actor(Component):
         d = super(Actor, self).__get_pure_state__()
         for attr in ('texture', 'texture_source_object',
                      'enable_texture', 'tcoord_generator_mode',
-                     'tcoord_generator'):
+                     'tcoord_generator', '_lod_mapper', '_lod_filter'):
             d.pop(attr,None)
         return d
 
@@ -181,6 +193,70 @@ class Actor(Component):
         super(Actor, self)._scene_changed(old, new)
         self._foreground_changed_for_scene(None, new.foreground)
 
+    def _interacting_changed_for_scene(self, old, new):
+        actor = self.actor
+        if actor is None:
+            return
+        mapper = None
+        if new and self.enable_lod and self.scene.lod_interaction:
+            mapper = self._get_lod_mapper()
+        if mapper is None:
+            mapper = self.mapper
+        if actor.mapper is not mapper:
+            actor.mapper = mapper
+
+    def _enable_lod_changed(self, value):
+        if not value:
+            self._lod_mapper = None
+            self._lod_filter = None
+
+    def _get_lod_mapper(self):
+        """Return a mapper rendering a proxy of the data with at most
+        about `scene.lod_max_points` points, or None if the data is
+        small enough to be rendered as is.
+        """
+        mapper = self.mapper
+        if not isinstance(mapper, tvtk.PolyDataMapper):
+            return None
+        data = mapper.input
+        max_points = self.scene.lod_max_points
+        if data is None or data.number_of_points <= max_points:
+            return None
+
+        # Decimate surfaces by clustering their vertices, which is fast
+        # enough to be done when an interaction starts, and sample the
+        # points of the other data.
+        has_cells = data.number_of_polys + data.number_of_strips > 0
+        lod_filter = self._lod_filter
+        if has_cells:
+            if not isinstance(lod_filter, tvtk.QuadricClustering):
+                lod_filter = tvtk.QuadricClustering(
+                    auto_adjust_number_of_divisions=False
+                )
+            # A closed surface cut into n**3 bins keeps about 4*n**2
+            # points.
+            n = max(int((max_points/4.0)**0.5), 2)
+            lod_filter.number_of_divisions = (n, n, n)
+        else:
+            if not isinstance(lod_filter, tvtk.MaskPoints):
+                lod_filter = tvtk.MaskPoints(generate_vertices=True,
+                                             single_vertex_per_cell=True,
+                                             random_mode=True)
+            lod_filter.on_ratio = max(data.number_of_points//max_points, 1)
+            lod_filter.maximum_number_of_points = max_points
+        self._lod_filter = lod_filter
+        lod_filter._vtk_obj.SetInputConnection(
+            mapper._vtk_obj.GetInputConnection(0, 0)
+        )
+
+        lod_mapper = self._lod_mapper
+        if lod_mapper is None:
+            lod_mapper = self._lod_mapper = tvtk.PolyDataMapper()
+        # Use the same colors as the mapper.
+        lod_mapper.shallow_copy(mapper)
+        lod_mapper.set_input_connection(lod_filter.output_port)
+        return lod_mapper
+
     def _enable_texture_changed(self, value):
         if self.texture_source_object is None :
             self.actor.texture = None
@@ -13,7 +13,7 @@ from traits.api import (HasTraits, Str, Property, Any, Button,
                                   ToolbarButton)
 from traitsui.api import View, Item, Group,\
         TextEditor, TreeEditor, TreeNode, ListEditor, ITreeNode
-from pyface.api import ImageResource
+from pyface.image_resource import ImageResource
 from pyface.resource.api import resource_path
 
 # Local imports.
@@ -7,6 +7,11 @@ highest level.
 # License: BSD Style.
 
 # Standard library imports.
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
 # VTK is used to just shut off the warnings temporarily.
 try:
     import vtk
@@ -29,14 +34,30 @@ from mayavi.core.base import Base
 from mayavi.core.scene import Scene
 from mayavi.core.common import error, process_ui_events
 from mayavi.core.registry import registry
+from mayavi.core.session import is_session, load_session_state, \
+     save_session
 from mayavi.core.adder_node import AdderNode, SceneAdderNode
 from mayavi.preferences.api import preference_manager
-from mayavi.core.ui.mayavi_scene import viewer_factory
 
 
 ######################################################################
 # Utility functions.
 ######################################################################
+def _update_reader(reader):
+    """Update the given VTK reader and return the error message or
+    None.  This is called from the worker threads of `Engine.open_many`
+    and only reads the file, the source is set up on the calling thread.
+    """
+    try:
+        reader.Update()
+        if reader.GetErrorCode() != 0:
+            return vtk.vtkErrorCode.GetStringFromErrorCode(
+                reader.GetErrorCode())
+    except Exception as exc:
+        return str(exc)
+    return None
+
+
 def _id_generator():
     """Returns a sequence of numbers for the title of the scene
     window."""
@@ -96,7 +117,7 @@ class Engine(HasStrictTraits):
     # user specified scene with the Engine and have the ability to
     # load saved visualizations using the new scene.  Handy for things
     # like off-screen rendering.
-    scene_factory = Callable(viewer_factory)
+    scene_factory = Callable
 
     # Are we running?
     running = Bool(False, record=False)
@@ -249,12 +270,21 @@ class Engine(HasStrictTraits):
     def save_visualization(self, file_or_fname):
         """Given a file or a file name, this saves the current
         visualization to the file.
+
+        If the file name ends with `.mv2d` or is an existing directory,
+        the visualization is saved as a binary session: a directory
+        where the large arrays are stored as separate blobs, which are
+        only written if they changed since the last save.  See
+        `mayavi.core.session`.
         """
         # Save the state of VTK's global warning display.
         o = vtk.vtkObject
         w = o.GetGlobalWarningDisplay()
         o.SetGlobalWarningDisplay(0) # Turn it off.
         try:
+            if is_session(file_or_fname):
+                save_session(self, file_or_fname)
+                return
             #FIXME: This is for streamline seed point widget position which
             #does not get serialized correctly
             if is_old_pipeline():
@@ -274,28 +304,38 @@ class Engine(HasStrictTraits):
 
     @recordable
     def load_visualization(self, file_or_fname):
-        """Given a file/file name this loads the visualization."""
+        """Given a file/file name this loads the visualization.  Binary
+        sessions saved in a directory are also supported, their large
+        arrays are read when they are first accessed.
+        """
         # Save the state of VTK's global warning display.
         o = vtk.vtkObject
         w = o.GetGlobalWarningDisplay()
         o.SetGlobalWarningDisplay(0) # Turn it off.
         try:
             # Get the state from the file.
-            state = state_pickler.load_state(file_or_fname)
+            if is_session(file_or_fname):
+                state = load_session_state(file_or_fname)
+            else:
+                state = state_pickler.load_state(file_or_fname)
             state_pickler.update_state(state)
             # Add the new scenes.
+            scenes = []
             for scene_state in state.scenes:
                 self.new_scene()
                 scene = self.scenes[-1]
-                # Disable rendering initially.
+                # Disable rendering until all the scenes are loaded.
                 if scene.scene is not None:
                     scene.scene.disable_render = True
+                    scenes.append(scene.scene)
                 # Update the state.
                 state_pickler.update_state(scene_state)
+                if scene_state.scene is not None:
+                    scene_state.scene.pop('disable_render', None)
                 scene.__set_pure_state__(scene_state)
-                # Setting the state will automatically reset the
-                # disable_render.
-                scene.render()
+            # Render each scene once.
+            for scene in scenes:
+                scene.disable_render = False
         finally:
             # Reset the warning state.
             o.SetGlobalWarningDisplay(w)
@@ -336,6 +376,95 @@ class Engine(HasStrictTraits):
             if src is not None:
                 return src
 
+    @recordable
+    def open_many(self, filenames, scene=None, n_workers=None):
+        """Open many files at once, in either the current scene or the
+        passed `scene`, and return the list of sources created.
+
+        The sources are created on the calling thread and the files
+        are read concurrently by their VTK readers in a pool of
+        `n_workers` threads (as many as the CPUs allow if None), the
+        readers releasing the GIL while they read.  The sources are
+        then initialized on the calling thread and added
+        to the pipeline in one batch with rendering disabled, so the
+        scene is rendered once.  Sources created by reader factories
+        are created when the sources are added.
+
+        The list returned has None for the files that could not be
+        read.
+        """
+        filenames = list(filenames)
+        readers = [registry.get_file_reader(f) for f in filenames]
+        missing = [f for f, r in zip(filenames, readers) if r is None]
+        if len(missing) > 0:
+            msg = 'No suitable reader found for the files %s'%\
+                    ', '.join(missing)
+            error(msg)
+
+        # Create the sources handled by source classes and set up their
+        # readers here, only the VTK readers are updated in the worker
+        # threads.
+        sources = [None]*len(filenames)
+        jobs = []
+        failed = []
+        for i, (f, r) in enumerate(zip(filenames, readers)):
+            if r is None or r.factory is not None:
+                continue
+            try:
+                src = r.get_callable()()
+                prepare = getattr(src, 'prepare_reader', None)
+                vtk_reader = prepare(f) if prepare is not None else None
+            except Exception as exc:
+                failed.append('%s: %s'%(f, exc))
+                continue
+            sources[i] = src
+            if vtk_reader is not None:
+                jobs.append((i, f, vtk_reader))
+        job_readers = [vr for i, f, vr in jobs]
+        if ThreadPoolExecutor is None or len(jobs) < 2:
+            errors = list(map(_update_reader, job_readers))
+        else:
+            with ThreadPoolExecutor(n_workers) as pool:
+                errors = list(pool.map(_update_reader, job_readers))
+        for (i, f, vr), err in zip(jobs, errors):
+            if err is not None:
+                sources[i] = None
+                failed.append('%s: %s'%(f, err))
+        for i, src in enumerate(sources):
+            if src is None:
+                continue
+            try:
+                src.initialize(filenames[i])
+            except Exception as exc:
+                sources[i] = None
+                failed.append('%s: %s'%(filenames[i], exc))
+        if len(failed) > 0:
+            error('Failed to read the files:\n%s'%'\n'.join(failed))
+
+        passed_scene = scene
+        if scene is None:
+            scene = self.current_scene
+        if scene is None:
+            scene = self.new_scene()
+        sc = scene.scene
+        if sc is not None:
+            old_disable_render = sc.disable_render
+            sc.busy = True
+            sc.disable_render = True
+        try:
+            for i, (f, r) in enumerate(zip(filenames, readers)):
+                if r is not None and r.factory is not None:
+                    # Factory functions are passed the filename and a
+                    # reference to the engine.
+                    sources[i] = r.get_callable()(f, self)
+                if sources[i] is not None:
+                    self.add_source(sources[i], passed_scene)
+        finally:
+            if sc is not None:
+                sc.disable_render = old_disable_render
+                sc.busy = False
+        return sources
+
     def record(self, msg):
         """This is merely a convenience method to record messages to the
         script recorder.
@@ -507,6 +636,12 @@ class Engine(HasStrictTraits):
     ######################################################################
     # Non-public interface
     ######################################################################
+    def _scene_factory_default(self):
+        # Imported here since this imports the UI toolkit, which engines
+        # not using it (like the NullEngine) do not need.
+        from mayavi.core.ui.mayavi_scene import viewer_factory
+        return viewer_factory
+
     def _on_select(self, object):
         """Called by the EngineTree when an object on the view is
         selected.  This basically sets the current object and current
@@ -8,8 +8,17 @@ sources derive.
 
 # Standard library imports.
 import re
-from os.path import split, join, isfile
-from glob import glob
+import threading
+import time
+from collections import OrderedDict
+from os import curdir, listdir, stat
+from os.path import abspath, split, join, isfile
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+import numpy
 
 # Enthought library imports.
 from traits.api import (Any, Bool, Button, Float, List, Str, Instance, Int,
@@ -17,65 +26,251 @@ from traits.api import (Any, Bool, Button, Float, List, Str, Instance, Int,
 from traitsui.api import Group, HGroup, Item, FileEditor, RangeEditor
 from apptools.persistence.state_pickler import set_state
 from apptools.persistence.file_path import FilePath
+from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.source import Source
 from mayavi.core.common import handle_children_state
 
 
+# Directory modification times more recent than this (in seconds) are
+# not trusted to detect new files, since the file system clock may have
+# a coarse resolution.
+MTIME_RESOLUTION = 2.0
+
+# The number of file series cached by `get_file_series`.
+FILE_SERIES_CACHE_SIZE = 64
+
+
 ######################################################################
 # Utility functions.
 ######################################################################
-def get_file_list(file_name):
+class FileSeries(object):
+    """ An index of the files in a directory that form a time series
+    with a given file, see `get_file_list` for the naming convention.
+
+    The directory is listed once and each file name is parsed once.
+    Calling `update` only re-lists the directory if its modification
+    time changed, or is too recent to be trusted, and only parses the
+    names of the new files, so newly written steps of a running
+    simulation are cheaply discovered.
+
+    The sorted list of files is available as `files` and the index of
+    each file as the numpy array `indices`, so `files[i]` is the file
+    with index `indices[i]`.
+    """
+
+    def __init__(self, file_name):
+        # The matching is done only for the basename of the file.
+        f_dir, f_base = split(file_name)
+        self.directory = f_dir
+        # Find the head and tail of the file pattern.
+        self.head = re.sub("[0-9]+[^0-9]*$", "", f_base)
+        self.tail = re.sub("^.*[0-9]+", "", f_base)
+        self.files = []
+        self.indices = numpy.empty((0,), float)
+        # Parsed index (or None if invalid) of every name seen.
+        self._parsed = {}
+        self._mtime = None
+
+    def update(self, force=False):
+        """Rescan the directory if it has changed, or always if `force`
+        is True.  Returns the list of the files added to the series."""
+        path = self.directory or curdir
+        try:
+            mtime = stat(path).st_mtime
+        except OSError:
+            mtime = None
+        # Files added within the same tick of the file system clock do
+        # not change the modification time, so a recent one is not
+        # trusted.
+        if not force and mtime is not None and mtime == self._mtime and \
+           time.time() - mtime > MTIME_RESOLUTION:
+            return []
+        try:
+            names = listdir(path)
+        except OSError:
+            names = []
+
+        parsed = self._parsed
+        get_index = self._get_index
+        new = [x for x in names if x not in parsed]
+        for name in new:
+            parsed[name] = get_index(name)
+        if len(parsed) > len(names):
+            # Forget about removed files.
+            current = set(names)
+            for name in list(parsed.keys()):
+                if name not in current:
+                    del parsed[name]
+
+        # Sort the files based on the index value.
+        series = sorted((idx, name) for name, idx in parsed.items()
+                        if idx is not None)
+        f_dir = self.directory
+        old = set(self.files)
+        self.files = [join(f_dir, name) for idx, name in series]
+        self.indices = numpy.array([idx for idx, name in series], float)
+        self._mtime = mtime
+        return [x for x in self.files if x not in old]
+
+    def timestep(self, index):
+        """Return the position in `files` of the file with the given
+        index, or -1 if there is no such file."""
+        i = numpy.searchsorted(self.indices, index)
+        if i < len(self.indices) and self.indices[i] == index:
+            return int(i)
+        return -1
+
+    def _get_index(self, name):
+        """Return the index of the file, or None if the name does not
+        belong to the series."""
+        head, tail = self.head, self.tail
+        n_head, n_tail = len(head), len(tail)
+        if len(name) <= n_head + n_tail or \
+           not name.startswith(head) or not name.endswith(tail):
+            return None
+        middle = name[n_head:len(name) - n_tail]
+        # Make sure the files are really part of a timeseries.  This
+        # can happen in cases like so: 5_2_1.vtk and 5_2_1s.vtk will
+        # both match but 5_2_1s.vtk is obviously not a valid time
+        # series file.
+        if not middle[0].isdigit():
+            return None
+        try:
+            return float(middle)
+        except ValueError:
+            return None
+
+
+# Caches the `FileSeries` for each directory and file pattern, the least
+# recently used are dropped beyond `FILE_SERIES_CACHE_SIZE`.
+_file_series_cache = OrderedDict()
+
+def get_file_series(file_name, rescan=False):
+    """ Return the up to date `FileSeries` of the given file.  The
+    series of each directory and file pattern is cached so repeated
+    calls only rescan the directory when it has changed, or always if
+    `rescan` is True."""
+    series = FileSeries(file_name)
+    key = (abspath(series.directory), series.directory, series.head,
+           series.tail)
+    series = _file_series_cache.pop(key, series)
+    _file_series_cache[key] = series
+    while len(_file_series_cache) > FILE_SERIES_CACHE_SIZE:
+        _file_series_cache.popitem(last=False)
+    series.update(force=rescan)
+    return series
+
+
+def get_file_list(file_name, rescan=False):
     """ Given a file name, this function treats the file as a part of
     a series of files based on the index of the file and tries to
     determine the list of files in the series.  The file name of a
     file in a time series must be of the form 'some_name[0-9]*.ext'.
     That is the integers at the end of the file determine what part of
     the time series the file belongs to.  The files are then sorted as
-    per this index."""
-
-    # The matching is done only for the basename of the file.
-    f_dir, f_base = split(file_name)
-    # Find the head and tail of the file pattern.
-    head = re.sub("[0-9]+[^0-9]*$", "", f_base)
-    tail = re.sub("^.*[0-9]+", "", f_base)
-    pattern = head+"[0-9]*"+tail
-    # Glob the files for the pattern.
-    _files = glob(join(f_dir, pattern))
-
-    # A simple function to get the index from the file.
-    def _get_index(f, head=head, tail=tail):
-        base = split(f)[1]
-        result = base.replace(head, '')
-        return float(result.replace(tail, ''))
-
-    # Before sorting make sure the files in the globbed series are
-    # really part of a timeseries.  This can happen in cases like so:
-    # 5_2_1.vtk and 5_2_1s.vtk will be globbed but 5_2_1s.vtk is
-    # obviously not a valid time series file.
-    files = []
-    for x in _files:
-        try:
-            _get_index(x)
-        except ValueError:
-            pass
-        else:
-            files.append(x)
-
-    # Sort the globbed files based on the index value.
-    def file_sort(x, y):
-        x1 = _get_index(x)
-        y1 = _get_index(y)
-        if x1 > y1:
-            return 1
-        elif y1 > x1:
-            return -1
-        else:
-            return 0
+    per this index.  See also `get_file_series`."""
+    return list(get_file_series(file_name, rescan).files)
+
+
+class TimestepCache(object):
+    """A thread safe LRU cache of the data read for the timesteps of a
+    time series, bounded by the memory used by the cached data.
 
-    files.sort(key=lambda x:_get_index(x))
-    return files
+    The data for a file is read by calling `read_func(file_name)` which
+    must return a VTK data object that is not shared with any pipeline.
+    Files may be read ahead of time in a pool of worker threads using
+    `prefetch`; VTK readers release the GIL while reading so this runs
+    concurrently with the rendering.
+    """
+
+    def __init__(self, read_func, max_bytes, n_workers=2):
+        self.read_func = read_func
+        self.max_bytes = max_bytes
+        self.n_workers = n_workers
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, file_name):
+        return file_name in self._data
+
+    def get(self, file_name):
+        """Return the cached data for the file, reading it if needed."""
+        with self._lock:
+            data = self._data.get(file_name)
+            if data is not None:
+                # Mark as most recently used.
+                self._data.pop(file_name)
+                self._data[file_name] = data
+                return data[0]
+            future = self._pending.get(file_name)
+        if future is not None:
+            return future.result()
+        return self._read(file_name)
+
+    def prefetch(self, file_names):
+        """Read the given files in the background if they are not
+        already cached or being read."""
+        if ThreadPoolExecutor is None:
+            return
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.n_workers)
+            for fname in file_names:
+                if fname in self._data or fname in self._pending:
+                    continue
+                future = self._pool.submit(self._read, fname)
+                self._pending[fname] = future
+
+    def clear(self):
+        """Empty the cache and stop the worker threads."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._data.clear()
+            self.nbytes = 0
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._lock:
+            self._pending.clear()
+
+    def shutdown(self):
+        """Stop the worker threads without waiting for the files being
+        read.  The cached data is kept and the threads are created
+        again by the next `prefetch`."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _read(self, file_name):
+        try:
+            data = self.read_func(file_name)
+        finally:
+            with self._lock:
+                self._pending.pop(file_name, None)
+        if data is None:
+            return None
+        # `GetActualMemorySize` is in kibibytes.
+        nbytes = data.GetActualMemorySize()*1024
+        with self._lock:
+            old = self._data.pop(file_name, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._data[file_name] = (data, nbytes)
+            self.nbytes += nbytes
+            # Evict the least recently used entries but always keep
+            # the one just read.
+            while self.nbytes > self.max_bytes and len(self._data) > 1:
+                fname, (d, n) = self._data.popitem(last=False)
+                self.nbytes -= n
+        return data
 
 
 class NoUITimer(object):
@@ -141,6 +336,16 @@ class FileDataSource(Source):
 
     update_files = Button('Rescan files')
 
+    # The memory (in MB) used to cache the data read for each
+    # timestep so stepping through a time series does not re-read the
+    # files.  Zero disables the cache.  Only sources that implement
+    # `read_timestep_data` support caching.
+    cache_size = Float(0.0, desc='the memory (MB) for cached timesteps')
+
+    # The number of timesteps after the current one that are read in
+    # the background when the cache is enabled.
+    prefetch = Int(2, desc='the number of timesteps to read ahead')
+
     base_file_name=Str('', desc="the base name of the file",
                        enter_set=True, auto_set=False,
                        editor=FileEditor())
@@ -180,13 +385,16 @@ class FileDataSource(Source):
     _timer = Any
     _in_update_files = Any(False)
 
+    # The `TimestepCache` used when `cache_size` is non-zero.
+    _timestep_cache = Any
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(FileDataSource, self).__get_pure_state__()
         # These are obtained dynamically, so don't pickle them.
-        for x in ['file_list', 'timestep', 'play']:
+        for x in ['file_list', 'timestep', 'play', '_timestep_cache']:
             d.pop(x, None)
         return d
 
@@ -206,6 +414,22 @@ class FileDataSource(Source):
         # Setup the children's state.
         set_state(self, state, first=['children'], ignore=['*'])
 
+    ######################################################################
+    # `Base` interface
+    ######################################################################
+    def stop(self):
+        """Invoked when this object is removed from the mayavi
+        pipeline.
+        """
+        if not self.running:
+            return
+
+        # Stop reading timesteps in the background.
+        if self._timestep_cache is not None:
+            self._timestep_cache.shutdown()
+
+        super(FileDataSource, self).stop()
+
     ######################################################################
     # `FileDataSource` interface
     ######################################################################
@@ -216,6 +440,37 @@ class FileDataSource(Source):
         """
         self.base_file_name = base_file_name
 
+    def prepare_reader(self, file_name):
+        """Set up the reader of this source for the given file without
+        reading it and return the VTK algorithm whose `Update` reads
+        the file.  `Engine.open_many` calls `Update` on it from a
+        worker thread before calling `initialize`, which then finds the
+        data already read.  The default returns `None`, the file is then
+        read by `initialize`.
+        """
+        return None
+
+    def read_timestep_data(self, file_name):
+        """Read the given file independently of the current pipeline
+        and return the resulting VTK data object.  This is called from
+        worker threads to fill the timestep cache.  Sources supporting
+        the cache should override this, the default returns `None`.
+        """
+        return None
+
+    def get_timestep_data(self, file_name):
+        """Return the cached TVTK data object for the given file,
+        reading it if needed.  Returns `None` if caching is disabled or
+        not supported.
+        """
+        cache = self._timestep_cache
+        if cache is None:
+            return None
+        data = cache.get(file_name)
+        if data is None:
+            return None
+        return tvtk.to_tvtk(data)
+
     ######################################################################
     # Non-public interface
     ######################################################################
@@ -241,9 +496,42 @@ class FileDataSource(Source):
         if self.sync_timestep:
             for sibling in self._find_sibling_datasets():
                 sibling.timestep = value
+        self._prefetch_timesteps()
+
+    def _cache_size_changed(self, value):
+        cache = self._timestep_cache
+        if cache is not None:
+            cache.clear()
+            self._timestep_cache = None
+        supported = (type(self).read_timestep_data !=
+                     FileDataSource.read_timestep_data)
+        if value > 0 and supported:
+            self._timestep_cache = TimestepCache(self.read_timestep_data,
+                                                 value*1024*1024)
+        if supported and len(self.file_path.get()) > 0:
+            # Switch the pipeline to (or from) the cached data.
+            self._file_path_changed(self.file_path)
+        self._prefetch_timesteps()
+
+    def _prefetch_timesteps(self):
+        cache = self._timestep_cache
+        if cache is None or self.prefetch < 1:
+            return
+        file_list = self.file_list
+        n_files = len(file_list)
+        if n_files < 2:
+            return
+        start = self.timestep + 1
+        stop = start + self.prefetch
+        if self.loop:
+            indices = [i % n_files for i in range(start, stop)]
+        else:
+            indices = range(start, min(stop, n_files))
+        cache.prefetch([file_list[i] for i in indices])
 
     def _base_file_name_changed(self, value):
-        self._update_files_fired()
+        # The cached listing of the directory is used if it is current.
+        self._update_file_list()
         try:
             self.timestep = self.file_list.index(value)
         except ValueError:
@@ -307,6 +595,10 @@ class FileDataSource(Source):
             return []
 
     def _update_files_fired(self):
+        # The "Rescan files" button always lists the directory again.
+        self._update_file_list(rescan=True)
+
+    def _update_file_list(self, rescan=False):
         # First get all the siblings before we change the current file list.
         if self._in_update_files:
             return
@@ -317,11 +609,14 @@ class FileDataSource(Source):
             else:
                 siblings = []
             fname = self.base_file_name
-            file_list = get_file_list(fname)
+            # The files may have changed on disk.
+            if rescan and self._timestep_cache is not None:
+                self._timestep_cache.clear()
+            file_list = get_file_list(fname, rescan=rescan)
             if len(file_list) == 0:
                 file_list = [fname]
             self.file_list = file_list
             for sibling in siblings:
-                sibling.update_files = True
+                sibling._update_file_list(rescan)
         finally:
             self._in_update_files = False
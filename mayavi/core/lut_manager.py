@@ -5,16 +5,22 @@
 # Copyright (c) 2005-2016, Enthought, Inc.
 # License: BSD Style.
 
+import json
 import os.path
 import sys
 import subprocess
 import warnings
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import numpy
 
 # Enthought library imports.
 from traits.api import Instance, Range, Bool, Array, \
-     Str, Property, Enum, Button
+     Str, Property, Button, TraitType
 from traitsui.api import FileEditor, auto_close_message
-from apptools.persistence import state_pickler
 from tvtk.api import tvtk
 
 # Local imports.
@@ -24,16 +30,106 @@ from mayavi.core.common import error
 from mayavi.core import lut
 
 
-# The directory that contains the pickled files for colormap
+######################################################################
+# `ColormapRegistry` class.
+######################################################################
+class ColormapRegistry(Mapping):
+    """A read-only mapping of colormap names to (N, 4) arrays of RGBA
+    values in the [0, 1] range, with colormaps registered at runtime.
+
+    The colormaps shipped with Mayavi are stored one after the other in
+    a binary `.npy` file, with a small JSON index giving the rows of
+    each colormap.  Only the index is read when the registry is
+    created.  The array file is memory-mapped on first use and each
+    colormap is decoded when it is first accessed.
+    """
+
+    def __init__(self, file_name=None):
+        # The colormaps in the file: name -> (start, stop) rows.
+        self._index = {}
+        self._data_file = None
+        # The memory-mapped array of all the colormaps in the file.
+        self._data = None
+        # The colormaps decoded or registered.
+        self._luts = {}
+        self._names = []
+        if file_name is not None:
+            self._read_index(file_name)
+
+    def __getitem__(self, name):
+        lut = self._luts.get(name)
+        if lut is None:
+            start, stop = self._index[name]
+            if self._data is None:
+                self._data = numpy.load(self._data_file, mmap_mode='r')
+            lut = numpy.array(self._data[start:stop])
+            lut.flags.writeable = False
+            self._luts[name] = lut
+        return lut
+
+    def __contains__(self, name):
+        return name in self._index or name in self._luts
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def register(self, name, colors):
+        """Register the colormap `name` with the given (N, 3) or (N, 4)
+        RGB(A) values in the [0, 1] range, replacing any colormap of the
+        same name.
+        """
+        colors = numpy.array(colors, dtype=float)
+        if colors.ndim != 2 or colors.shape[1] not in (3, 4) or \
+           len(colors) < 2:
+            raise ValueError('The colors must be an array of shape (N, 3) '
+                             'or (N, 4) with N >= 2.')
+        if colors.shape[1] == 3:
+            colors = numpy.c_[colors, numpy.ones(len(colors))]
+        colors.flags.writeable = False
+        if name not in self:
+            self._names.append(name)
+        self._index.pop(name, None)
+        self._luts[name] = colors
+
+    def _read_index(self, file_name):
+        """Read the index of the colormaps stored in `file_name`."""
+        with open(file_name + '.json', 'r') as f:
+            index = json.load(f)
+        data_file = file_name + '.npy'
+        if not os.path.exists(data_file):
+            raise IOError('No such file: %s'%data_file)
+        offsets = index['offsets']
+        for i, name in enumerate(index['names']):
+            self._index[name] = (offsets[i], offsets[i + 1])
+        self._names = list(index['names'])
+        self._data_file = data_file
+
+
+def save_colormaps(luts, file_name):
+    """Store the colormaps in the dictionary `luts` of (N, 4) arrays in
+    the files used by `ColormapRegistry`, `file_name` with the `.npy`
+    and `.json` extensions.
+    """
+    names = sorted(luts)
+    arrays = [numpy.asarray(luts[name], dtype=float) for name in names]
+    offsets = numpy.cumsum([0] + [len(a) for a in arrays]).tolist()
+    numpy.save(file_name + '.npy', numpy.concatenate(arrays))
+    with open(file_name + '.json', 'w') as f:
+        json.dump(dict(names=names, offsets=offsets), f)
+
+
+# The directory that contains the colormap files and previews.
 lut_image_dir = os.path.dirname(lut.__file__)
-pylab_luts_file = os.path.join(lut_image_dir, 'pylab_luts.pkl')
+pylab_luts_file = os.path.join(lut_image_dir, 'pylab_luts')
 
 try:
-    pylab_luts = state_pickler.load_state(pylab_luts_file)
-except (IOError, ValueError) as exception:
-    # IOError: failed to open file
-    # ValueError: pickled file is built from an OS w/ different
-    #             architecture, or with an incompatible protocol
+    pylab_luts = ColormapRegistry(pylab_luts_file)
+except (IOError, ValueError, KeyError) as exception:
+    # IOError: failed to open the files
+    # ValueError, KeyError: invalid index file
     message = ("Failed to load pylab colormaps from file:\n"
                "{filepath}\n"
                "Last error: {err_type} {err_message}\n"
@@ -43,24 +139,68 @@ except (IOError, ValueError) as exception:
     warnings.warn(message.format(filepath=pylab_luts_file,
                                  err_type=type(exception).__name__,
                                  err_message=str(exception)))
-    pylab_luts = {}
+    pylab_luts = ColormapRegistry()
+
+
+# The cache of the tables of the pylab colormaps, see
+# `get_pylab_lut_table`.
+_lut_table_cache = {}
+_LUT_TABLE_CACHE_SIZE = 256
 
 
 #################################################################
 # Utility functions.
 #################################################################
 def set_lut(vtk_lut, lut_lst):
-    """Setup the tvtk.LookupTable (`vtk_lut`) using the passed list of
-    lut values."""
-    n_col = len(lut_lst)
-    vtk_lut.number_of_colors = n_col
-    vtk_lut.build()
-    for i in range(0, n_col):
-        lt = lut_lst[i]
-        vtk_lut.set_table_value(i, lt[0], lt[1], lt[2], lt[3])
-
+    """Setup the tvtk.LookupTable (`vtk_lut`) using the passed list or
+    (N, 4) array of RGBA lut values in the [0, 1] range."""
+    return _set_lut_table(vtk_lut, _to_lut_table(lut_lst))
+
+
+def _to_lut_table(lut_lst):
+    """Convert RGBA values in the [0, 1] range to the unsigned chars
+    used by the table of a lookup table."""
+    values = numpy.clip(numpy.asarray(lut_lst, dtype=float), 0.0, 1.0)
+    return (values*255.0 + 0.5).astype(numpy.uint8)
+
+
+def _set_lut_table(vtk_lut, table):
+    """Set the (N, 4) array of unsigned chars `table` as the table of
+    the tvtk.LookupTable `vtk_lut` in one operation, instead of setting
+    each color in turn.  The table is converted to a VTK array, which may
+    copy it, and the lookup table keeps a reference to that array."""
+    arr = tvtk.UnsignedCharArray()
+    arr.from_array(table)
+    vtk_lut.number_of_colors = len(table)
+    vtk_lut.table = arr
     return vtk_lut
 
+
+def get_pylab_lut_table(lut_mode, number_of_colors, reverse=False):
+    """Return the table of the pylab colormap `lut_mode` with at most
+    `number_of_colors` colors, reversed if `reverse` is True, as a
+    read-only (N, 4) array of unsigned chars.
+
+    The tables are cached so switching between colormaps is cheap.
+    """
+    lut = pylab_luts[lut_mode]
+    n_total = len(lut)
+    n_color = min(number_of_colors, n_total)
+    key = (lut_mode, n_color, reverse)
+    table = _lut_table_cache.get(key)
+    if table is None:
+        if reverse:
+            lut = lut[::-1, :]
+        if n_color < n_total:
+            lut = lut[::int(round(n_total/float(n_color)))]
+        table = _to_lut_table(lut)
+        table.flags.writeable = False
+        if len(_lut_table_cache) >= _LUT_TABLE_CACHE_SIZE:
+            _lut_table_cache.pop(next(iter(_lut_table_cache)))
+        _lut_table_cache[key] = table
+    return table
+
+
 def check_lut_first_line(line, file_name=''):
     """Check the line to see if this is a valid LUT file."""
     first = line.split()
@@ -79,34 +219,42 @@ def check_lut_first_line(line, file_name=''):
 
 def parse_lut_file(file_name):
     """Parse the file specified by its name `file_name` for a LUT and
-    return the list of parsed values."""
-
-    input = open(file_name, "r")
-
-    line = input.readline()
-    n_color = check_lut_first_line(line, file_name)
-
-    lut = []
-    for line in input.readlines():
-        entr = line.split()
-        if len(entr) != 4:
-            errmsg="Error: insufficient or too much data in line "\
-                    "-- \"%s\""%(entr)
-            raise IOError(errmsg)
-
-        tmp = []
-        for color in entr:
+    return the parsed values as an (N, 4) array."""
+
+    with open(file_name, "r") as input:
+        line = input.readline()
+        n_color = check_lut_first_line(line, file_name)
+        with warnings.catch_warnings():
+            # Empty tables are handled below.
+            warnings.simplefilter('ignore', UserWarning)
             try:
-                tmp.append(float(color))
-            except:
-                raise IOError(
-                    "Unknown entry '%s'in lookup table input."%color
-                )
-        lut.append(tmp)
-
+                lut = numpy.loadtxt(input, dtype=float, ndmin=2)
+            except ValueError as err:
+                raise IOError("Error: invalid data in lookup table input "
+                              "-- %s"%err)
+
+    if lut.size == 0:
+        return numpy.zeros((0, 4))
+    if lut.shape[1] != 4:
+        errmsg = "Error: insufficient or too much data, %d entries per "\
+                 "line instead of 4"%lut.shape[1]
+        raise IOError(errmsg)
     return lut
 
 
+def register_colormap(name, colors):
+    """Register a colormap given as an (N, 3) or (N, 4) array of RGB(A)
+    values in the [0, 1] range.  It may then be used as the `lut_mode`
+    of a LUTManager or the `colormap` of mlab functions.
+    """
+    if name in ('blue-red', 'black-white', 'file'):
+        raise ValueError("'%s' is a reserved colormap name."%name)
+    pylab_luts.register(name, colors)
+    for key in list(_lut_table_cache):
+        if key[0] == name:
+            del _lut_table_cache[key]
+
+
 def lut_mode_list():
     """ Function to generate the list of acceptable lut_mode values.
     """
@@ -116,6 +264,27 @@ def lut_mode_list():
     return lut_mode_list
 
 
+class LUTMode(TraitType):
+    """ The name of a colormap, one of the values of `lut_mode_list`
+    including the colormaps registered after the trait is defined.
+    """
+
+    default_value = 'blue-red'
+
+    def validate(self, object, name, value):
+        if value in ('blue-red', 'black-white', 'file') or \
+           (isinstance(value, str) and value in pylab_luts):
+            return value
+        self.error(object, name, value)
+
+    def info(self):
+        return 'one of %s'%', '.join(repr(x) for x in lut_mode_list())
+
+    def create_editor(self):
+        from traitsui.api import EnumEditor
+        return EnumEditor(values=lut_mode_list())
+
+
 ######################################################################
 # `LUTManager` class.
 ######################################################################
@@ -143,8 +312,7 @@ class LUTManager(Base):
     label_text_property = Property(record=True)
 
     # The current mode of the LUT.
-    lut_mode = Enum('blue-red', lut_mode_list(),
-                     desc='the type of the lookup table')
+    lut_mode = LUTMode(desc='the type of the lookup table')
 
     # File name of the LUT file to use.
     file_name = Str('', editor=FileEditor,
@@ -290,14 +458,10 @@ class LUTManager(Base):
 
         reverse = self.reverse_lut
         if value in pylab_luts:
-            lut = pylab_luts[value]
-            if reverse:
-                lut = lut[::-1, :]
-            n_total = len(lut)
-            n_color = self.number_of_colors
-            if not n_color >= n_total:
-                lut = lut[::int(round(n_total/float(n_color)))]
-            self.load_lut_from_list(lut.tolist())
+            table = get_pylab_lut_table(value, self.number_of_colors, reverse)
+            # The cached table is copied so the lut may be edited.
+            self.lut = _set_lut_table(self.lut, table.copy())
+            self.render()
             #self.lut.force_build()
             return
         elif value == 'blue-red':
@@ -351,15 +515,12 @@ class LUTManager(Base):
         elif self.lut_mode in pylab_luts:
             # We can't interpolate these LUTs, as they are defined from a
             # table. We hack around this limitation
-            reverse = self.reverse_lut
-            lut = pylab_luts[self.lut_mode]
-            if reverse:
-                lut = lut[::-1, :]
-            n_total = len(lut)
-            if value > n_total:
+            if value > len(pylab_luts[self.lut_mode]):
                 return
-            lut = lut[::int(round(n_total/float(value)))]
-            self.load_lut_from_list(lut.tolist())
+            table = get_pylab_lut_table(self.lut_mode, value,
+                                        self.reverse_lut)
+            self.lut = _set_lut_table(self.lut, table.copy())
+            self.render()
         else:
             lut = self.lut
             lut.number_of_table_values = value
@@ -461,11 +622,11 @@ class LUTManager(Base):
                     lut_list = parse_lut_file(file_name)
                 except IOError as err_msg:
                     msg = "Sorry could not parse LUT file: %s\n"%file_name
-                    msg += err_msg
+                    msg += str(err_msg)
                     error(msg)
                 else:
                     if self.reverse_lut:
-                        lut_list.reverse()
+                        lut_list = lut_list[::-1]
                     self.lut = set_lut(self.lut, lut_list)
                     self.render()
 
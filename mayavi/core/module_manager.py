@@ -9,7 +9,7 @@ tables.
 import numpy
 
 # Enthought library imports.
-from traits.api import List, Instance, Trait, TraitPrefixList, \
+from traits.api import List, Instance, Int, Trait, TraitPrefixList, \
                                  HasTraits, Str
 from apptools.persistence.state_pickler import set_state
 
@@ -22,6 +22,71 @@ from mayavi.core.common import handle_children_state, exception
 from mayavi.core.pipeline_info import PipelineInfo
 
 
+######################################################################
+# Utility functions.
+######################################################################
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+
+def _chunk_range(chunk, magnitude):
+    """Return the (min, max, has_nan) of a chunk of data, see
+    `compute_array_range`."""
+    if magnitude:
+        # Squared magnitudes are used so only the extrema need a sqrt.
+        chunk = numpy.einsum('ij,ij->i', chunk, chunk, dtype=float)
+    c_min = chunk.min()
+    # `min` propagates NaNs, in which case fmin/fmax are used to
+    # ignore them.
+    has_nan = bool(numpy.isnan(c_min))
+    if has_nan:
+        c_min = numpy.fmin.reduce(chunk)
+        c_max = numpy.fmax.reduce(chunk)
+    else:
+        c_max = chunk.max()
+    return c_min, c_max, has_nan
+
+
+def compute_array_range(data_array, magnitude=False, chunk_size=2**18,
+                        n_workers=1):
+    """Compute the range of the given numpy array ignoring NaNs.
+
+    The array is scanned in chunks of `chunk_size` rows so that no
+    temporary of the size of the array is created, optionally using
+    `n_workers` threads.  If `magnitude` is True the range of the
+    norm of the rows of the 2D array is computed.
+
+    Returns a tuple `(min, max, has_nan)`.  `min` and `max` are NaN if
+    all values are NaN.
+    """
+    n = len(data_array)
+    if n == 0:
+        return numpy.nan, numpy.nan, False
+    chunks = [data_array[i:i + chunk_size] for i in range(0, n, chunk_size)]
+    if n_workers > 1 and len(chunks) > 1 and ThreadPoolExecutor is not None:
+        # numpy releases the GIL in the reductions.
+        with ThreadPoolExecutor(n_workers) as pool:
+            results = list(pool.map(lambda c: _chunk_range(c, magnitude),
+                                    chunks))
+    else:
+        results = [_chunk_range(c, magnitude) for c in chunks]
+    d_min = numpy.fmin.reduce([r[0] for r in results])
+    d_max = numpy.fmax.reduce([r[1] for r in results])
+    has_nan = any(r[2] for r in results)
+    if magnitude:
+        d_min, d_max = numpy.sqrt(d_min), numpy.sqrt(d_max)
+    return float(d_min), float(d_max), has_nan
+
+
+# Caches the computed ranges of the VTK arrays keyed on the array
+# address, kind of range and modification time so the ranges are not
+# recomputed when the data has not changed.
+_range_cache = {}
+_RANGE_CACHE_SIZE = 64
+
+
 ######################################################################
 # `DataAttributes` class.
 ######################################################################
@@ -38,10 +103,36 @@ class DataAttributes(HasTraits):
     # The range of the data array.
     range = List
 
-    def _get_np_arr(self, arr):
+    # The number of threads used to compute the range of large arrays.
+    n_workers = Int(1)
+
+    def _get_range(self, arr, magnitude):
+        """Return the range of the VTK array ignoring NaNs.  For
+        vectors the range of the magnitude is computed and, if there
+        are no NaNs, its lower bound is zero.  The result is cached
+        on the array modification time."""
+        vtk_arr = arr._vtk_obj
+        key = (vtk_arr.__this__, magnitude)
+        mtime = vtk_arr.GetMTime()
+        cached = _range_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+
         data_array = arr.to_array()
-        data_has_nan = numpy.isnan(data_array).any()
-        return data_array, data_has_nan
+        if not magnitude and data_array.ndim > 1:
+            # Like `data.range`, use the first component.
+            data_array = data_array[:, 0]
+        d_min, d_max, has_nan = compute_array_range(
+            data_array, magnitude, n_workers=self.n_workers
+        )
+        if magnitude and not has_nan:
+            d_min = 0.0
+        result = [d_min, d_max]
+
+        if len(_range_cache) >= _RANGE_CACHE_SIZE:
+            _range_cache.pop(next(iter(_range_cache)))
+        _range_cache[key] = (mtime, result)
+        return list(result)
 
     def compute_scalar(self, data, mode='point'):
         """Compute the scalar range from given VTK data array.  Mode
@@ -50,12 +141,7 @@ class DataAttributes(HasTraits):
             if data.name is None or len(data.name) == 0:
                 data.name = mode + '_scalars'
             self.name = data.name
-            data_array, data_has_nan = self._get_np_arr(data)
-            if data_has_nan:
-                self.range = [float(numpy.nanmin(data_array)),
-                              float(numpy.nanmax(data_array))]
-            else:
-                self.range = list(data.range)
+            self.range = self._get_range(data, magnitude=False)
 
     def compute_vector(self, data, mode='point'):
         """Compute the vector range from given VTK data array.  Mode
@@ -64,13 +150,7 @@ class DataAttributes(HasTraits):
             if data.name is None or len(data.name) == 0:
                 data.name = mode + '_vectors'
             self.name = data.name
-            data_array, data_has_nan = self._get_np_arr(data)
-            if data_has_nan:
-                d_mag = numpy.sqrt((data_array*data_array).sum(axis=1))
-                self.range = [float(numpy.nanmin(d_mag)),
-                              float(numpy.nanmax(d_mag))]
-            else:
-                self.range = [0.0, data.max_norm]
+            self.range = self._get_range(data, magnitude=True)
 
     def config_lut(self, lut_mgr):
         """Set the attributes of the LUTManager."""
@@ -7,7 +7,8 @@ basically abstracts out the common parts of the pipeline interface.
 # License: BSD Style.
 
 # Enthought library imports.
-from traits.api import List, Event, Bool, Instance
+from traits.api import List, Event, Bool, Instance, Range, Dict
+from tvtk import messenger
 
 # Local imports.
 from mayavi.core.base import Base
@@ -55,6 +56,11 @@ class PipelineBase(Base):
     # outputs are the same.
     data_changed = Event(record=False)
 
+    # The progress of the last execution of the VTK algorithms
+    # observed by this object, from 0 to 1.  This is updated from the
+    # VTK `ProgressEvent`, see `observe_progress`.
+    progress = Range(0.0, 1.0, 0.0, record=False)
+
     ##################################################
     # Private traits.
     ##################################################
@@ -65,13 +71,17 @@ class PipelineBase(Base):
     # Stores the state of the widgets prior to disabling them.
     _widget_state = List
 
+    # The VTK objects whose progress is observed: {hash: (obj, id)}.
+    _progress_observers = Dict
+
     ######################################################################
     # `object` interface.
     ######################################################################
     def __get_pure_state__(self):
         d = super(PipelineBase, self).__get_pure_state__()
         # These are setup dynamically so we should not pickle them.
-        for x in ('outputs', 'actors', 'widgets', '_actors_added', ):
+        for x in ('outputs', 'actors', 'widgets', '_actors_added',
+                  'progress', '_progress_observers'):
             d.pop(x, None)
         return d
 
@@ -164,6 +174,26 @@ class PipelineBase(Base):
             scene.remove_widgets(self.widgets)
             self._actors_added = False
 
+    def observe_progress(self, algorithm, remove=False):
+        """Update `progress` when the given TVTK algorithm fires a
+        `ProgressEvent`, or stop doing so if `remove` is True.
+        """
+        vtk_obj = algorithm._vtk_obj
+        key = hash(vtk_obj)
+        observers = self._progress_observers
+        if remove:
+            if key in observers:
+                obj, ob_id = observers.pop(key)
+                obj.RemoveObserver(ob_id)
+                messenger.disconnect(obj, 'ProgressEvent',
+                                     self._on_progress)
+        elif key not in observers:
+            # The messenger avoids a reference cycle between this object
+            # and the algorithm.
+            messenger.connect(vtk_obj, 'ProgressEvent', self._on_progress)
+            ob_id = vtk_obj.AddObserver('ProgressEvent', messenger.send)
+            observers[key] = (vtk_obj, ob_id)
+
     def has_output_port(self):
         """ We assume the old pipeline topology.
         As such we assume no output_port exists."""
@@ -208,6 +238,9 @@ class PipelineBase(Base):
     ######################################################################
     # Non-public interface
     ######################################################################
+    def _on_progress(self, vtk_obj, event):
+        self.progress = min(max(vtk_obj.GetProgress(), 0.0), 1.0)
+
     def _outputs_changed(self, new):
         self.pipeline_changed = True
 
@@ -0,0 +1,193 @@
+"""Binary session files used by `Engine.save_visualization` and
+`Engine.load_visualization`.
+
+A session is a directory, by convention with a `.mv2d` extension,
+holding:
+
+ - `session.json`: the format name and version and the arrays stored.
+ - `state.pkl`: the state of the pipeline as produced by the
+   `state_pickler`, pickled in binary form.  Large arrays are replaced
+   by references to blobs.
+ - `arrays/<hash>.npy`: one `.npy` file per distinct large array,
+   named after the hash of its contents.
+
+Since the blobs are named after their contents, identical arrays are
+stored once and saving a session again only writes the arrays that
+changed.  On loading, the blobs are memory-mapped copy-on-write, so
+their data is only read from the disk when it is accessed.
+
+"""
+
+# Standard library imports.
+import hashlib
+import json
+import os
+from os.path import exists, isdir, isfile, join
+import pickle
+
+import numpy
+
+# Enthought library imports.
+from apptools.persistence.state_pickler import (StatePickler,
+                                                StateUnpickler)
+
+# The format and version of the sessions written.
+SESSION_FORMAT = 'mayavi-session'
+SESSION_VERSION = 1
+SESSION_EXT = '.mv2d'
+
+# Arrays smaller than this (in bytes) are kept in the state file.
+BLOB_MIN_SIZE = 1 << 16
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def is_session(file_or_fname):
+    """Returns True if the given file or file name is a session
+    directory, or is to be saved as one.  Only names with the session
+    extension and directories already holding a session qualify, so
+    that a plain directory is never mistaken for a session.
+    """
+    if not isinstance(file_or_fname, str):
+        return False
+    return (file_or_fname.endswith(SESSION_EXT) or
+            _read_session_info(file_or_fname) is not None)
+
+
+def _read_session_info(dirname):
+    """Returns the contents of the `session.json` file of the given
+    directory, or None if the directory does not hold a session.
+    """
+    info_file = join(dirname, 'session.json')
+    if not isfile(info_file):
+        return None
+    try:
+        with open(info_file, 'r') as f:
+            info = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if not isinstance(info, dict) or info.get('format') != SESSION_FORMAT:
+        return None
+    return info
+
+
+def array_hash(arr):
+    """Returns a hash of the type, shape and contents of the array."""
+    arr = numpy.ascontiguousarray(arr)
+    h = hashlib.sha1()
+    h.update(('%s%s' % (arr.dtype.str, arr.shape)).encode('ascii'))
+    h.update(arr.reshape(-1).view(numpy.uint8))
+    return h.hexdigest()
+
+
+def _write_file(file_name, write, mode='wb'):
+    """Writes a file through `write(f)` so that an existing file is
+    only replaced once the new one is complete.
+    """
+    tmp_name = file_name + '.tmp'
+    with open(tmp_name, mode) as f:
+        write(f)
+    os.replace(tmp_name, file_name)
+
+
+######################################################################
+# `SessionPickler` class.
+######################################################################
+class SessionPickler(StatePickler):
+    """A state pickler storing the large arrays as blobs in the given
+    directory, and only those not already there.
+    """
+
+    def __init__(self, array_dir, min_size=BLOB_MIN_SIZE):
+        StatePickler.__init__(self)
+        self.array_dir = array_dir
+        self.min_size = min_size
+        # The blobs used: hash -> dict(shape, dtype).
+        self.blobs = {}
+
+    def _do_numeric(self, value):
+        if value.nbytes < self.min_size or value.dtype.hasobject:
+            return StatePickler._do_numeric(self, value)
+        idx = self._register(value)
+        key = array_hash(value)
+        if key not in self.blobs:
+            fname = join(self.array_dir, key + '.npy')
+            if not exists(fname):
+                _write_file(fname, lambda f: numpy.save(f, value))
+            self.blobs[key] = dict(shape=list(value.shape),
+                                   dtype=value.dtype.str)
+        return dict(type='blob', id=idx, data=key)
+
+
+######################################################################
+# `SessionUnpickler` class.
+######################################################################
+class SessionUnpickler(StateUnpickler):
+    """A state unpickler memory-mapping the blobs of a session."""
+
+    def __init__(self, array_dir):
+        StateUnpickler.__init__(self)
+        self.array_dir = array_dir
+        self.type_map['blob'] = self._do_blob
+
+    def _do_blob(self, value, path):
+        fname = join(self.array_dir, value['data'] + '.npy')
+        result = numpy.load(fname, mmap_mode='c')
+        self._numeric[value['id']] = (path, result)
+        self._obj_cache[value['id']] = result
+        return result
+
+
+######################################################################
+# Public functions.
+######################################################################
+def save_session(obj, dirname, min_blob_size=BLOB_MIN_SIZE):
+    """Saves the state of `obj`, usually an engine, in the session
+    directory `dirname`, creating it if needed.  Blobs already in the
+    directory are reused and, if the directory already held a session,
+    those no longer used are removed.  Files in a directory that was
+    not a session are never removed.
+    """
+    was_session = _read_session_info(dirname) is not None
+    array_dir = join(dirname, 'arrays')
+    if not isdir(array_dir):
+        os.makedirs(array_dir)
+
+    state_file = join(dirname, 'state.pkl')
+    pickler = SessionPickler(array_dir, min_blob_size)
+    # Used to make the file paths relative to the session.
+    pickler.file_name = state_file
+    state = pickler.dump_state(obj)
+    _write_file(state_file,
+                lambda f: pickle.dump(state, f, pickle.HIGHEST_PROTOCOL))
+
+    info = dict(format=SESSION_FORMAT, version=SESSION_VERSION,
+                arrays=pickler.blobs)
+    _write_file(join(dirname, 'session.json'),
+                lambda f: json.dump(info, f, indent=1, sort_keys=True),
+                mode='w')
+
+    if not was_session:
+        return
+    # Remove the blobs of the arrays no longer in the session.
+    for fname in os.listdir(array_dir):
+        key, ext = os.path.splitext(fname)
+        if ext == '.npy' and key not in pickler.blobs:
+            os.remove(join(array_dir, fname))
+
+
+def load_session_state(dirname):
+    """Returns the state saved in the session directory `dirname`."""
+    info = _read_session_info(dirname)
+    if info is None:
+        raise IOError('%s is not a Mayavi session.' % dirname)
+    if info.get('version', 0) > SESSION_VERSION:
+        raise IOError('The session %s was saved by a newer version of '
+                      'Mayavi (session version %s, only versions up to %s '
+                      'are supported).' % (dirname, info['version'],
+                                           SESSION_VERSION))
+
+    unpickler = SessionUnpickler(join(dirname, 'arrays'))
+    with open(join(dirname, 'state.pkl'), 'rb') as f:
+        return unpickler.load_state(f)
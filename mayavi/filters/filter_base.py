@@ -5,14 +5,75 @@
 # License: BSD Style.
 
 
+# Standard library imports.
+import threading
+import warnings
+
 # Enthought library imports.
-from traits.api import Instance
+from traits.api import Instance, Bool, Int, Any, List
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.filter import Filter
 
+
+# The parameters not copied from a VTK algorithm to the copy executed
+# in a worker thread, they refer to its pipeline or execution.
+_PIPELINE_PARAMETERS = set(['Input', 'InputData', 'InputConnection',
+                            'Output', 'Executive', 'Information',
+                            'AbortExecute', 'Progress', 'ProgressText',
+                            'ProgressObserver', 'ProgressShiftScale',
+                            'ReferenceCount', 'GlobalWarningDisplay',
+                            'Debug', 'ObjectName', 'ContainerAlgorithm',
+                            'DefaultExecutivePrototype'])
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def copy_algorithm(algorithm):
+    """Returns a new instance of the given VTK algorithm (or TVTK
+    wrapper) with the same parameters, read from the VTK object.  The
+    parameters that are VTK objects, like implicit functions, are
+    shared.
+    """
+    obj = tvtk.to_vtk(algorithm)
+    result = obj.NewInstance()
+    with warnings.catch_warnings():
+        # Deprecated accessors.
+        warnings.simplefilter('ignore')
+        for name in dir(obj):
+            param = name[3:]
+            if not name.startswith('Get') or param in _PIPELINE_PARAMETERS \
+               or not hasattr(result, 'Set' + param):
+                continue
+            try:
+                value = getattr(obj, name)()
+            except TypeError:
+                # Needs arguments.
+                continue
+            if value is None:
+                continue
+            try:
+                getattr(result, 'Set' + param)(value)
+            except (TypeError, ValueError):
+                pass
+
+    # Indexed parameters.
+    if hasattr(obj, 'GetNumberOfContours'):
+        n = obj.GetNumberOfContours()
+        result.SetNumberOfContours(n)
+        for i in range(n):
+            result.SetValue(i, obj.GetValue(i))
+    arrays = obj.GetInformation().Get(obj.INPUT_ARRAYS_TO_PROCESS())
+    if arrays is not None:
+        for i in range(arrays.GetNumberOfInformationObjects()):
+            result.SetInputArrayToProcess(i,
+                                          arrays.GetInformationObject(i))
+    return tvtk.to_tvtk(result)
+
+
 ######################################################################
 # `FilterBase` class.
 ######################################################################
@@ -26,6 +87,33 @@ class FilterBase(Filter):
     # The actual TVTK filter that this class manages.
     filter = Instance(tvtk.Object, allow_none=False, record=True)
 
+    # Execute the filter in a worker thread when its parameters or its
+    # input change, so the UI does not block on large datasets.  The
+    # output is swapped in when ready and updates made stale by newer
+    # changes are aborted.  Only used with an interactive scene.
+    asynchronous = Bool(False, desc='if the filter is executed in a '
+                                    'worker thread')
+
+    # True while an asynchronous update is running.
+    update_pending = Bool(False, record=False)
+
+    ########################################
+    # Private traits.
+
+    # Incremented for each asynchronous update, older updates are stale.
+    _update_generation = Int(0)
+
+    # The dataset holding the output of the asynchronous updates.
+    _async_output = Any
+
+    # The thread and the copy of the filter of the asynchronous update
+    # running.
+    _async_thread = Any
+    _async_worker = Any
+
+    # The threads of the aborted updates which may still be running.
+    _stale_threads = List
+
     # The view of these filters.
 
     view = View(Group(Item(name='filter', style='custom', resizable=True,
@@ -34,6 +122,19 @@ class FilterBase(Filter):
                 resizable=True
                 )
 
+    ######################################################################
+    # `Base` interface.
+    ######################################################################
+    def stop(self):
+        """Invoked when this object is removed from the mayavi
+        pipeline.
+        """
+        if not self.running:
+            return
+        # Abort any update running and wait for it to end.
+        self._cancel_async_update(wait=True)
+        super(FilterBase, self).stop()
+
     ######################################################################
     # `Filter` interface.
     ######################################################################
@@ -53,6 +154,7 @@ class FilterBase(Filter):
             # Just hook up the filter so the update_data method is
             # called when the traits change.
             f.on_trait_change(self.update_data)
+            self.observe_progress(f)
 
     def update_pipeline(self):
         """Override this method so that it *updates* the tvtk pipeline
@@ -70,6 +172,10 @@ class FilterBase(Filter):
         # By default we set the input to the first output of the first
         # input.
         self.configure_connection(fil, inputs[0])
+        if self._use_async_update():
+            self._start_async_update()
+            return
+        self._async_output = None
         fil.update()
         self._set_outputs([fil])
 
@@ -84,15 +190,124 @@ class FilterBase(Filter):
         if len(self.inputs) == 0 or not self.running:
             return
 
+        if self._use_async_update():
+            self._start_async_update()
+            return
+        if self._async_output is not None:
+            # Switching back from asynchronous updates.
+            self.update_pipeline()
+            return
         self.filter.update()
         # Propagate the data_changed event.
         self.data_changed = True
 
+    ######################################################################
+    # Non-public interface
+    ######################################################################
     def _filter_changed(self, old, new):
         if old is not None:
             old.on_trait_change(self.update_data, remove=True)
+            self.observe_progress(old, remove=True)
 
         new.on_trait_change(self.update_data)
+        self.observe_progress(new)
 
         if old is not None:
             self.update_pipeline()
+
+    def _asynchronous_changed(self, value):
+        if not value and self._async_output is not None and self.running:
+            # Cancel any update running and connect the filter again.
+            self._cancel_async_update()
+            self.update_pending = False
+            self.update_pipeline()
+
+    def _use_async_update(self):
+        """Asynchronous updates need the event loop of an interactive
+        scene to swap the output in.
+        """
+        scene = self.scene
+        return (self.asynchronous and scene is not None and
+                not scene.off_screen_rendering)
+
+    def _start_async_update(self):
+        """Execute a copy of the filter on a shallow copy of the input
+        in a worker thread.  Any update already running is aborted.
+        """
+        data = self.inputs[0].get_output_dataset()
+        if data is None:
+            return
+        self._cancel_async_update()
+        generation = self._update_generation
+        self.update_pending = True
+
+        worker = copy_algorithm(self.filter)
+        input_copy = data.__class__()
+        input_copy.shallow_copy(data)
+        self.configure_input_data(worker, input_copy)
+
+        # Not a daemon thread, so VTK is not killed while executing
+        # when Python exits.
+        thread = threading.Thread(target=self._run_async_update,
+                                  args=(worker, generation))
+        self._async_thread = thread
+        self._async_worker = worker
+        thread.start()
+
+    def _cancel_async_update(self, wait=False):
+        """Abort the asynchronous update running, if any.  Its result is
+        dropped and its thread ends in the background, unless `wait` is
+        True where all the aborted threads are waited for.
+        """
+        self._update_generation += 1
+        thread, worker = self._async_thread, self._async_worker
+        self._async_thread = self._async_worker = None
+        if worker is not None:
+            worker._vtk_obj.SetAbortExecute(1)
+        threads = [t for t in self._stale_threads if t.is_alive()]
+        if thread is not None:
+            threads.append(thread)
+        if wait:
+            current = threading.current_thread()
+            for t in threads:
+                if t is not current:
+                    t.join()
+            threads = []
+        self._stale_threads = threads
+
+    def _run_async_update(self, worker, generation):
+        """Run in the worker thread."""
+        from pyface.api import GUI
+
+        def on_progress(vtk_obj, event):
+            if generation != self._update_generation:
+                vtk_obj.SetAbortExecute(1)
+            else:
+                GUI.set_trait_later(self, 'progress',
+                                    min(max(vtk_obj.GetProgress(), 0.0), 1.0))
+
+        worker._vtk_obj.AddObserver('ProgressEvent', on_progress)
+        worker.update()
+        if generation != self._update_generation:
+            return
+        output = worker.output
+        result = output.__class__()
+        result.shallow_copy(output)
+        GUI.invoke_later(self._finish_async_update, result, generation)
+
+    def _finish_async_update(self, result, generation):
+        """Swap the result of an asynchronous update in, on the UI
+        thread.
+        """
+        if generation != self._update_generation or not self.running:
+            return
+        self.update_pending = False
+        self._async_thread = self._async_worker = None
+        self.progress = 1.0
+        output = self._async_output
+        if output is not None and output.__class__ is result.__class__:
+            output.shallow_copy(result)
+            output.modified()
+        else:
+            output = self._async_output = result
+        self._set_outputs([output])
@@ -23,14 +23,73 @@ if not 'wx' in sys.modules:
         """ wxversion not installed """
 
 
-# Mayavi imports
-from mayavi.tools.camera import view, roll, yaw, pitch, move
-from mayavi.tools.figure import figure, clf, gcf, savefig, \
-    draw, sync_camera, close, screenshot
-from mayavi.tools.engine_manager import get_engine, show_pipeline, \
-        options, set_engine
-from mayavi.tools.show import show
-from mayavi.tools.animator import animate
+import importlib
+
+# The public names of mlab and the modules they are defined in.  They are
+# only imported on first access, so that importing mlab is cheap and does
+# not pull in the UI toolkit or VTK until they are used.
+_lazy_names = {}
+for _module, _names in [
+        ('mayavi.tools.camera', 'view roll yaw pitch move'),
+        ('mayavi.tools.figure', 'figure clf gcf savefig draw sync_camera '
+                                'close screenshot ScreenCapture'),
+        ('mayavi.tools.engine_manager', 'get_engine show_pipeline options '
+                                        'set_engine'),
+        ('mayavi.tools.show', 'show'),
+        ('mayavi.tools.animator', 'animate'),
+        ('mayavi.tools.render_farm', 'render_batch'),
+        ('mayavi.core.lut_manager', 'register_colormap'),
+        ('mayavi.tools.helper_functions',
+         'contour3d test_contour3d quiver3d test_quiver3d '
+         'test_quiver3d_2d_data points3d test_points3d test_molecule '
+         'volume_slice test_volume_slice flow test_flow imshow test_imshow '
+         'surf test_surf mesh test_mesh test_simple_surf test_mesh_sphere '
+         'test_fancy_mesh contour_surf test_contour_surf plot3d test_plot3d '
+         'test_plot3d_anim test_points3d_anim test_contour3d_anim '
+         'test_simple_surf_anim test_flow_anim test_mesh_sphere_anim '
+         'test_volume_slice_anim triangular_mesh test_triangular_mesh '
+         'barchart test_barchart test_mesh_mask_custom_colors'),
+        ('mayavi.tools.decorations', 'colorbar scalarbar vectorbar outline '
+                                     'axes xlabel ylabel zlabel text title '
+                                     'orientation_axes text3d'),
+        ('mayavi.tools.tools', 'start_recording stop_recording'),
+        ]:
+    for _name in _names.split():
+        _lazy_names[_name] = (_module, _name)
+_lazy_names['init_notebook'] = ('mayavi.tools.notebook', 'init')
+# A module.
+_lazy_names['pipeline'] = ('mayavi.tools.pipeline', None)
+
+__all__ = sorted(list(_lazy_names.keys()) + ['show_engine'])
+
+
+def _import_name(name):
+    """Imports the named mlab function or module and stores it in the
+    module namespace.
+    """
+    module_name, attr = _lazy_names[name]
+    module = importlib.import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name):
+    if name in _lazy_names:
+        return _import_name(name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_lazy_names.keys()))
+
+
+# Module level __getattr__ needs Python 3.7, import everything up front
+# with older versions.
+if sys.version_info[:2] < (3, 7):
+    for _name in list(_lazy_names.keys()):
+        _import_name(_name)
+
 
 def show_engine():
     """ This function is deprecated, please use show_pipeline.
@@ -38,37 +97,14 @@ def show_engine():
     import warnings
     warnings.warn('The show_engine function is deprecated, please use'
                     'show_pipeline', stacklevel=2)
+    from mayavi.tools.engine_manager import show_pipeline
     return show_pipeline()
 
-from .tools.helper_functions import contour3d, test_contour3d, \
-    quiver3d, test_quiver3d, test_quiver3d_2d_data, \
-    points3d, test_points3d, test_molecule, \
-    volume_slice, test_volume_slice, \
-    flow, test_flow, \
-    imshow, test_imshow, \
-    surf, test_surf, mesh, test_mesh, test_simple_surf, \
-    test_mesh_sphere, test_fancy_mesh,\
-    contour_surf, test_contour_surf, \
-    plot3d, test_plot3d, \
-    test_plot3d_anim, test_points3d_anim, test_contour3d_anim,\
-    test_simple_surf_anim, test_flow_anim, test_mesh_sphere_anim, \
-    test_volume_slice_anim, \
-    triangular_mesh, test_triangular_mesh, barchart, \
-    test_barchart, test_mesh_mask_custom_colors
-
-
-from .tools.decorations import colorbar, scalarbar, vectorbar, \
-    outline, axes, xlabel, ylabel, zlabel, text, title, \
-    orientation_axes, text3d
-
-from .tools import pipeline
-
-from .tools.tools import start_recording, stop_recording
-
-from .tools.notebook import init as init_notebook
 
 if __name__ == "__main__":
     import numpy
+    from mayavi.tools.helper_functions import plot3d, points3d
+    from mayavi.tools.decorations import colorbar, axes, outline, title
 
     n_mer, n_long = 6, 11
     pi = numpy.pi
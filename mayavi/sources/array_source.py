@@ -107,16 +107,29 @@ class ArraySource(Source):
     # user explicitly requests that transpose_input_array is false
     # then we assume that the array has already been suitably
     # formatted by the user.
+    # Fortran-ordered scalar arrays are transposed without a copy.
     transpose_input_array = Bool(True, desc='if input array should be transposed (if on VTK will copy the input data)')
 
+    # When the input array is transposed, map the axes of C-ordered
+    # arrays through the direction of the image instead of transposing
+    # the data, which avoids the copy.  This needs VTK 9 or above and
+    # the filters and modules used must support oriented images.
+    map_axes = Bool(False, desc='if the axes of C-ordered input arrays '
+                    'are mapped instead of transposed (avoids a copy)')
+
     # Information about what this object can produce.
     output_info = PipelineInfo(datasets=['image_data'])
 
     # Specify the order of dimensions. The default is: [0, 1, 2]
     dimensions_order = List(Int, [0, 1, 2])
 
+    # The number of axes mapped through the direction of the image, 0
+    # if the data is transposed.
+    _mapped_axes = Int(0)
+
     # Our view.
     view = View(Group(Item(name='transpose_input_array'),
+                      Item(name='map_axes'),
                       Item(name='scalar_name'),
                       Item(name='vector_name'),
                       Item(name='spacing'),
@@ -179,7 +192,10 @@ class ArraySource(Source):
             img_data.point_data.scalars = None
             self.data_changed = True
             return
+        n_mapped = self._update_mapped_axes('scalar')
         dims = list(data.shape)
+        if n_mapped:
+            dims.reverse()
         if len(dims) == 2:
             dims.append(1)
 
@@ -195,7 +211,7 @@ class ArraySource(Source):
             else:
                 update_extent = [0, dims[dim0]-1, 0, dims[dim1]-1, 0, dims[dim2]-1]
                 self.change_information_filter.set_update_extent(update_extent)
-        if self.transpose_input_array:
+        if self.transpose_input_array and not n_mapped:
             img_data.point_data.scalars = numpy.ravel(numpy.transpose(data))
         else:
             img_data.point_data.scalars = numpy.ravel(data)
@@ -222,7 +238,10 @@ class ArraySource(Source):
             img_data.point_data.vectors = None
             self.data_changed = True
             return
+        n_mapped = self._update_mapped_axes('vector')
         dims = list(data.shape)
+        if n_mapped:
+            dims[:-1] = dims[-2::-1]
         if len(dims) == 3:
             dims.insert(2, 1)
             data = numpy.reshape(data, dims)
@@ -238,7 +257,7 @@ class ArraySource(Source):
                 update_extent = [0, dims[0]-1, 0, dims[1]-1, 0, dims[2]-1]
                 self.change_information_filter.set_update_extent(update_extent)
         sz = numpy.size(data)
-        if self.transpose_input_array:
+        if self.transpose_input_array and not n_mapped:
             data_t = numpy.transpose(data, (2, 1, 0, 3))
         else:
             data_t = data
@@ -270,6 +289,62 @@ class ArraySource(Source):
         if self.vector_data is not None:
             self._vector_data_changed(self.vector_data)
 
+    _map_axes_changed = _transpose_input_array_changed
+
     def _information_changed(self):
+        self._update_spacing_scale()
         self.change_information_filter.update()
         self.data_changed = True
+
+    def _get_mapped_axes(self):
+        """Returns the number of axes of the data to map through the
+        direction of the image, 0 if the data is to be transposed.
+        """
+        if not (self.transpose_input_array and self.map_axes and
+                VTK_MAJOR_VERSION >= 9):
+            return 0
+        n_axes = 0
+        for arr, n in ((self.scalar_data, 0), (self.vector_data, 1)):
+            if arr is not None:
+                # Fortran-ordered scalars are transposed without a
+                # copy, so only C-ordered data is mapped.
+                if not arr.flags.c_contiguous or arr.flags.f_contiguous:
+                    return 0
+                n_axes = arr.ndim - n
+        return n_axes
+
+    def _update_mapped_axes(self, name):
+        """Sets up the direction of the image for the current data and
+        returns the number of axes mapped.  If this changes the layout
+        of the data, the array other than `name` ('scalar' or 'vector')
+        is laid out again.
+        """
+        n_mapped = self._get_mapped_axes()
+        if n_mapped == self._mapped_axes:
+            return n_mapped
+        self._mapped_axes = n_mapped
+        # The index axis `i` of the image runs along the axis `n - 1 - i`
+        # of the array.
+        order = list(range(n_mapped))[::-1] + list(range(n_mapped, 3))
+        direction = numpy.identity(3)[order]
+        self.image_data.set_direction_matrix(*direction.ravel())
+        self._update_spacing_scale()
+        if name != 'scalar' and self.scalar_data is not None:
+            self._scalar_data_changed(self.scalar_data)
+        if name != 'vector' and self.vector_data is not None:
+            self._vector_data_changed(self.vector_data)
+        return n_mapped
+
+    def _update_spacing_scale(self):
+        """Scales the spacing of the image so that the `spacing` applies
+        to the axes of the array when they are mapped.
+        """
+        cif = self.change_information_filter
+        scale = [1.0, 1.0, 1.0]
+        n_mapped = self._mapped_axes
+        spacing = cif.output_spacing
+        for i in range(n_mapped):
+            j = n_mapped - 1 - i
+            if spacing[i] != 0:
+                scale[i] = spacing[j]/spacing[i]
+        cif.spacing_scale = scale
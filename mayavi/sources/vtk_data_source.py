@@ -1,6 +1,6 @@
 """This source manages a VTK dataset given to it.  When this source is
-pickled or persisted, it saves the data given to it in the form of a
-gzipped string.
+pickled or persisted, it saves the data given to it in VTK's binary
+format, compressed in chunks.
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 # Copyright (c) 2005-2015, Enthought, Inc.
@@ -9,14 +9,23 @@ gzipped string.
 import sys
 import os
 import tempfile
+import zlib
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+import numpy
 
 # Enthought library imports.
-from traits.api import Instance, List, Str, Bool, Int
+from traits.api import Instance, List, Str, Bool, Int, Range
 from traitsui.api import View, Group, Item
 from apptools.persistence.state_pickler \
-     import gzip_string, gunzip_string, set_state
+     import gunzip_string, set_state
 from tvtk.api import tvtk
 from tvtk import messenger
+from tvtk import vtk_module
+from tvtk.array_handler import array2vtk, vtk2array
 
 # Local imports.
 from tvtk.common import is_old_pipeline, configure_input_data
@@ -59,6 +68,69 @@ def write_dataset_to_string(data):
     return sdata
 
 
+# The version of the binary format the datasets are persisted in.
+DATASET_FORMAT = 'vtk-binary'
+DATASET_FORMAT_VERSION = 1
+
+# The size (in bytes) of the chunks the binary data is compressed in.
+CHUNK_SIZE = 1 << 22
+
+
+def write_dataset_to_array(data):
+    """Given a dataset, return its contents in VTK's binary legacy
+    format as a uint8 array.
+    """
+    buf = vtk_module.vtkCharArray()
+    vtk_module.vtkCommunicator.MarshalDataObject(tvtk.to_vtk(data), buf)
+    return vtk2array(buf).view(numpy.uint8)
+
+
+def read_dataset_from_array(arr, class_name):
+    """Given a uint8 array as returned by `write_dataset_to_array` and
+    the VTK class name of the dataset, return the TVTK dataset.
+    """
+    data = getattr(vtk_module, class_name)()
+    buf = array2vtk(numpy.ascontiguousarray(arr).view(numpy.int8))
+    if not vtk_module.vtkCommunicator.UnMarshalDataObject(buf, data):
+        raise ValueError('Unable to read the %s dataset.' % class_name)
+    return tvtk.to_tvtk(data)
+
+
+def _map_chunks(func, chunks):
+    """Applies `func` to the chunks, in threads if there are several
+    (zlib releases the GIL).
+    """
+    if ThreadPoolExecutor is None or len(chunks) < 2:
+        return list(map(func, chunks))
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(func, chunks))
+
+
+def compress_array(arr, level=1, chunk_size=CHUNK_SIZE):
+    """Compress the uint8 array with zlib at the given level, in chunks
+    of `chunk_size` bytes.  Returns the list of compressed chunks.
+    """
+    view = memoryview(numpy.ascontiguousarray(arr))
+    chunks = [view[i:i + chunk_size]
+              for i in range(0, len(view), chunk_size)]
+    return _map_chunks(lambda c: zlib.compress(c, level), chunks)
+
+
+def decompress_array(chunks, size, chunk_size=CHUNK_SIZE):
+    """Decompress the chunks produced by `compress_array` into a uint8
+    array of `size` bytes.
+    """
+    result = numpy.empty(size, dtype=numpy.uint8)
+
+    def _decompress(args):
+        i, chunk = args
+        data = numpy.frombuffer(zlib.decompress(chunk), dtype=numpy.uint8)
+        result[i*chunk_size:i*chunk_size + data.size] = data
+
+    _map_chunks(_decompress, list(enumerate(chunks)))
+    return result
+
+
 ######################################################################
 # `VTKDataSource` class
 ######################################################################
@@ -80,6 +152,11 @@ class VTKDataSource(Source):
     # The VTK dataset to manage.
     data = Instance(tvtk.DataSet, allow_none=False)
 
+    # The zlib compression level of the persisted data, 0 stores it
+    # uncompressed (and memory-mappable in a binary session).
+    compression_level = Range(0, 9, 1, desc='the compression level of '
+                              'the data when it is saved')
+
     # Information about what this object can produce.
     output_info = PipelineInfo(datasets=['any'],
                                attribute_types=['any'],
@@ -160,17 +237,33 @@ class VTKDataSource(Source):
             d.pop('_' + name + '_name', None)
         data = self.data
         if data is not None:
-            sdata = write_dataset_to_string(data)
-            if sys.version_info[0] > 2:
-                z = gzip_string(sdata.encode('ascii'))
+            arr = write_dataset_to_array(data)
+            level = self.compression_level
+            z = dict(format=DATASET_FORMAT, version=DATASET_FORMAT_VERSION,
+                     class_name=tvtk.to_vtk(data).GetClassName(),
+                     size=arr.size, compression=None, chunk_size=0)
+            if level > 0:
+                z.update(compression='zlib', chunk_size=CHUNK_SIZE,
+                         data=compress_array(arr, level))
             else:
-                z = gzip_string(sdata)
+                z['data'] = arr
             d['data'] = z
         return d
 
     def __set_pure_state__(self, state):
         z = state.data
-        if z is not None:
+        if isinstance(z, dict):
+            if z['version'] > DATASET_FORMAT_VERSION:
+                raise ValueError('The data was saved in a newer format '
+                                 '(version %s).' % z['version'])
+            if z['compression'] == 'zlib':
+                arr = decompress_array(z['data'], z['size'],
+                                       z['chunk_size'])
+            else:
+                arr = z['data']
+            self.data = read_dataset_from_array(arr, z['class_name'])
+        elif z is not None:
+            # Data saved by older versions as a gzipped ASCII string.
             if sys.version_info[0] > 2:
                 d = gunzip_string(z).decode('ascii')
             else:
@@ -55,33 +55,34 @@ class VTKFileReader(VTKXMLFileReader):
 
     def get_output_object(self):
         """ Return the reader output port."""
+        if self._timestep_cache is not None:
+            return self._producer.output_port
         return self.reader.output_port
 
     ######################################################################
     # Non-public interface
     ######################################################################
+    def _new_timestep_reader(self):
+        reader = self.reader._vtk_obj.NewInstance()
+        reader.ReadAllScalarsOn()
+        reader.ReadAllVectorsOn()
+        reader.ReadAllTensorsOn()
+        reader.ReadAllFieldsOn()
+        return reader
+
     def _file_path_changed(self, fpath):
         value = fpath.get()
         if len(value) == 0:
             self.name = 'No VTK file'
             return
         else:
-            self.reader.file_name = value
-            self.update()
-
             # Setup the outputs by resetting self.outputs.  Changing
             # the outputs automatically fires a pipeline_changed
             # event.
-            try:
-                n = self.reader.number_of_outputs
-            except AttributeError: # for VTK >= 4.5
-                n = self.reader.number_of_output_ports
-
-            if n > 0:
-                outputs = []
-                for i in range(n):
-                    outputs.append(self.reader.get_output(i))
+            outputs = self._get_reader_outputs(value)
+            self.render()
 
+            if len(outputs) > 0:
                 # FIXME: currently handling only one output (the first one)
                 # with assign attributes.
                 if has_attributes(outputs[0]):
@@ -175,12 +175,17 @@ class VTKXMLFileReader(FileDataSource):
     # Toggles if this is the first time this object has been used.
     _first = Bool(True)
 
+    # Produces the cached data of the current timestep when the
+    # timestep cache is enabled.  It then replaces the reader in the
+    # pipeline.
+    _producer = Instance(tvtk.TrivialProducer, args=(), allow_none=False)
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(VTKXMLFileReader, self).__get_pure_state__()
-        for name in ('_assign_attribute', '_first'):
+        for name in ('_assign_attribute', '_first', '_producer'):
             d.pop(name, None)
         # Pickle the 'point_scalars_name' etc. since these are
         # properties and not in __dict__.
@@ -233,15 +238,14 @@ class VTKXMLFileReader(FileDataSource):
     def update(self):
         if len(self.file_path.get()) == 0:
             return
-        reader = self.reader
-        reader.update()
+        self._update_reader_output()
         self.render()
 
     def update_data(self):
         if len(self.file_path.get()) == 0:
             return
-        self.reader.update()
-        pnt_attr, cell_attr = get_all_attributes(self.reader.output)
+        output = self._update_reader_output()
+        pnt_attr, cell_attr = get_all_attributes(output)
 
         def _setup_data_traits(obj, attributes, d_type):
             """Given the object, the dict of the attributes from the
@@ -250,7 +254,7 @@ class VTKXMLFileReader(FileDataSource):
             """
             attrs = ['scalars', 'vectors', 'tensors']
             aa = obj._assign_attribute
-            data = getattr(obj.reader.output, '%s_data'%d_type)
+            data = getattr(output, '%s_data'%d_type)
             for attr in attrs:
                 values = attributes[attr]
                 values.append('')
@@ -281,33 +285,95 @@ class VTKXMLFileReader(FileDataSource):
 
     def get_output_object(self):
         """ Return the reader output port."""
+        if self._timestep_cache is not None:
+            return self._producer.output_port
         return self.reader.output_port
 
+    def prepare_reader(self, file_name):
+        """Set the file name of the reader, creating it if needed, and
+        return the VTK reader.  The timestep cache is not used here.
+        """
+        if self._timestep_cache is not None:
+            return None
+        if self.reader is None:
+            self._create_reader(file_name)
+        self.reader.file_name = file_name
+        return self.reader._vtk_obj
+
+    def read_timestep_data(self, file_name):
+        """Read the file with a new reader of the same kind as ours
+        and return a copy of the VTK output not tied to the reader.
+        """
+        reader = self._new_timestep_reader()
+        reader.SetFileName(file_name)
+        reader.Update()
+        output = reader.GetOutputDataObject(0)
+        data = output.NewInstance()
+        data.ShallowCopy(output)
+        return data
+
     ######################################################################
     # Non-public interface
     ######################################################################
+    def _create_reader(self, file_name):
+        """Create the XML reader for the data type of the file."""
+        d_type = find_file_data_type(file_name)
+        self.reader = eval('tvtk.XML%sReader()'%d_type)
+
+    def _new_timestep_reader(self):
+        """Return a new VTK reader used to fill the timestep cache."""
+        return self.reader._vtk_obj.NewInstance()
+
+    def _get_reader_output(self):
+        """Return the output of the reader, or the cached data of the
+        current timestep if the timestep cache is enabled."""
+        if self._timestep_cache is not None:
+            return self._producer.get_output_data_object(0)
+        return self.reader.output
+
+    def _update_reader_output(self):
+        """Update the reader (or the producer of the cached data) and
+        return its output."""
+        if self._timestep_cache is not None:
+            self._producer.update()
+        else:
+            self.reader.update()
+        return self._get_reader_output()
+
+    def _get_reader_outputs(self, file_name):
+        """Read the given file and return the list of the outputs,
+        using the timestep cache if it is enabled."""
+        reader = self.reader
+        reader.file_name = file_name
+        data = self.get_timestep_data(file_name)
+        if data is not None:
+            producer = self._producer
+            producer.set_output(data)
+            producer.update()
+            return [data]
+
+        reader.update()
+        try:
+            n = reader.number_of_outputs
+        except AttributeError: # for VTK >= 4.5
+            n = reader.number_of_output_ports
+        outputs = []
+        for i in range(n):
+            outputs.append(reader.get_output(i))
+        return outputs
+
     def _file_path_changed(self, fpath):
         value = fpath.get()
         if len(value) == 0:
             return
         else:
             if self.reader is None:
-                d_type = find_file_data_type(fpath.get())
-                self.reader = eval('tvtk.XML%sReader()'%d_type)
-            reader = self.reader
-            reader.file_name = value
-            reader.update()
+                self._create_reader(value)
 
             # Setup the outputs by resetting self.outputs.  Changing
             # the outputs automatically fires a pipeline_changed
             # event.
-            try:
-                n = reader.number_of_outputs
-            except AttributeError: # for VTK >= 4.5
-                n = reader.number_of_output_ports
-            outputs = []
-            for i in range(n):
-                outputs.append(reader.get_output(i))
+            outputs = self._get_reader_outputs(value)
 
             # FIXME: Only the first output goes through the assign
             # attribute filter.
@@ -328,7 +394,7 @@ class VTKXMLFileReader(FileDataSource):
         if value is None:
             return
 
-        reader_output = self.reader.output
+        reader_output = self._get_reader_output()
         if len(value) == 0:
             # If the value is empty then we deactivate that attribute.
             d = getattr(reader_output, attr_type + '_data')
@@ -382,5 +448,10 @@ class VTKXMLFileReader(FileDataSource):
         return ret
 
     def _refresh_fired(self):
+        if self._timestep_cache is not None:
+            # Re-read the files from disk.
+            self._timestep_cache.clear()
+            self._file_path_changed(self.file_path)
+            return
         self.reader.modified()
         self.update_data()
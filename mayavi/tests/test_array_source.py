@@ -11,6 +11,7 @@ import numpy
 
 # Enthought library imports.
 from traits.api import TraitError
+from tvtk.vtk_module import VTK_MAJOR_VERSION
 from mayavi.sources.array_source import ArraySource
 from mayavi.modules.outline import Outline
 from mayavi.modules.surface import Surface
@@ -186,6 +187,46 @@ class TestArraySource(unittest.TestCase):
         self.assertEqual(numpy.allclose(vec2.flatten(),
                          expect[1].flatten()), True)
 
+    def test_fortran_data_not_copied(self):
+        "Test if Fortran-ordered scalars are transposed without a copy."
+        d = self.data
+        sc = numpy.asfortranarray(numpy.random.random((2, 3, 4)))
+        d.scalar_data = sc
+        sc1 = d.image_data.point_data.scalars.to_array()
+        self.assertTrue(numpy.shares_memory(sc1, sc))
+        self.assertEqual(numpy.allclose(sc1, numpy.transpose(sc).flatten()),
+                         True)
+
+    @unittest.skipIf(VTK_MAJOR_VERSION < 9, 'Needs oriented images.')
+    def test_map_axes(self):
+        "Test if the axes of C-ordered data are mapped without a copy."
+        d = self.data
+        d.map_axes = True
+        sc = numpy.random.random((2, 3, 4))
+        vec = numpy.random.random((2, 3, 4, 3))
+        d.scalar_data = sc
+        d.vector_data = vec
+        d.spacing = [1, 2, 3]
+        d.start()
+        pd = d.image_data.point_data
+        self.assertTrue(numpy.shares_memory(pd.scalars.to_array(), sc))
+        self.assertTrue(numpy.shares_memory(pd.vectors.to_array(), vec))
+
+        o = Outline()
+        d.add_child(o)
+        o.start()
+        self.assertEqual(tuple(o.actor.actor.bounds),
+                         (0., 1., 0., 4., 0., 9.))
+        output = d.outputs[0]
+        idx = output.find_point((1., 4., 6.))
+        self.assertEqual(output.point_data.scalars[idx], sc[1, 2, 2])
+
+        # Arrays that are not C-ordered are transposed.
+        d.scalar_data = numpy.transpose(numpy.random.random((4, 3, 2)))
+        self.assertEqual(d._mapped_axes, 0)
+        self.assertEqual(numpy.allclose(pd.vectors.to_array().flatten(),
+                         numpy.transpose(vec, (2, 1, 0, 3)).flatten()),
+                         True)
 
 
 if __name__ == '__main__':
@@ -4,6 +4,8 @@ import tempfile
 import shutil
 import mock
 
+from mayavi.core.file_data_source import (TimestepCache, get_file_list,
+        get_file_series)
 from mayavi.core.null_engine import NullEngine
 from mayavi.sources.vtk_xml_file_reader import VTKXMLFileReader
 from mayavi.modules.outline import Outline
@@ -209,6 +211,198 @@ class TestFileDataSourceTimestep(unittest.TestCase):
         self.assertEqual(r2._max_timestep, 2)
         self.assertEqual(len(r2.file_list), 3)
 
+    def test_timestep_cache_reuses_data(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        r.timestep = 0
+        e.add_source(r)
+        o = Outline()
+        e.add_module(o)
+
+        # When
+        r.cache_size = 10.0
+        cache = r._timestep_cache
+        r.timestep = 1
+        r.timestep = 0
+
+        # Then
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(self.abc1 in cache)
+        self.assertTrue(self.abc2 in cache)
+        self.assertEqual(r.get_output_object(), r._producer.output_port)
+        self.assertEqual(r.outputs[0].number_of_points,
+                         r.reader.output.number_of_points)
+
+        # When
+        r.cache_size = 0
+
+        # Then
+        self.assertEqual(r._timestep_cache, None)
+        self.assertEqual(r.get_output_object(), r.reader.output_port)
+
+    def test_open_uses_cached_listing(self):
+        # Given a directory modified long enough ago to trust its mtime.
+        mtime = os.stat(self.root).st_mtime - 10
+        os.utime(self.root, (mtime, mtime))
+        r1 = VTKXMLFileReader()
+        r1.initialize(self.abc1)
+        r2 = VTKXMLFileReader()
+
+        # When
+        with mock.patch('mayavi.core.file_data_source.listdir',
+                        wraps=os.listdir) as listdir:
+            r2.initialize(self.abc2)
+
+            # Then
+            self.assertEqual(listdir.call_count, 0)
+            self.assertEqual(r2.file_list, [self.abc1, self.abc2])
+
+            # When
+            r2.update_files = True
+
+            # Then
+            self.assertEqual(listdir.call_count, 1)
+
+    def test_stop_shuts_down_timestep_cache(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        e.add_source(r)
+        r.cache_size = 10.0
+        r.timestep = 0
+        cache = r._timestep_cache
+        self.assertNotEqual(cache._pool, None)
+
+        # When
+        r.stop()
+
+        # Then
+        self.assertEqual(cache._pool, None)
+
+
+class TestFileSeries(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for name in ('abc_1.vti', 'abc_2.vti', 'abc_10.vti', 'abc_3.vti',
+                     'abc_1s.vti', 'abc_x.vti', 'def_1.vti'):
+            open(os.path.join(self.root, name), 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_get_file_list(self):
+        # When
+        files = get_file_list(os.path.join(self.root, 'abc_2.vti'))
+
+        # Then
+        expected = [os.path.join(self.root, 'abc_%d.vti' % i)
+                    for i in (1, 2, 3, 10)]
+        self.assertEqual(files, expected)
+
+    def test_series_indices_and_update(self):
+        # Given
+        series = get_file_series(os.path.join(self.root, 'abc_1.vti'))
+        self.assertEqual(list(series.indices), [1, 2, 3, 10])
+        self.assertEqual(series.timestep(10), 3)
+        self.assertEqual(series.timestep(5), -1)
+
+        # When
+        new = os.path.join(self.root, 'abc_11.vti')
+        open(new, 'w').close()
+        # Make sure the directory modification time changes.
+        mtime = os.stat(self.root).st_mtime + 1
+        os.utime(self.root, (mtime, mtime))
+        series1 = get_file_series(os.path.join(self.root, 'abc_1.vti'))
+
+        # Then
+        self.assertTrue(series1 is series)
+        self.assertEqual(series.files[-1], new)
+        self.assertEqual(series.update(), [])
+
+    def test_update_within_mtime_tick(self):
+        # Given
+        series = get_file_series(os.path.join(self.root, 'abc_1.vti'))
+        mtime = os.stat(self.root).st_mtime
+
+        # When a file is added without changing the recent mtime.
+        new = os.path.join(self.root, 'abc_11.vti')
+        open(new, 'w').close()
+        os.utime(self.root, (mtime, mtime))
+
+        # Then
+        self.assertEqual(series.update(), [new])
+
+        # When the mtime is old enough to be trusted, only an explicit
+        # rescan finds the new files.
+        old = mtime - 10
+        os.utime(self.root, (old, old))
+        series.update()
+        new = os.path.join(self.root, 'abc_12.vti')
+        open(new, 'w').close()
+        os.utime(self.root, (old, old))
+
+        # Then
+        self.assertEqual(series.update(), [])
+        self.assertEqual(get_file_list(new, rescan=True)[-1], new)
+
+    def test_series_cache_is_bounded(self):
+        # Given
+        from mayavi.core import file_data_source
+        cache = file_data_source._file_series_cache
+        n = file_data_source.FILE_SERIES_CACHE_SIZE
+
+        # When
+        for i in range(n + 5):
+            get_file_series(os.path.join(self.root, 'x%d_1.vti' % i))
+
+        # Then
+        self.assertEqual(len(cache), n)
+
+
+class TestTimestepCache(unittest.TestCase):
+    class Data(object):
+        def __init__(self, name):
+            self.name = name
+        def GetActualMemorySize(self):
+            return 1
+
+    def test_lru_eviction(self):
+        # Given
+        reads = []
+        def read(fname):
+            reads.append(fname)
+            return self.Data(fname)
+        cache = TimestepCache(read, max_bytes=2048)
+
+        # When
+        a = cache.get('a')
+        cache.get('b')
+        cache.get('a')
+        cache.get('c')
+
+        # Then
+        self.assertEqual(a.name, 'a')
+        self.assertEqual(reads, ['a', 'b', 'c'])
+        self.assertEqual(len(cache), 2)
+        self.assertFalse('b' in cache)
+        self.assertEqual(cache.nbytes, 2048)
+
+    def test_prefetch(self):
+        # Given
+        cache = TimestepCache(self.Data, max_bytes=10*1024)
+
+        # When
+        cache.prefetch(['a', 'b'])
+        b = cache.get('b')
+
+        # Then
+        self.assertEqual(b.name, 'b')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for the progress and asynchronous updates of FilterBase.
+"""
+
+import threading
+import time
+import unittest
+
+import mock
+from tvtk.api import tvtk
+
+from mayavi.core.null_engine import NullEngine
+from mayavi.filters.extract_edges import ExtractEdges
+from mayavi.filters.filter_base import FilterBase, copy_algorithm
+from mayavi.sources.vtk_data_source import VTKDataSource
+from mayavi.tests import datasets
+
+
+class TestFilterBase(unittest.TestCase):
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        src = VTKDataSource(data=datasets.generateStructuredGrid())
+        e.add_source(src)
+        self.filter = ExtractEdges()
+        e.add_filter(self.filter)
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_progress(self):
+        f = self.filter
+        f.progress = 0.0
+        f.filter.modified()
+        f.update_data()
+        self.assertEqual(f.progress, 1.0)
+
+    def test_asynchronous_without_interactive_scene(self):
+        f = self.filter
+        f.asynchronous = True
+        f.update_data()
+        # There is no event loop to swap the output in, so the update
+        # is synchronous.
+        self.assertFalse(f.update_pending)
+        self.assertTrue(f.outputs[0] is f.filter)
+
+    def test_finish_async_update(self):
+        f = self.filter
+        result = tvtk.PolyData()
+        result.shallow_copy(f.filter.output)
+        n_points = result.number_of_points
+
+        # Stale results are dropped.
+        f._update_generation += 2
+        f._finish_async_update(result, f._update_generation - 1)
+        self.assertTrue(f.outputs[0] is f.filter)
+
+        f._finish_async_update(result, f._update_generation)
+        output = f.outputs[0]
+        self.assertTrue(output is result)
+        self.assertEqual(output.number_of_points, n_points)
+
+        # Later results are swapped into the same output.
+        f._finish_async_update(tvtk.PolyData(), f._update_generation)
+        self.assertTrue(f.outputs[0] is output)
+        self.assertEqual(output.number_of_points, 0)
+
+        # Switching back to synchronous updates connects the filter.
+        f.update_data()
+        self.assertTrue(f.outputs[0] is f.filter)
+
+    def test_copy_algorithm(self):
+        cf = tvtk.ContourFilter()
+        cf.set_value(0, 0.25)
+        cf.set_value(1, 0.5)
+        cf.compute_normals = False
+        # Changed in VTK only, the traits are not up to date.
+        cf._vtk_obj.SetComputeScalars(0)
+        copy = copy_algorithm(cf)
+        self.assertTrue(isinstance(copy, tvtk.ContourFilter))
+        self.assertFalse(copy is cf)
+        obj = copy._vtk_obj
+        self.assertEqual(obj.GetNumberOfContours(), 2)
+        self.assertEqual(obj.GetValue(1), 0.5)
+        self.assertFalse(obj.GetComputeNormals())
+        self.assertFalse(obj.GetComputeScalars())
+
+    def test_cancel_async_update(self):
+        e = self.e
+        e.new_scene()
+        rt = tvtk.RTAnalyticSource(whole_extent=(-100, 100)*3)
+        rt.update()
+        e.add_source(VTKDataSource(data=rt.output))
+        cf = tvtk.ContourFilter()
+        f = FilterBase(filter=cf)
+        e.add_filter(f)
+        # Many contours of a large dataset, which are slow to compute.
+        cf._vtk_obj.GenerateValues(50, 50, 250)
+
+        f._start_async_update()
+        worker = f._async_worker
+        thread = f._async_thread
+        self.assertTrue(f.update_pending)
+        f._cancel_async_update()
+        # The aborted update ends in the background.
+        thread.join(30)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(worker._vtk_obj.GetProgress() < 1.0)
+        # The filter is still connected.
+        self.assertTrue(f.outputs[0] is cf)
+
+        # Stopping the filter also waits for the update.
+        f._start_async_update()
+        thread = f._async_thread
+        f.stop()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(f._async_thread, None)
+
+    def test_restart_does_not_wait(self):
+        f = self.filter
+        release = threading.Event()
+
+        def run_async_update(worker, generation):
+            # A filter which does not check for aborts.
+            release.wait(30)
+
+        with mock.patch.object(FilterBase, '_run_async_update',
+                               run_async_update):
+            f._start_async_update()
+            first = f._async_thread
+            t = time.time()
+            f._start_async_update()
+            elapsed = time.time() - t
+            second = f._async_thread
+            self.assertTrue(elapsed < 5)
+            self.assertTrue(first.is_alive())
+            self.assertTrue(second is not first)
+            self.assertEqual(f._stale_threads, [first])
+            # Stopping waits for all the threads.
+            release.set()
+            f.stop()
+        self.assertFalse(first.is_alive())
+        self.assertFalse(second.is_alive())
+        self.assertEqual(f._stale_threads, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Tests for the lazy imports of mlab and the import time report.
+"""
+
+import subprocess
+import sys
+import unittest
+
+from mayavi.tools.import_report import format_report, package_times, \
+    parse_import_times
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     numpy.core
+import time:       300 |        400 |   numpy
+import time:      1000 |       1000 |   tvtk.common
+import time:       500 |       1900 | mayavi.mlab
+"""
+
+
+class TestImportReport(unittest.TestCase):
+    def test_parse(self):
+        times = parse_import_times(OUTPUT)
+        self.assertEqual([t[0] for t in times],
+                         ['numpy.core', 'numpy', 'tvtk.common',
+                          'mayavi.mlab'])
+        self.assertAlmostEqual(times[-1][1], 500e-6)
+        self.assertAlmostEqual(times[-1][2], 1900e-6)
+
+    def test_report(self):
+        times = parse_import_times(OUTPUT)
+        packages = package_times(times)
+        self.assertEqual([p[0] for p in packages],
+                         ['tvtk', 'mayavi', 'numpy'])
+        self.assertAlmostEqual(packages[-1][1], 400e-6)
+        report = format_report(times, top=2, prefix='mayavi')
+        self.assertTrue(report.startswith('Total import time: 0.002 s'))
+        self.assertTrue('mayavi.mlab' in report)
+        self.assertFalse('numpy.core' in report)
+
+    def test_mlab_import_is_lazy(self):
+        code = ("import sys; from mayavi import mlab; "
+                "print('vtkmodules' in sys.modules, "
+                "'mayavi.core.engine' in sys.modules)")
+        out = subprocess.check_output([sys.executable, '-c', code],
+                                      universal_newlines=True)
+        self.assertEqual(out.split(), ['False', 'False'])
+
+
+if __name__ == '__main__':
+    unittest.main()
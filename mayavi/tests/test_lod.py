@@ -0,0 +1,53 @@
+"""
+Tests for the level-of-detail proxies of the Actor component.
+"""
+
+import unittest
+
+from tvtk.api import tvtk
+from tvtk.pyface.tvtk_scene import TVTKScene
+
+from mayavi.components.actor import Actor
+
+
+class TestActorLOD(unittest.TestCase):
+    def setUp(self):
+        scene = TVTKScene(off_screen_rendering=True)
+        self.addCleanup(scene.close)
+        scene.lod_interaction = True
+        scene.lod_max_points = 1000
+        self.scene = scene
+        sphere = tvtk.SphereSource(theta_resolution=100, phi_resolution=100)
+        a = Actor()
+        a.mapper.set_input_connection(sphere.output_port)
+        a.mapper.update()
+        a.scene = scene
+        self.actor = a
+
+    def test_proxy_while_interacting(self):
+        a = self.actor
+        self.scene.interacting = True
+        mapper = a.actor.mapper
+        self.assertTrue(mapper is a._lod_mapper)
+        mapper.update()
+        self.assertTrue(0 < mapper.input.number_of_points <= 1000)
+        self.assertEqual(mapper.lookup_table, a.mapper.lookup_table)
+
+        self.scene.interacting = False
+        self.assertTrue(a.actor.mapper is a.mapper)
+
+    def test_opt_out(self):
+        a = self.actor
+        a.enable_lod = False
+        self.scene.interacting = True
+        self.assertTrue(a.actor.mapper is a.mapper)
+
+    def test_small_data(self):
+        a = self.actor
+        self.scene.lod_max_points = 100000
+        self.scene.interacting = True
+        self.assertTrue(a.actor.mapper is a.mapper)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the lookup table handling of mayavi.core.lut_manager.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from tvtk.api import tvtk
+
+from mayavi.core.lut_manager import ColormapRegistry, LUTManager, \
+    get_pylab_lut_table, lut_mode_list, parse_lut_file, pylab_luts, \
+    register_colormap, save_colormaps, set_lut
+
+
+class TestLUTUtilities(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def write_lut(self, text):
+        file_name = os.path.join(self.temp_dir, 'test.lut')
+        with open(file_name, 'w') as f:
+            f.write(text)
+        return file_name
+
+    def test_parse_lut_file(self):
+        file_name = self.write_lut('LOOKUP_TABLE test 2\n'
+                                   '0 0 0 1\n0.5 1 0.25 1\n')
+        lut = parse_lut_file(file_name)
+        self.assertEqual(lut.shape, (2, 4))
+        self.assertEqual(lut[1].tolist(), [0.5, 1.0, 0.25, 1.0])
+
+    def test_parse_invalid_lut_file(self):
+        file_name = self.write_lut('LOOKUP_TABLE test 2\n0 0 0\n1 1 1 1\n')
+        self.assertRaises(IOError, parse_lut_file, file_name)
+        file_name = self.write_lut('LOOKUP_TABLE test 1\n0 a 0 1\n')
+        self.assertRaises(IOError, parse_lut_file, file_name)
+        file_name = self.write_lut('TABLE test 1\n0 0 0 1\n')
+        self.assertRaises(IOError, parse_lut_file, file_name)
+
+    def test_set_lut_matches_table_values(self):
+        values = np.random.random((16, 4))
+        lut = set_lut(tvtk.LookupTable(), values)
+        expected = tvtk.LookupTable(number_of_colors=16)
+        expected.build()
+        for i, v in enumerate(values):
+            expected.set_table_value(i, *v)
+        self.assertEqual(lut.number_of_colors, 16)
+        np.testing.assert_array_equal(lut.table.to_array(),
+                                      expected.table.to_array())
+
+    @unittest.skipIf(len(pylab_luts) == 0, 'No pylab colormaps available')
+    def test_pylab_lut_table_cache(self):
+        table = get_pylab_lut_table('jet', 64)
+        self.assertEqual(table.shape, (64, 4))
+        self.assertTrue(get_pylab_lut_table('jet', 64) is table)
+        self.assertFalse(table.flags.writeable)
+        reverse = get_pylab_lut_table('jet', 64, reverse=True)
+        np.testing.assert_array_equal(reverse[0],
+                                      get_pylab_lut_table('jet', 256)[-1])
+        # More colors than the colormap defines gives the full table.
+        self.assertTrue(get_pylab_lut_table('jet', 1000) is
+                        get_pylab_lut_table('jet', 256))
+
+    @unittest.skipIf(len(pylab_luts) == 0, 'No pylab colormaps available')
+    def test_lut_manager_mode(self):
+        lm = LUTManager(lut_mode='jet', number_of_colors=64)
+        np.testing.assert_array_equal(lm.lut.table.to_array(),
+                                      get_pylab_lut_table('jet', 64))
+        lm.reverse_lut = True
+        np.testing.assert_array_equal(
+            lm.lut.table.to_array(),
+            get_pylab_lut_table('jet', 64, reverse=True)
+        )
+
+
+class TestColormapRegistry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.luts = {'a': np.random.random((4, 4)),
+                     'b': np.random.random((3, 4))}
+        self.file_name = os.path.join(self.temp_dir, 'luts')
+        save_colormaps(self.luts, self.file_name)
+
+    def test_lazy_access(self):
+        registry = ColormapRegistry(self.file_name)
+        self.assertEqual(sorted(registry), ['a', 'b'])
+        self.assertTrue('b' in registry)
+        # Nothing is read until a colormap is accessed.
+        self.assertTrue(registry._data is None)
+        lut = registry['b']
+        np.testing.assert_array_equal(lut, self.luts['b'])
+        self.assertFalse(lut.flags.writeable)
+        self.assertTrue(registry['b'] is lut)
+        self.assertRaises(KeyError, registry.__getitem__, 'c')
+
+    def test_register(self):
+        registry = ColormapRegistry(self.file_name)
+        colors = np.random.random((5, 3))
+        registry.register('c', colors)
+        self.assertEqual(len(registry), 3)
+        np.testing.assert_array_equal(registry['c'][:, :3], colors)
+        np.testing.assert_array_equal(registry['c'][:, 3], 1.0)
+        # Replacing a colormap from the file.
+        registry.register('a', colors)
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(registry['a'].shape, (5, 4))
+        self.assertRaises(ValueError, registry.register, 'd', colors[:, :2])
+
+    def test_missing_files(self):
+        self.assertRaises(IOError, ColormapRegistry,
+                          os.path.join(self.temp_dir, 'missing'))
+        self.assertEqual(ColormapRegistry(), {})
+
+    def test_register_colormap(self):
+        colors = np.linspace(0, 1, 8)[:, None]*np.ones((1, 3))
+        register_colormap('test-grays', colors)
+        self.addCleanup(pylab_luts._luts.pop, 'test-grays')
+        self.addCleanup(pylab_luts._names.remove, 'test-grays')
+        self.assertTrue('test-grays' in lut_mode_list())
+        lm = LUTManager(lut_mode='test-grays', number_of_colors=8)
+        table = lm.lut.table.to_array()
+        self.assertEqual(table.shape, (8, 4))
+        self.assertEqual(table[-1].tolist(), [255, 255, 255, 255])
+        self.assertRaises(ValueError, register_colormap, 'file', colors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ from mayavi import mlab
 from mayavi.core.engine import Engine
 from tvtk.api import tvtk
 from mayavi.tools.engine_manager import engine_manager
+from mayavi.tools.probe_data import Prober
 from mayavi.core.registry import registry
 from mayavi.tests.common import get_example_data
 
@@ -329,6 +330,24 @@ class TestMlabPipeline(TestMlabNullEngine):
         np.testing.assert_array_almost_equal(w_, z_,
                                              decimal=3)
 
+    def test_prober(self):
+        """ Test the Prober used by probe_data
+        """
+        x, y, z = np.mgrid[0:1:10j, 0:1:10j, 0:1:10j]
+        flow = mlab.flow(x, y, z, x, y, z, scalars=x + y + z)
+        prober = Prober(flow, chunk_size=7)
+        points = np.random.random((20, 3))
+        res = prober.probe(points, types=('scalars', 'vectors'))
+        np.testing.assert_array_almost_equal(res['scalars'],
+                                             points.sum(axis=1),
+                                             decimal=2)
+        np.testing.assert_array_almost_equal(res['vectors'], points,
+                                             decimal=2)
+        # Probing again with a single type.
+        s = prober.probe(points[:5], 'scalars')
+        self.assertEqual(s.shape, (5,))
+        np.testing.assert_array_almost_equal(s, res['scalars'][:5])
+
 
 ################################################################################
 # class `TestMlabHelperFunctions`
@@ -2,8 +2,11 @@
 Test the mlab null engine.
 """
 
+import threading
 import unittest
 
+import mock
+
 from mayavi import mlab
 from mayavi.core.engine import Engine
 from mayavi.tools.engine_manager import engine_manager
@@ -56,5 +59,41 @@ class TestRealMlabNullEngine(unittest.TestCase):
         mlab.pipeline.open(get_example_data('cube.vti'))
         mlab.clf()
 
+    def test_open_many(self):
+        """Test if many files can be opened at once."""
+        mlab.options.backend = 'test'
+        files = [get_example_data(f) for f in
+                 ('cube.vti', 'pyramid_ug.vtu', 'polyEx.vtk', 'cube.vti')]
+        srcs = mlab.pipeline.open_many(files + ['no_reader.xyzzy'],
+                                       n_workers=2)
+        self.assertEqual(len(srcs), 5)
+        self.assertEqual(srcs[-1], None)
+        scene = mlab.get_engine().current_scene
+        self.assertEqual(scene.children, srcs[:4])
+        for src in srcs[:4]:
+            self.assertTrue(src.outputs[0] is not None)
+        mlab.clf()
+
+    def test_open_many_initializes_on_calling_thread(self):
+        """Test if the sources are only initialized on the calling
+        thread."""
+        mlab.options.backend = 'test'
+        from mayavi.sources.vtk_xml_file_reader import VTKXMLFileReader
+        threads = []
+        initialize = VTKXMLFileReader.initialize
+
+        def record_thread(src, file_name):
+            threads.append(threading.current_thread())
+            return initialize(src, file_name)
+
+        files = [get_example_data(f) for f in ('cube.vti', 'pyramid_ug.vtu')]
+        with mock.patch.object(VTKXMLFileReader, 'initialize',
+                               record_thread):
+            srcs = mlab.pipeline.open_many(files, n_workers=2)
+        self.assertEqual(threads, [threading.current_thread()]*2)
+        for src in srcs:
+            self.assertTrue(src.outputs[0] is not None)
+        mlab.clf()
+
 if __name__ == '__main__':
     unittest.main()
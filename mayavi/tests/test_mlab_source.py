@@ -173,6 +173,63 @@ class TestMGlyphSource(unittest.TestCase):
         src.trait_set(x=x, y=y, z=z, u=v, v=v, w=v, scalars=None)
         src.trait_set(x=x, y=y, z=z, u=v, v=v, w=v, scalars=s)
 
+    def test_stream(self):
+        "Test if streaming data updates the source in place."
+        x, y, z, v, s, src = self.get_data()
+        pts = N.random.random((10, 3))
+        self.v = v = N.random.random((10, 3))
+        self.s = s = N.random.random(10)
+        src.stream(points=pts, scalars=s, vectors=v)
+        self.x, self.y, self.z = pts.T
+        self.check_traits()
+        self.check_dataset()
+        points = src.points
+        polys = src.dataset.polys
+
+        # Same size: the buffers and the connectivity are reused.
+        pts *= 2
+        s *= 2
+        v *= 2
+        src.stream(points=pts, scalars=s, vectors=v)
+        self.check_traits()
+        self.check_dataset()
+        self.assertTrue(src.points is points)
+        self.assertTrue(src.dataset.polys is polys)
+
+        # Fewer points fit in the same buffers.
+        src.stream(points=pts[:4], scalars=s[:4], vectors=v[:4])
+        self.assertTrue(N.may_share_memory(src.points, points))
+        self.assertEqual(src.dataset.number_of_points, 4)
+        self.assertEqual(src.dataset.number_of_cells, 4)
+
+        # More points grow the buffers.
+        pts = N.random.random((30, 3))
+        self.v = v = N.random.random((30, 3))
+        self.s = s = N.random.random(30)
+        src.stream(points=pts, scalars=s, vectors=v)
+        self.x, self.y, self.z = pts.T
+        self.check_traits()
+        self.check_dataset()
+        self.assertEqual(src.dataset.number_of_cells, 30)
+
+        # Scalars must be given when the number of points changes.
+        self.assertRaises(ValueError, src.stream, points=pts[:5])
+
+    @patch('mayavi.tools.engine_manager.options.backend', 'test')
+    def test_stream_changes_pipeline(self):
+        # Given
+        from mayavi import mlab
+        x, y, z = N.random.random((3, 10))
+        g = mlab.points3d(x, y, z, x*x + y*y + z*z)
+        bounds = g.actor.actor.bounds
+
+        # When
+        pts = N.random.random((10, 3)) + 1.0
+        g.mlab_source.stream(points=pts)
+
+        # Then
+        self.assertFalse(N.allclose(bounds, g.actor.actor.bounds))
+
     @patch('mayavi.tools.engine_manager.options.backend', 'test')
     def test_reset_changes_pipeline(self):
         # Given
@@ -0,0 +1,71 @@
+"""
+Tests for the range computations of mayavi.core.module_manager.
+"""
+
+import unittest
+
+import numpy as np
+from tvtk.api import tvtk
+
+from mayavi.core.module_manager import DataAttributes, compute_array_range
+
+
+class TestComputeArrayRange(unittest.TestCase):
+    def test_scalar_range_with_nan(self):
+        a = np.random.random(1000)
+        a[10] = np.nan
+        d_min, d_max, has_nan = compute_array_range(a, chunk_size=64)
+        self.assertTrue(has_nan)
+        self.assertEqual(d_min, np.nanmin(a))
+        self.assertEqual(d_max, np.nanmax(a))
+
+    def test_parallel_matches_serial(self):
+        a = np.random.random(10000)
+        self.assertEqual(compute_array_range(a, chunk_size=100),
+                         compute_array_range(a, chunk_size=100, n_workers=4))
+
+    def test_magnitude_range(self):
+        v = np.random.random((500, 3))
+        mag = np.sqrt((v*v).sum(axis=1))
+        d_min, d_max, has_nan = compute_array_range(v, magnitude=True,
+                                                    chunk_size=64)
+        self.assertFalse(has_nan)
+        self.assertAlmostEqual(d_min, mag.min())
+        self.assertAlmostEqual(d_max, mag.max())
+
+
+class TestDataAttributes(unittest.TestCase):
+    def test_compute_scalar(self):
+        a = np.arange(10.0)
+        a[3] = np.nan
+        arr = tvtk.DoubleArray()
+        arr.from_array(a)
+        da = DataAttributes()
+        da.compute_scalar(arr)
+        self.assertEqual(da.name, 'point_scalars')
+        self.assertEqual(da.range, [0.0, 9.0])
+
+        # The range is recomputed when the data changes.
+        a[9] = 20.0
+        arr.modified()
+        da.compute_scalar(arr)
+        self.assertEqual(da.range, [0.0, 20.0])
+
+    def test_compute_vector(self):
+        v = np.zeros((4, 3))
+        v[:, 0] = [1.0, 2.0, 3.0, 4.0]
+        arr = tvtk.DoubleArray()
+        arr.from_array(v)
+        da = DataAttributes()
+        da.compute_vector(arr, 'cell')
+        self.assertEqual(da.name, 'cell_vectors')
+        self.assertEqual(da.range, [0.0, 4.0])
+
+        v[0, 0] = np.nan
+        arr.modified()
+        da.compute_vector(arr, 'cell')
+        self.assertEqual(da.range, [2.0, 4.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
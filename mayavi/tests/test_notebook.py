@@ -0,0 +1,106 @@
+"""
+Tests for the webgl backend of mayavi.tools.notebook.
+"""
+
+import unittest
+
+import mock
+import numpy
+
+from tvtk.api import tvtk
+from tvtk.common import configure_input_data
+
+from mayavi.tools.notebook import line_segments, quantize_points, \
+    renderer_to_webgl, scene_to_webgl
+
+
+class TestWebGL(unittest.TestCase):
+    def setUp(self):
+        self.points = numpy.array([[0, 0, 0], [1, 0, 0], [1, 1, 0],
+                                   [0, 1, 1]], dtype=float)
+        quads = numpy.array([[0, 1, 2, 3]])
+        self.data = tvtk.PolyData(points=self.points, polys=quads)
+        self.data.point_data.scalars = numpy.arange(4.0)
+        mapper = tvtk.PolyDataMapper()
+        configure_input_data(mapper, self.data)
+        self.actor = tvtk.Actor(mapper=mapper)
+        self.renderer = tvtk.Renderer()
+        self.renderer.add_actor(self.actor)
+
+    def test_quantize_points(self):
+        quantized, offset, scale = quantize_points(self.points)
+        self.assertEqual(quantized.dtype, numpy.uint16)
+        numpy.testing.assert_allclose(offset + scale*quantized, self.points)
+
+    def test_line_segments(self):
+        offsets = numpy.array([0, 3, 5])
+        connectivity = numpy.array([0, 1, 2, 5, 6])
+        numpy.testing.assert_array_equal(line_segments(offsets, connectivity),
+                                         [[0, 1], [1, 2], [5, 6]])
+        # Empty lines and lines of a single point have no segments.
+        offsets = numpy.array([0, 0, 1, 3, 3])
+        connectivity = numpy.array([4, 5, 6])
+        numpy.testing.assert_array_equal(line_segments(offsets, connectivity),
+                                         [[5, 6]])
+        self.assertEqual(line_segments(offsets[:2], connectivity[:0]).shape,
+                         (0, 2))
+
+    def test_lines_geometry(self):
+        lines = numpy.array([[0, 1, 2, 3]])
+        data = tvtk.PolyData(points=self.points, lines=lines)
+        mapper = tvtk.PolyDataMapper()
+        configure_input_data(mapper, data)
+        self.renderer.add_actor(tvtk.Actor(mapper=mapper))
+        info, buffers = renderer_to_webgl(self.renderer)
+        segments = buffers[info['actors'][1]['lines']['hash']]
+        numpy.testing.assert_array_equal(segments, [[0, 1], [1, 2], [2, 3]])
+
+    def test_renderer_to_webgl(self):
+        info, buffers = renderer_to_webgl(self.renderer)
+        self.assertEqual(len(info['actors']), 1)
+        actor = info['actors'][0]
+        self.assertEqual(actor['positions']['dtype'], 'uint16')
+        self.assertEqual(actor['normals'], None)
+        self.assertEqual(actor['colors']['size'], 3)
+        # The quad is sent as two indexed triangles.
+        triangles = buffers[actor['triangles']['hash']]
+        self.assertEqual(triangles.shape, (2, 3))
+        self.assertEqual(triangles.dtype, numpy.uint16)
+        self.assertEqual(len(buffers), 3)
+
+    def test_scene_to_webgl_is_self_contained(self):
+        scene = mock.Mock(renderer=self.renderer,
+                          render_window=mock.Mock(size=(300, 200)))
+        info, buffers = renderer_to_webgl(self.renderer)
+        # Displaying the scene again, as when re-running a cell, still
+        # includes the script and all the arrays.
+        for i in range(2):
+            html = scene_to_webgl(scene)
+            self.assertTrue('root.MayaviWebGL = {' in html)
+            for key in buffers:
+                self.assertTrue(key in html)
+
+    def test_changed_arrays(self):
+        info, buffers = renderer_to_webgl(self.renderer)
+        actor = info['actors'][0]
+        info1, buffers1 = renderer_to_webgl(self.renderer)
+        self.assertEqual(info1, info)
+
+        # Only the arrays which changed have new hashes, the quantized
+        # positions of scaled points are the same.
+        self.data.points = self.points*2
+        info2, buffers2 = renderer_to_webgl(self.renderer)
+        actor2 = info2['actors'][0]
+        self.assertNotEqual(actor2['scale'], actor['scale'])
+        self.assertEqual(actor2['positions'], actor['positions'])
+        self.assertEqual(actor2['triangles'], actor['triangles'])
+        self.assertEqual(actor2['colors'], actor['colors'])
+
+        self.actor.visibility = False
+        info3, buffers3 = renderer_to_webgl(self.renderer)
+        self.assertEqual(info3['actors'], [])
+        self.assertEqual(buffers3, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the point_spacing function of mayavi.tools.tools.
+"""
+
+import sys
+import time
+import unittest
+
+import mock
+import numpy as np
+
+from mayavi.tools.tools import point_spacing
+
+
+def brute_force_spacing(points):
+    d = np.sqrt(((points[:, np.newaxis] - points[np.newaxis])**2).sum(-1))
+    return d[d > 0].min()
+
+
+class TestPointSpacing(unittest.TestCase):
+    def test_euclidean(self):
+        points = np.random.random((300, 3))*[1.0, 5.0, 0.1]
+        # Coincident points are ignored.
+        points[:20] = points[20:40]
+        self.assertAlmostEqual(point_spacing(points),
+                               brute_force_spacing(points))
+
+    def test_grid(self):
+        points = np.mgrid[0:10, 0:10, 0:10].reshape((3, -1)).T*0.5
+        self.assertAlmostEqual(point_spacing(points), 0.5)
+        self.assertAlmostEqual(point_spacing(points, 'axis'), 0.5)
+
+    def test_axis(self):
+        points = np.array([[0.0, 0.0, 0.0], [1.0, 0.25, 2.0],
+                           [1.0, 1.0, 0.0]])
+        self.assertEqual(point_spacing(points, 'axis'), 0.25)
+
+    def test_sampled_is_upper_bound(self):
+        points = np.random.random((1000, 3))
+        exact = point_spacing(points)
+        self.assertTrue(point_spacing(points, sample_size=10) >= exact)
+
+    def test_typical(self):
+        points = np.random.random((1000, 3))
+        extent = points.max(axis=0) - points.min(axis=0)
+        expected = 0.4*np.sqrt((extent**2).sum()/(4*1000**0.33))
+        self.assertAlmostEqual(point_spacing(points, 'typical'), expected)
+
+    def test_clustered_without_scipy(self):
+        # A tight cluster and an outlier falls in a single cell of the
+        # grid, the cloud must be split instead.
+        cluster = np.random.random((20000, 3))*1e-3
+        points = np.vstack([cluster, [[1e4, 1e4, 1e4]]])
+        with mock.patch.dict(sys.modules, {'scipy.spatial': None}):
+            t = time.time()
+            spacing = point_spacing(points)
+            t = time.time() - t
+            small = np.vstack([cluster[:500], [[1e4, 1e4, 1e4]]])
+            self.assertAlmostEqual(point_spacing(small),
+                                   brute_force_spacing(small))
+        self.assertTrue(t < 5)
+        self.assertTrue(spacing <= brute_force_spacing(cluster[:2000]))
+
+    def test_degenerate(self):
+        points = np.ones((5, 3))
+        for method in ('euclidean', 'axis', 'typical'):
+            self.assertEqual(point_spacing(points, method), 1)
+        self.assertRaises(ValueError, point_spacing, points, 'foo')
+
+
+if __name__ == '__main__':
+    unittest.main()
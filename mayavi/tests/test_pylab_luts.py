@@ -11,7 +11,7 @@ class TestPylabLuts(unittest.TestCase):
                       "another tests. Can't run this test."))
     @patch("mayavi.core.lut.__file__", "wrong_path/for_lut.py")
     def test_fail_load_pylab_luts(self):
-        """ Test if lut_manager can be loaded despite faulty pylab_luts.pkl
+        """ Test if lut_manager can be loaded despite faulty pylab_luts files
         """
         from mayavi.core.lut_manager import pylab_luts
         self.assertEqual(pylab_luts, {})
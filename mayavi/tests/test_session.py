@@ -0,0 +1,109 @@
+"""
+Tests for the binary sessions of mayavi.core.session.
+"""
+
+import json
+import os
+from os.path import join
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.session import SESSION_VERSION, array_hash, \
+    is_session, load_session_state, save_session
+from mayavi.sources.array_source import ArraySource
+from mayavi.modules.outline import Outline
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.data = numpy.random.random((50, 50, 50))
+        src = ArraySource(scalar_data=self.data)
+        e.add_source(src)
+        e.add_module(Outline())
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.session = join(self.temp_dir, 'test.mv2d')
+
+    def tearDown(self):
+        self.e.stop()
+
+    def array_files(self):
+        return sorted(os.listdir(join(self.session, 'arrays')))
+
+    def test_save_load(self):
+        e = self.e
+        e.save_visualization(self.session)
+        self.assertEqual(self.array_files(),
+                         [array_hash(self.data) + '.npy'])
+        e.close_scene(e.current_scene)
+
+        e.load_visualization(self.session)
+        src = e.current_scene.children[0]
+        self.assertTrue(isinstance(src, ArraySource))
+        numpy.testing.assert_array_equal(src.scalar_data, self.data)
+        self.assertTrue(isinstance(src.children[0].children[0], Outline))
+        self.assertFalse(e.current_scene.scene.disable_render)
+
+    def test_incremental_save(self):
+        e = self.e
+        src = e.current_scene.children[0]
+        # Identical arrays are stored once.
+        src.vector_data = numpy.repeat(self.data[..., None], 3, axis=-1)
+        e.save_visualization(self.session)
+        self.assertEqual(len(self.array_files()), 2)
+        blob = join(self.session, 'arrays', array_hash(self.data) + '.npy')
+        mtime = os.stat(blob).st_mtime
+
+        # Unchanged arrays are not written again and unused ones are
+        # removed.
+        src.vector_data = None
+        e.save_visualization(self.session)
+        self.assertEqual(self.array_files(),
+                         [array_hash(self.data) + '.npy'])
+        self.assertEqual(os.stat(blob).st_mtime, mtime)
+
+    def test_newer_version(self):
+        self.e.save_visualization(self.session)
+        info_file = join(self.session, 'session.json')
+        with open(info_file) as f:
+            info = json.load(f)
+        info['version'] = SESSION_VERSION + 1
+        with open(info_file, 'w') as f:
+            json.dump(info, f)
+        self.assertRaises(IOError, load_session_state, self.session)
+
+    def test_is_session(self):
+        self.assertTrue(is_session(self.session))
+        # A plain directory is not a session.
+        self.assertFalse(is_session(self.temp_dir))
+        self.e.save_visualization(self.session)
+        self.assertTrue(is_session(self.session))
+
+    def test_save_keeps_foreign_files(self):
+        # Given a directory that is not a session, with unrelated arrays.
+        array_dir = join(self.temp_dir, 'arrays')
+        os.makedirs(array_dir)
+        user_file = join(array_dir, 'user.npy')
+        numpy.save(user_file, self.data[0])
+
+        # When
+        save_session(self.e, self.temp_dir)
+
+        # Then
+        self.assertTrue(os.path.exists(user_file))
+
+        # Once it holds a session, unused blobs are removed again.
+        save_session(self.e, self.temp_dir)
+        self.assertFalse(os.path.exists(user_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,8 +11,10 @@ import numpy
 import unittest
 
 # Enthought library imports
+from apptools.persistence import state_pickler
 from mayavi.core.null_engine import NullEngine
-from mayavi.sources.vtk_data_source import VTKDataSource
+from mayavi.sources.vtk_data_source import VTKDataSource, \
+    compress_array, decompress_array, write_dataset_to_string
 from mayavi.modules.outline import Outline
 from mayavi.modules.iso_surface import IsoSurface
 from mayavi.modules.contour_grid_plane import ContourGridPlane
@@ -170,5 +172,48 @@ class TestVTKDataSource(unittest.TestCase):
         new_src = VTKDataSource(data=tvtk.PolyData())
         src.add_child(new_src)
 
+    def _restore(self, state):
+        src = VTKDataSource()
+        state_pickler.set_state(src, state)
+        return src.data
+
+    def _check_restored(self, data, result):
+        self.assertEqual(result.__class__, data.__class__)
+        self.assertEqual(result.number_of_points, data.number_of_points)
+        self.assertEqual(result.number_of_cells, data.number_of_cells)
+        numpy.testing.assert_array_equal(result.points.to_array(),
+                                         data.points.to_array())
+        numpy.testing.assert_array_equal(
+            result.point_data.scalars.to_array(),
+            data.point_data.scalars.to_array()
+        )
+
+    def test_binary_persistence(self):
+        """Test if datasets are persisted in binary form."""
+        for data in (datasets.generateStructuredGrid(),
+                     datasets.generateUnstructuredGrid_mixed()):
+            for level in (0, 1):
+                src = VTKDataSource(data=data, compression_level=level)
+                state = state_pickler.dumps(src)
+                result = self._restore(state_pickler.loads_state(state))
+                self._check_restored(data, result)
+
+    def test_chunked_compression(self):
+        """Test if data spanning several chunks is restored."""
+        arr = numpy.random.randint(0, 4, size=1000).astype(numpy.uint8)
+        chunks = compress_array(arr, chunk_size=300)
+        self.assertEqual(len(chunks), 4)
+        result = decompress_array(chunks, arr.size, chunk_size=300)
+        numpy.testing.assert_array_equal(result, arr)
+
+    def test_load_ascii_state(self):
+        """Test if states saved as gzipped ASCII strings are read."""
+        data = datasets.generateStructuredGrid()
+        src = VTKDataSource(data=data)
+        state = state_pickler.get_state(src)
+        sdata = write_dataset_to_string(data)
+        state.data = state_pickler.gzip_string(sdata.encode('ascii'))
+        self._check_restored(data, self._restore(state))
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,9 +14,6 @@ import copy
 
 import numpy as np
 
-# Enthought imports
-from pyface.timer.api import do_later
-
 #  imports
 from tvtk.api import tvtk
 from tvtk.common import vtk_major_version
@@ -255,6 +252,8 @@ def sync_camera(reference_figure, target_figure):
     """ Synchronise the camera of the target_figure on the camera of the
         reference_figure.
     """
+    # Imported here since this imports the UI toolkit.
+    from pyface.timer.api import do_later
     reference_figure.scene._renderer.sync_trait(
         'active_camera', target_figure.scene._renderer
     )
@@ -263,7 +262,7 @@ def sync_camera(reference_figure, target_figure):
     )
 
 
-def screenshot(figure=None, mode='rgb', antialiased=False):
+def screenshot(figure=None, mode='rgb', antialiased=False, out=None):
     """ Return the current figure pixmap as an array.
 
         **Parameters**
@@ -276,6 +275,10 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
             Use anti-aliasing for rendering the screenshot.
             Uses the number of aa frames set by
             figure.scene.anti_aliasing_frames
+        :out: an array or None, optional
+            If specified, the pixmap is copied in this array, of shape
+            (height, width, 3) for 'rgb' or (height, width, 4) for
+            'rgba', and it is returned.
 
         **Notes**
 
@@ -284,6 +287,9 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
         will capture the other window. This limitation is due to the
         heavy use of the hardware graphics system.
 
+        To capture a figure many times, for instance to record a video,
+        use a `ScreenCapture` which reuses its memory for each frame.
+
         **Examples**
 
         This function can be useful for integrating 3D plotting with
@@ -298,55 +304,133 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
         >>> pl.show()
 
     """
-    if figure is None:
-        figure = gcf()
-    x, y = tuple(figure.scene.get_size())
-
-    # Try to lift the window
-    figure.scene._lift()
-    if mode == 'rgb':
-        out = tvtk.UnsignedCharArray()
-        shape = (y, x, 3)
-        pixel_getter = figure.scene.render_window.get_pixel_data
-        if vtk_major_version > 7:
-            pg_args = (0, 0, x - 1, y - 1, 1, out, 0)
-        else:
-            pg_args = (0, 0, x - 1, y - 1, 1, out)
+    capture = ScreenCapture(figure, mode=mode, antialiased=antialiased)
+    return capture.capture(out=out)
+
 
-    elif mode == 'rgba':
-        out = tvtk.FloatArray()
-        shape = (y, x, 4)
-        pixel_getter = figure.scene.render_window.get_rgba_pixel_data
+class ScreenCapture(object):
+    """ Captures the pixmap of a figure repeatedly without allocating
+        memory for each frame.
+
+        The pixels are read by VTK directly into a numpy buffer, and
+        the array returned is a view of this buffer flipped so that
+        pylab.imshow plots it right.  The buffer is only reallocated
+        when the size of the figure changes.
+
+        **Parameters**
+
+        :figure: a figure instance or None, optional
+            The figure to capture, the current figure if None.
+        :mode: {'rgb', 'rgba'}
+            The color mode of the arrays captured.
+        :antialiased: {True, False}
+            Use anti-aliasing for rendering the captures.
+        :double_buffered: {True, False}
+            If True, the captures alternate between two buffers so that
+            an array returned is only overwritten by the capture after
+            the next one.  This lets another thread, for instance a
+            video encoder, process a frame while the next one is read.
+
+        **Example**
+
+        ::
+
+            capture = ScreenCapture(double_buffered=True)
+            for i in range(n_frames):
+                update_scene(i)
+                queue.put(capture.capture())
+    """
+
+    def __init__(self, figure=None, mode='rgb', antialiased=False,
+                 double_buffered=False):
+        if mode not in ('rgb', 'rgba'):
+            raise ValueError('mode type not understood')
+        if figure is None:
+            figure = gcf()
+        self.figure = figure
+        self.mode = mode
+        self.antialiased = antialiased
+        self.double_buffered = double_buffered
+        # The numpy buffers and the VTK arrays sharing their memory.
+        self._buffers = []
+        self._current = 0
+        self._size = None
+
+    def capture(self, out=None):
+        """ Capture the figure and return its pixmap.
+
+            **Parameters**
+
+            :out: an array or None, optional
+                If specified, the pixmap is copied in this array which
+                is returned, else a view of the internal buffer is
+                returned.  It is overwritten by the next capture, or
+                the one after it if the capture is double buffered.
+        """
+        scene = self.figure.scene
+        x, y = tuple(scene.get_size())
+        if (x, y) != self._size:
+            self._allocate(x, y)
+        if self.double_buffered:
+            self._current = 1 - self._current
+        buf, vtk_arr = self._buffers[self._current]
+
+        # Try to lift the window
+        scene._lift()
+        # Make sure a coalesced render is not pending.
+        scene.flush_render()
+        if self.mode == 'rgb':
+            pixel_getter = scene.render_window.get_pixel_data
+        else:
+            pixel_getter = scene.render_window.get_rgba_pixel_data
         if vtk_major_version > 7:
-            pg_args = (0, 0, x - 1, y - 1, 1, out, 0)
+            pg_args = (0, 0, x - 1, y - 1, 1, vtk_arr, 0)
         else:
-            pg_args = (0, 0, x - 1, y - 1, 1, out)
+            pg_args = (0, 0, x - 1, y - 1, 1, vtk_arr)
+
+        if self.antialiased:
+            # save the current aa value to restore it later
+            render_window = scene.render_window
+            if hasattr(render_window, 'aa_frames'):
+                old_aa = render_window.aa_frames
+                render_window.aa_frames = scene.anti_aliasing_frames
+            else:
+                old_aa = render_window.multi_samples
+                render_window.multi_samples = scene.anti_aliasing_frames
+            scene.render()
+            scene.flush_render()
+            pixel_getter(*pg_args)
+            if hasattr(render_window, 'aa_frames'):
+                render_window.aa_frames = old_aa
+            else:
+                render_window.multi_samples = old_aa
+            scene.render()
 
-    else:
-        raise ValueError('mode type not understood')
-
-    if antialiased:
-        # save the current aa value to restore it later
-        render_window = figure.scene.render_window
-        if hasattr(render_window, 'aa_frames'):
-            old_aa = render_window.aa_frames
-            render_window.aa_frames = figure.scene.anti_aliasing_frames
         else:
-            old_aa = render_window.multi_samples
-            render_window.multi_samples = figure.scene.anti_aliasing_frames
-        figure.scene.render()
-        pixel_getter(*pg_args)
-        if hasattr(render_window, 'aa_frames'):
-            render_window.aa_frames = old_aa
+            pixel_getter(*pg_args)
+
+        # VTK stores the rows bottom up, flip them without a copy.
+        image = buf[::-1]
+        if out is not None:
+            np.copyto(out, image)
+            return out
+        return image
+
+    def _allocate(self, x, y):
+        """ Allocate the buffers for a figure of the given size. """
+        if self.mode == 'rgb':
+            shape, dtype, array_class = (y, x, 3), np.uint8, \
+                                        tvtk.UnsignedCharArray
         else:
-            render_window.multi_samples = old_aa
-        figure.scene.render()
-
-    else:
-        pixel_getter(*pg_args)
-
-    # Return the array in a way that pylab.imshow plots it right:
-    out = out.to_array()
-    out.shape = shape
-    out = np.flipud(out)
-    return out
+            shape, dtype, array_class = (y, x, 4), np.float32, \
+                                        tvtk.FloatArray
+        self._buffers = []
+        for i in range(2 if self.double_buffered else 1):
+            buf = np.empty(shape, dtype)
+            # The VTK array uses the memory of the buffer, since it has
+            # the size of the pixmap VTK does not reallocate it.
+            vtk_arr = array_class()
+            vtk_arr.from_array(buf.reshape(-1, shape[2]))
+            self._buffers.append((buf, vtk_arr))
+        self._current = 0
+        self._size = (x, y)
@@ -177,7 +177,7 @@ class Points3d(Pipeline):
         g = Pipeline.__call_internal__(self, *args, **kwargs)
         if scale_factor == 'auto':
             g.glyph.glyph.scale_factor = \
-                             tools._typical_distance(g.mlab_source.dataset)
+                    tools.point_spacing(g.mlab_source.points, 'typical')
             g.glyph.glyph.clamping = True
         else:
             g.glyph.glyph.clamping = False
@@ -1119,14 +1119,14 @@ class BarChart(Pipeline):
             g.glyph.scale_mode = 'scale_by_vector_components'
         g.glyph.glyph.clamping = False
         # The auto-scaling code. It involves finding the minimum
-        # distance between points, which can be very expensive. We
-        # shortcut this calculation for structured data
+        # distance between points along the axes, which requires sorting
+        # the coordinates. We shortcut this calculation for structured
+        # data
         if len(args) == 1 or self.auto_scale:
             min_axis_distance = 1
         else:
-            x, y, z = g.mlab_source.x, g.mlab_source.y, g.mlab_source.z
             min_axis_distance = \
-                    tools._min_axis_distance(x, y, z)
+                    tools.point_spacing(g.mlab_source.points, 'axis')
         scale_factor = g.glyph.glyph.scale_factor * min_axis_distance
         lateral_scale = kwargs.pop('lateral_scale', self.lateral_scale)
         try:
@@ -0,0 +1,126 @@
+"""
+Reports the time taken to import a module and its submodules.
+
+Run it as::
+
+    $ python -m mayavi.tools.import_report [options] [module]
+
+The module, `mayavi.mlab` by default, is imported in a fresh interpreter
+with `-X importtime` and the cumulative import time of each of the
+modules it imports is reported, slowest first, along with the time spent
+in each package.
+"""
+
+from optparse import OptionParser
+import re
+import subprocess
+import sys
+
+_IMPORT_TIME_RE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(.*)$')
+
+
+###############################################################################
+# Utility functions.
+###############################################################################
+def parse_import_times(text):
+    """Parses the output of `python -X importtime` and returns a list of
+    `(module, self_time, cumulative_time)` in the order of the output,
+    times being in seconds.
+    """
+    result = []
+    for line in text.splitlines():
+        match = _IMPORT_TIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, name = match.groups()
+        result.append((name.strip(), int(self_us)*1e-6,
+                       int(cumulative_us)*1e-6))
+    return result
+
+
+def measure_import(module, python=None):
+    """Imports `module` in a new interpreter and returns the parsed
+    import times, see `parse_import_times`.
+    """
+    python = python or sys.executable
+    cmd = [python, '-X', 'importtime', '-c', 'import %s' % module]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    out, err = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError('Importing %s failed:\n%s' % (module, err))
+    return parse_import_times(err)
+
+
+def package_times(times, depth=1):
+    """Returns a list of `(package, self_time)` with the self time of the
+    modules summed over their package, truncated to `depth` components,
+    slowest first.
+    """
+    totals = {}
+    for name, self_time, cumulative in times:
+        package = '.'.join(name.split('.')[:depth])
+        totals[package] = totals.get(package, 0.0) + self_time
+    return sorted(totals.items(), key=lambda x: x[1], reverse=True)
+
+
+def format_report(times, top=20, depth=1, prefix=None):
+    """Returns the import time report as a string.
+
+    **Parameters**
+
+    :times: The import times as returned by `parse_import_times`.
+    :top: The number of modules and packages listed.
+    :depth: The number of components of the package names.
+    :prefix: Only list the modules starting with this prefix.
+    """
+    total = sum(t[1] for t in times)
+    lines = ['Total import time: %.3f s, %d modules' % (total, len(times)),
+             '', 'Cumulative time per module:']
+    modules = times
+    if prefix:
+        modules = [t for t in times if t[0].startswith(prefix)]
+    modules = sorted(modules, key=lambda x: x[2], reverse=True)
+    for name, self_time, cumulative in modules[:top]:
+        lines.append('  %8.3f s  %8.3f s  %s' % (cumulative, self_time,
+                                                  name))
+    lines.extend(['', 'Self time per package:'])
+    for package, self_time in package_times(times, depth)[:top]:
+        lines.append('  %8.3f s  %5.1f%%  %s' % (
+            self_time, 100.0*self_time/total if total else 0.0, package))
+    return '\n'.join(lines)
+
+
+###############################################################################
+# Main.
+###############################################################################
+def main(argv=None):
+    usage = """usage: %prog [options] [module]
+
+Reports the cumulative import time of the modules imported by the given
+module, mayavi.mlab by default.
+    """
+    parser = OptionParser(usage)
+    parser.add_option(
+        "-n", "--top", action="store",
+        type="int", dest="top", default=20,
+        help="Number of modules and packages listed (default: 20).")
+    parser.add_option(
+        "-d", "--depth", action="store",
+        type="int", dest="depth", default=1,
+        help="Number of components of the package names the "
+             "self times are summed over (default: 1).")
+    parser.add_option(
+        "-p", "--prefix", action="store",
+        type="string", dest="prefix", default=None,
+        help="Only list the modules starting with this prefix.")
+
+    (options, args) = parser.parse_args(argv)
+    module = args[0] if args else 'mayavi.mlab'
+    times = measure_import(module)
+    print(format_report(times, options.top, options.depth, options.prefix))
+
+
+if __name__ == '__main__':
+    main()
@@ -19,7 +19,7 @@ from traits.trait_errors import TraitError
 from tvtk.api import tvtk
 from tvtk.common import camel2enthought
 
-from mayavi.core.lut_manager import lut_mode_list
+from mayavi.core.lut_manager import LUTMode
 import mayavi.modules.api as modules
 from mayavi.core.registry import registry
 from . import tools
@@ -113,8 +113,7 @@ class DataModuleFactory(ModuleFactory):
             self._target.module_manager.scalar_lut_manager.data_range = \
                 data_range
 
-    colormap = Trait('blue-red', lut_mode_list(),
-                        help="""type of colormap to use.""")
+    colormap = LUTMode(help="""type of colormap to use.""")
 
     def _colormap_changed(self):
         colormap = self.colormap
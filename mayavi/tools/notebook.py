@@ -4,8 +4,15 @@ from __future__ import print_function
 
 import base64
 from itertools import count
+import json
+import os
+import weakref
+
+import numpy
+
 from tvtk.api import tvtk
-from tvtk.common import configure_input
+from tvtk.common import configure_input, configure_input_data
+from mayavi.core.session import array_hash
 
 
 _backend = 'x3d'
@@ -15,19 +22,30 @@ _local = True
 
 counter = count()
 
+# The geometry of the actors already converted by the webgl backend, with
+# the modification times of their data and mapper when converted.
+_geometry_cache = weakref.WeakKeyDictionary()
+
+_webgl_js = os.path.join(os.path.dirname(__file__), 'static', 'webgl',
+                         'mayavi_webgl.js')
+
 
 def init(backend='x3d', width=None, height=None, local=True):
     """Initialize a suitable backend for Jupyter notebooks.
 
     **Parameters**
 
-    backend :str: one of ('png', 'x3d')
+    backend :str: one of ('png', 'x3d', 'webgl')
     width :int: suggested default width of the element
     height :int: suggested default height of the element
     local :bool: Use local copy of x3dom.js instead of online version.
+
+    The 'webgl' backend sends the geometry as compact binary arrays.
+    Each output carries the script and all the arrays it displays, so
+    it still shows when the notebook is reopened or a cell is re-run.
     """
-    global _backend, _width, _height
-    backends = ('png', 'x3d')
+    global _backend, _width, _height, _local
+    backends = ('png', 'x3d', 'webgl')
     error_msg = "Backend must be one of %r, got %s"%(backends, backend)
     assert backend in backends, error_msg
     from mayavi import mlab
@@ -57,6 +75,8 @@ def _repr_html_(self):
         return scene_to_png(scene)
     elif _backend == 'x3d':
         return scene_to_x3d(scene)
+    elif _backend == 'webgl':
+        return scene_to_webgl(scene)
 
 
 def _fix_x3d_header(x3d):
@@ -126,6 +146,261 @@ def scene_to_png(scene):
     html = '<img src="data:image/png;base64,%s" alt="PNG image"></img>'
     return html % data
 
+
+######################################################################
+# The webgl backend.
+######################################################################
+def quantize_points(points):
+    """Quantizes the points to uint16 over their bounding box.
+
+    Returns the quantized points and the offset and scale such that the
+    points are `offset + scale*quantized`.
+    """
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    lower = points.min(axis=0)
+    scale = (points.max(axis=0) - lower)/65535.0
+    scale[scale == 0] = 1.0
+    quantized = numpy.rint((points - lower)/scale).astype(numpy.uint16)
+    return quantized, lower, scale
+
+
+def quantize_normals(normals):
+    """Quantizes the unit normals to int8."""
+    normals = numpy.clip(numpy.asarray(normals, dtype=float), -1.0, 1.0)
+    return numpy.rint(normals*127).astype(numpy.int8)
+
+
+def _index_array(ids, n_points):
+    """Returns the point ids in the smallest unsigned type that fits."""
+    dtype = numpy.uint16 if n_points <= 65536 else numpy.uint32
+    return numpy.asarray(ids).astype(dtype)
+
+
+def _get_triangles(data):
+    """Returns the triangles of the polygons and triangle strips of the
+    poly data as an (n, 3) array of point ids, None if there are none.
+    """
+    n_polys, n_strips = data.number_of_polys, data.number_of_strips
+    if n_polys + n_strips == 0:
+        return None
+    cells = data.polys.to_array()
+    if n_strips > 0 or len(cells) != 4*n_polys or (cells[::4] != 3).any():
+        tf = tvtk.TriangleFilter(pass_lines=False, pass_verts=False)
+        configure_input_data(tf, data)
+        tf.update()
+        cells = tf.output.polys.to_array()
+    return cells.reshape(-1, 4)[:, 1:]
+
+
+def line_segments(offsets, connectivity):
+    """Returns the segments of the poly lines given by the point ids of
+    all the lines (`connectivity`) and the offsets of each line in it
+    (`offsets`, one more than the lines) as an (n, 2) array.
+    """
+    n = len(connectivity)
+    # Consecutive ids make a segment unless a new line starts.
+    keep = numpy.ones(max(n - 1, 0), dtype=bool)
+    starts = numpy.asarray(offsets[1:-1])
+    starts = starts[(starts > 0) & (starts < n)]
+    keep[starts - 1] = False
+    return numpy.column_stack((connectivity[:-1][keep],
+                               connectivity[1:][keep]))
+
+
+def _get_lines(data):
+    """Returns the offsets and the connectivity arrays of the lines of
+    the poly data, see `line_segments`.
+    """
+    lines = tvtk.to_vtk(data.lines)
+    if hasattr(lines, 'GetOffsetsArray'):
+        from vtk.util.numpy_support import vtk_to_numpy
+        return (vtk_to_numpy(lines.GetOffsetsArray()),
+                vtk_to_numpy(lines.GetConnectivityArray()))
+    # Older VTK only give the legacy format [n, id_1, ..., id_n, ...].
+    cells = data.lines.to_array()
+    n_lines = data.number_of_lines
+    offsets = numpy.zeros(n_lines + 1, dtype=int)
+    i = 0
+    for line in range(n_lines):
+        offsets[line + 1] = offsets[line] + cells[i]
+        i += cells[i] + 1
+    counts = offsets[:-1] + numpy.arange(n_lines)
+    return offsets, numpy.delete(cells, counts)
+
+
+def _get_poly_data(mapper):
+    """Returns the input of the mapper as poly data."""
+    data = mapper.input
+    if data is None or isinstance(data, tvtk.PolyData):
+        return data
+    gf = tvtk.GeometryFilter()
+    configure_input_data(gf, data)
+    gf.update()
+    return gf.output
+
+
+def _get_colors(mapper, data):
+    """Returns the colors of the points mapped by the mapper as uint8
+    RGB(A), None if the mapper does not color the points.
+    """
+    if not mapper.scalar_visibility:
+        return None
+    colors = mapper.map_scalars(data, 1.0)
+    if colors is None:
+        return None
+    colors = colors.to_array().reshape(colors.number_of_tuples, -1)
+    if len(colors) != data.number_of_points:
+        # The scalars of the cells, which are not supported.
+        return None
+    if colors.shape[1] == 4 and (colors[:, 3] == 255).all():
+        colors = colors[:, :3]
+    return numpy.ascontiguousarray(colors)
+
+
+def _add_buffer(buffers, arr):
+    """Adds the array to the buffers by its hash and returns the
+    reference to it sent to the notebook.
+    """
+    arr = numpy.ascontiguousarray(arr)
+    key = array_hash(arr)
+    buffers[key] = arr
+    size = arr.shape[1] if arr.ndim > 1 else 1
+    return dict(hash=key, dtype=arr.dtype.name, size=size)
+
+
+def _get_geometry(actor):
+    """Returns the geometry of the actor and the arrays it refers to,
+    or `(None, None)` if it has no geometry.  The result is cached until
+    the data or the mapper of the actor are modified.
+    """
+    mapper = actor.mapper
+    if mapper is None or mapper.input is None:
+        return None, None
+    mapper.update()
+    mtime = (mapper.input.get_m_time(), mapper.get_m_time())
+    cached = _geometry_cache.get(actor)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    data = _get_poly_data(mapper)
+    n_points = data.number_of_points
+    if n_points == 0:
+        return None, None
+    buffers = {}
+    positions, offset, scale = quantize_points(data.points.to_array())
+    geometry = dict(positions=_add_buffer(buffers, positions),
+                    offset=offset.tolist(), scale=scale.tolist(),
+                    normals=None, colors=None, triangles=None,
+                    lines=None)
+    normals = data.point_data.normals
+    if normals is not None:
+        geometry['normals'] = _add_buffer(
+            buffers, quantize_normals(normals.to_array())
+        )
+    colors = _get_colors(mapper, data)
+    if colors is not None:
+        geometry['colors'] = _add_buffer(buffers, colors)
+    triangles = _get_triangles(data)
+    if triangles is not None:
+        geometry['triangles'] = _add_buffer(
+            buffers, _index_array(triangles, n_points)
+        )
+    if data.number_of_lines > 0:
+        segments = line_segments(*_get_lines(data))
+        geometry['lines'] = _add_buffer(
+            buffers, _index_array(segments, n_points)
+        )
+
+    _geometry_cache[actor] = (mtime, geometry, buffers)
+    return geometry, buffers
+
+
+def _actor_to_webgl(actor, buffers):
+    """Returns the description of the actor sent to the notebook, adding
+    the arrays it refers to to `buffers`, None if it is not displayed.
+    """
+    if not actor.visibility:
+        return None
+    geometry, actor_buffers = _get_geometry(actor)
+    if geometry is None:
+        return None
+    buffers.update(actor_buffers)
+    prop = actor.property
+    result = dict(geometry)
+    result.update(
+        matrix=actor.matrix.to_array().ravel().tolist(),
+        color=list(prop.color), opacity=prop.opacity,
+        representation=prop.representation,
+        point_size=prop.point_size, line_width=prop.line_width,
+        ambient=prop.ambient, diffuse=prop.diffuse,
+        specular=prop.specular, specular_power=prop.specular_power,
+    )
+    return result
+
+
+def renderer_to_webgl(renderer):
+    """Returns the description of the actors and camera of the renderer
+    sent to the notebook by the webgl backend, and the arrays it refers
+    to as a dict of arrays by their hash.
+    """
+    buffers = {}
+    actors = []
+    for actor in renderer.actors:
+        info = _actor_to_webgl(actor, buffers)
+        if info is not None:
+            actors.append(info)
+
+    bounds = numpy.asarray(renderer.compute_visible_prop_bounds())
+    if bounds[0] > bounds[1]:
+        bounds = numpy.array([-1.0, 1.0]*3)
+    lower, upper = bounds[::2], bounds[1::2]
+    cam = renderer.active_camera
+    camera = dict(
+        position=list(cam.position), focal_point=list(cam.focal_point),
+        view_up=list(cam.view_up), view_angle=cam.view_angle,
+        parallel_projection=bool(cam.parallel_projection),
+        parallel_scale=cam.parallel_scale,
+    )
+    info = dict(background=list(renderer.background), camera=camera,
+                center=((lower + upper)*0.5).tolist(),
+                radius=float(numpy.linalg.norm(upper - lower)*0.5),
+                actors=actors)
+    return info, buffers
+
+
+def scene_to_webgl(scene):
+    """Returns the HTML displaying the scene with WebGL.
+
+    The actors are sent as binary arrays with quantized positions and
+    normals and indexed triangles and lines.  The HTML includes the
+    script and all the arrays of the scene so it displays on its own,
+    the browser only decodes the arrays it does not have yet.  Volumes
+    and 2D actors are not displayed.
+    """
+    info, buffers = renderer_to_webgl(scene.renderer)
+    width, height = scene.render_window.size
+    info['width'] = _width or width
+    info['height'] = _height or height
+
+    encoded = {}
+    for key, arr in buffers.items():
+        encoded[key] = base64.b64encode(arr.data).decode('ascii')
+    with open(_webgl_js) as f:
+        script = f.read()
+
+    id = 'scene_%d' % next(counter)
+    html = '''
+    <div id="%s" style="width: %dpx; height: %dpx;"></div>
+    <script type="text/javascript">
+    %s
+    MayaviWebGL.addBuffers(%s);
+    MayaviWebGL.render(document.getElementById("%s"), %s);
+    </script>
+    '''%(id, info['width'], info['height'], script,
+          json.dumps(encoded), id, json.dumps(info))
+    return html
+
+
 def display(obj, backend=None):
     """Display given object on Jupyter notebook using given backend.
 
@@ -8,10 +8,64 @@ pipeline.
 # Copyright (c) 2007-2015, Enthought, Inc.
 # License: BSD Style.
 
-from .modules import *
-from .sources import *
-from .filters import *
-from .tools import add_dataset, set_extent, add_module_manager, \
-    get_vtk_src
-from .probe_data import probe_data
-from .tools import _traverse as traverse
+import importlib
+import sys
+
+# The modules providing the pipeline functions, the later ones taking
+# precedence.  They are imported on first access of one of the functions,
+# since importing them imports all the Mayavi modules, filters and
+# sources.
+_modules = ['mayavi.tools.modules', 'mayavi.tools.sources',
+            'mayavi.tools.filters']
+
+# The functions not listed in the `__all__` of these modules.
+_extra_names = {
+    'add_dataset': ('mayavi.tools.tools', 'add_dataset'),
+    'set_extent': ('mayavi.tools.tools', 'set_extent'),
+    'add_module_manager': ('mayavi.tools.tools', 'add_module_manager'),
+    'get_vtk_src': ('mayavi.tools.tools', 'get_vtk_src'),
+    'probe_data': ('mayavi.tools.probe_data', 'probe_data'),
+    'traverse': ('mayavi.tools.tools', '_traverse'),
+}
+
+
+def _get_all():
+    """Returns the names of all the pipeline functions."""
+    names = list(_extra_names.keys())
+    for module_name in _modules:
+        names.extend(importlib.import_module(module_name).__all__)
+    return names
+
+
+def __getattr__(name):
+    if name == '__all__':
+        value = _get_all()
+    elif name in _extra_names:
+        module_name, attr = _extra_names[name]
+        value = getattr(importlib.import_module(module_name), attr)
+    elif name.startswith('_'):
+        raise AttributeError("module %r has no attribute %r" %
+                             (__name__, name))
+    else:
+        for module_name in reversed(_modules):
+            module = importlib.import_module(module_name)
+            if name in module.__all__:
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError("module %r has no attribute %r" %
+                                 (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_get_all()))
+
+
+# Module level __getattr__ needs Python 3.7, import everything up front
+# with older versions.
+if sys.version_info[:2] < (3, 7):
+    for _name in _get_all():
+        __getattr__(_name)
+    __all__ = _get_all()
@@ -1,6 +1,6 @@
 """
 A helper function to retrieve the data from Mayavi structures on
-arbitrary points.
+arbitrary points, and a `Prober` class to efficiently do so repeatedly.
 """
 
 import numpy as np
@@ -9,6 +9,200 @@ from tvtk.api import tvtk
 from . import tools
 import tvtk.common as tvtk_common
 
+
+class Prober(object):
+    """ Retrieves the data of a Mayavi visualization object or a VTK
+        dataset at many points, repeatedly.
+
+        The probe filter and the cell locator used to find the cells
+        containing the points are created once and reused for each
+        call.  The locator is rebuilt only when the dataset is
+        modified.  Large point arrays are probed in chunks of
+        `chunk_size` points to bound the memory used by VTK.
+
+        **Parameters**
+
+        :mayavi_object: A Mayavi visualization object, or a VTK dataset
+                        The object describing the data you are
+                        interested in.
+        :location: 'points' or 'cells', optional
+                   The location of the data to retrieve.
+        :chunk_size: int, optional
+                     The maximum number of points probed at once, all
+                     the points are probed at once if None.
+
+        **Example**
+
+        ::
+
+            prober = Prober(iso)
+            for points in sensor_positions:
+                result = prober.probe(points, types=('scalars', 'vectors'))
+    """
+
+    def __init__(self, mayavi_object, location='points', chunk_size=None):
+        if location not in ('points', 'cells'):
+            raise ValueError("Invalid value for data location, must be "
+                             "'points' or 'cells', but '%s' was given."
+                             % location)
+        self.dataset = tools.get_vtk_src(mayavi_object)[0]
+        self.location = location
+        self.chunk_size = chunk_size
+
+        self._probe_data = tvtk.PolyData()
+        self._probe = probe = tvtk.ProbeFilter()
+        tvtk_common.configure_input_data(probe, self._probe_data)
+        tvtk_common.configure_source_data(probe, self.dataset)
+        self._strategy = None
+        self._locator = None
+        self._locator_mtime = None
+        self._setup_locator_strategy()
+
+    ###########################################################################
+    # `Prober` interface.
+    ###########################################################################
+    def probe(self, points, types=('scalars',)):
+        """ Retrieve the data at the given points.
+
+            **Parameters**
+
+            :points: ndarray of shape (N, 3)
+                     The positions where you want to retrieve the data.
+            :types: string or sequence of 'scalars', 'vectors' or
+                    'tensors', optional
+                    The types of the data to retrieve, all of them
+                    are retrieved in one pass.
+
+            **Returns**
+
+            If `types` is a string, an ndarray of shape (N,) for
+            scalars, (N, 3) for vectors or (N, 9) for tensors.  If it
+            is a sequence, a dictionary of these arrays keyed on the
+            type.  When the points are probed in a single chunk the
+            arrays are views of the VTK output and no copy is made.
+        """
+        single = isinstance(types, str)
+        if single:
+            types = (types,)
+        for t in types:
+            if t not in ('scalars', 'vectors', 'tensors'):
+                raise ValueError("Invalid value for type: must be "
+                                 "'scalars', 'vectors' or 'tensors', but "
+                                 "'%s' was given" % t)
+
+        points = np.ascontiguousarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError('The points must be an array of shape (N, 3)')
+        n_points = len(points)
+        chunk_size = self.chunk_size or n_points
+        self._update_locator()
+
+        if n_points <= chunk_size:
+            result = self._probe_chunk(points, types)
+        else:
+            result = {}
+            for start in range(0, n_points, chunk_size):
+                stop = min(start + chunk_size, n_points)
+                values = self._probe_chunk(points[start:stop], types)
+                for t in types:
+                    arr = values[t]
+                    if t not in result:
+                        result[t] = np.empty((n_points,) + arr.shape[1:],
+                                             dtype=arr.dtype)
+                    result[t][start:stop] = arr
+
+        if single:
+            return result[types[0]]
+        return result
+
+    def probe_xyz(self, x, y, z, type='scalars'):
+        """ Retrieve the data at the points x, y, z, see `probe_data`
+            for the details of the arguments and the returned values.
+        """
+        x = np.atleast_1d(x)
+        y = np.atleast_1d(y)
+        z = np.atleast_1d(z)
+        shape = x.shape
+        assert y.shape == z.shape == shape, \
+                        'The x, y and z arguments must have the same shape'
+        points = np.empty((x.size, 3))
+        points[:, 0] = x.ravel()
+        points[:, 1] = y.ravel()
+        points[:, 2] = z.ravel()
+        values = self.probe(points, type)
+
+        shape = list(shape)
+        if type == 'scalars':
+            values = np.reshape(values, shape)
+        elif type == 'vectors':
+            values = np.reshape(values, shape + [3, ])
+            values = np.rollaxis(values, -1)
+        else:
+            values = np.reshape(values, shape + [-1, ])
+            values = np.rollaxis(values, -1)
+        return values
+
+    ###########################################################################
+    # Non-public interface.
+    ###########################################################################
+    def _setup_locator_strategy(self):
+        """ Use a cached cell locator for the probe when VTK supports
+            it.  Only point sets need a locator to find cells.
+        """
+        probe = self._probe
+        if not (hasattr(probe, 'find_cell_strategy') and
+                hasattr(tvtk, 'CellLocatorStrategy') and
+                self.dataset.is_a('vtkPointSet')):
+            return
+        if hasattr(tvtk, 'StaticCellLocator'):
+            locator = tvtk.StaticCellLocator()
+        else:
+            locator = tvtk.CellLocator()
+        strategy = tvtk.CellLocatorStrategy()
+        strategy.cell_locator = locator
+        probe.find_cell_strategy = strategy
+        self._strategy = strategy
+        self._locator = locator
+
+    def _update_locator(self):
+        """ Rebuild the locator only if the dataset has changed.
+        """
+        locator = self._locator
+        if locator is None:
+            return
+        dataset = self.dataset
+        mtime = dataset._vtk_obj.GetMTime()
+        if mtime != self._locator_mtime:
+            locator.data_set = dataset
+            locator.modified()
+            locator.build_locator()
+            self._locator_mtime = mtime
+
+    def _probe_chunk(self, points, types):
+        """ Probe the given contiguous points and return a dictionary
+            of the requested data arrays.
+        """
+        # The points are contiguous doubles so they are not copied.
+        self._probe_data.points = points
+        probe = self._probe
+        probe.update()
+
+        output = probe.output
+        if self.location == 'points':
+            data = output.point_data
+        else:
+            data = output.cell_data
+
+        result = {}
+        for t in types:
+            values = getattr(data, t)
+            if values is None:
+                raise ValueError("The object given has no %s data of type %s"
+                                 % (self.location, t))
+            result[t] = values.to_array()
+        return result
+
+
 def probe_data(mayavi_object, x, y, z, type='scalars', location='points'):
     """ Retrieve the data from a described by Mayavi visualization object
         at points x, y, z.
@@ -33,46 +227,11 @@ def probe_data(mayavi_object, x, y, z, type='scalars', location='points'):
         The values of the data at the given point, as an ndarray
         (or multiple arrays, in the case of vectors or tensors) of the
         same shape as x, y, and z.
+
+        **Notes**
+
+        To probe the same object many times, use a `Prober` which
+        avoids setting up the probe at each call.
     """
-    dataset = tools.get_vtk_src(mayavi_object)[0]
-    assert type in ('scalars', 'vectors', 'cells'), (
-        "Invalid value for type: must be 'scalars', 'vectors' or "
-        "'cells', but '%s' was given" % type)
-    x = np.atleast_1d(x)
-    y = np.atleast_1d(y)
-    z = np.atleast_1d(z)
-    shape = x.shape
-    assert y.shape == z.shape == shape, \
-                        'The x, y and z arguments must have the same shape'
-    probe_data = mesh = tvtk.PolyData(points=np.c_[x.ravel(),
-                                                   y.ravel(),
-                                                   z.ravel()])
-    shape = list(shape)
-    probe = tvtk.ProbeFilter()
-    tvtk_common.configure_input_data(probe, probe_data)
-    tvtk_common.configure_source_data(probe, dataset)
-    probe.update()
-
-    if location == 'points':
-        data = probe.output.point_data
-    elif location == 'cells':
-        data = probe.output.cell_data
-    else:
-        raise ValueError("Invalid value for data location, must be "
-                         "'points' or 'cells', but '%s' was given."
-                         % location)
-
-    values = getattr(data, type)
-    if values is None:
-        raise ValueError("The object given has no %s data of type %s"
-                         % (location, type))
-    values = values.to_array()
-    if type == 'scalars':
-        values = np.reshape(values, shape)
-    elif type == 'vectors':
-        values = np.reshape(values, shape + [3, ])
-        values = np.rollaxis(values, -1)
-    else:
-        values = np.reshape(values, shape + [-1, ])
-        values = np.rollaxis(values, -1)
-    return values
+    prober = Prober(mayavi_object, location=location)
+    return prober.probe_xyz(x, y, z, type=type)
@@ -0,0 +1,209 @@
+"""
+Batch rendering of mlab figures over a pool of off-screen worker
+processes.
+"""
+
+import multiprocessing
+import time
+import traceback
+
+__all__ = ['render_batch', 'RenderResult']
+
+
+# The state of a worker process: the scene construction callable, the
+# figure rendered and how it is captured.
+_worker_state = {}
+
+
+###############################################################################
+# `RenderResult` class.
+###############################################################################
+class RenderResult(object):
+    """ The outcome of the rendering of one parameter set by
+        `render_batch`.
+
+        **Attributes**
+
+        :index: The position of the parameter set in the batch.
+        :params: The parameter set.
+        :image: The PNG data as bytes, or the screenshot as an array,
+                None if the rendering failed.
+        :elapsed: The time taken to build and render the scene, in
+                  seconds.
+        :error: The formatted traceback of the failure, None if the
+                rendering succeeded.
+    """
+
+    def __init__(self, index, params, image, elapsed, error=None):
+        self.index = index
+        self.params = params
+        self.image = image
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def __repr__(self):
+        status = 'failed' if self.failed else 'ok'
+        return '%s(index=%d, %s, elapsed=%.3fs)' % (
+            self.__class__.__name__, self.index, status, self.elapsed)
+
+
+###############################################################################
+# Worker functions.
+###############################################################################
+def _init_worker(scene_func, size, output, mode):
+    """Starts the off-screen engine and creates the figure reused for
+    all the jobs of a worker process.
+    """
+    _worker_state.update(scene_func=scene_func, output=output, mode=mode,
+                         figure=None, error=None)
+    try:
+        # The workers are off-screen, avoid importing a UI toolkit.
+        from traits.etsconfig.api import ETSConfig
+        if not ETSConfig.toolkit:
+            ETSConfig.toolkit = 'null'
+        from mayavi import mlab
+        mlab.options.offscreen = True
+        engine = mlab.get_engine()
+        _worker_state['figure'] = mlab.figure(engine=engine, size=size)
+    except Exception:
+        # Reported with each job, raising here would make the pool
+        # respawn the worker forever.
+        _worker_state['error'] = traceback.format_exc()
+
+
+def _capture(figure, output, mode):
+    """Returns the rendered figure as PNG bytes or as an array."""
+    if output == 'array':
+        from mayavi.tools.figure import screenshot
+        return screenshot(figure, mode=mode)
+
+    from tvtk.api import tvtk
+    from tvtk.common import configure_input
+    scene = figure.scene
+    writer = tvtk.PNGWriter(write_to_memory=True)
+    configure_input(writer, scene._get_window_to_image())
+    scene._exporter_write(writer)
+    return writer.result.to_array().tobytes()
+
+
+def _render_job(job):
+    """Builds and captures the scene of one parameter set."""
+    index, params = job
+    state = _worker_state
+    t0 = time.time()
+    image = None
+    error = state['error']
+    if error is None:
+        try:
+            from mayavi import mlab
+            figure = state['figure']
+            mlab.clf(figure)
+            mlab.figure(figure)
+            scene = figure.scene
+            scene.disable_render = True
+            try:
+                if isinstance(params, dict):
+                    state['scene_func'](figure, **params)
+                else:
+                    state['scene_func'](figure, params)
+            finally:
+                scene.disable_render = False
+            image = _capture(figure, state['output'], state['mode'])
+        except Exception:
+            error = traceback.format_exc()
+    return RenderResult(index, params, image, time.time() - t0, error)
+
+
+###############################################################################
+# Public API.
+###############################################################################
+def render_batch(scene_func, params, n_workers=None, size=(400, 350),
+                 output='png', mode='rgb', ordered=True,
+                 max_jobs_per_worker=None):
+    """ Render a figure for each parameter set in a pool of worker
+        processes and yield the results as they are ready.
+
+        Each worker process starts an off-screen engine and a figure
+        once, and reuses them for all its jobs: the figure is cleared
+        and `scene_func` is called to build the scene of each
+        parameter set.
+
+        **Parameters**
+
+        :scene_func: A picklable callable, for instance a function
+                     defined at the top level of a module.  It is called
+                     as ``scene_func(figure, **params)`` if the
+                     parameter set is a dictionary and as
+                     ``scene_func(figure, params)`` otherwise.
+        :params: An iterable of parameter sets.
+        :n_workers: The number of worker processes, the number of CPUs
+                    if None.
+        :size: The size of the figures rendered.
+        :output: 'png' or 'array', optional
+                 Whether to return the images as PNG data or as arrays
+                 like those returned by `mlab.screenshot`.
+        :mode: 'rgb' or 'rgba', optional
+               The color mode of the arrays returned.
+        :ordered: If True, the results are yielded in the order of the
+                  parameter sets, else as soon as they are ready.
+        :max_jobs_per_worker: The number of jobs after which a worker
+                              process is replaced by a fresh one, the
+                              workers are never replaced if None.
+
+        **Returns**
+
+        An iterator over `RenderResult` objects, holding the image,
+        the time taken and the error of each job.  A failed job does
+        not stop the batch.
+
+        **Example**
+
+        ::
+
+            def build(figure, n_mer, n_long):
+                mlab.test_plot3d()   # Use n_mer and n_long
+
+            if __name__ == '__main__':
+                sweep = [dict(n_mer=m, n_long=l) for m in range(6)
+                         for l in range(11)]
+                for result in render_batch(build, sweep):
+                    if result.failed:
+                        print(result.error)
+                    else:
+                        save(result.index, result.image)
+
+        **Notes**
+
+        The worker processes are spawned so they do not inherit the
+        graphics state of the calling process.  On platforms without
+        `fork` the calling script must be guarded by
+        ``if __name__ == '__main__':``.
+    """
+    if output not in ('png', 'array'):
+        raise ValueError("Invalid output, must be 'png' or 'array', but "
+                         "'%s' was given." % output)
+    if mode not in ('rgb', 'rgba'):
+        raise ValueError('mode type not understood')
+
+    if hasattr(multiprocessing, 'get_context'):
+        context = multiprocessing.get_context('spawn')
+    else:
+        context = multiprocessing
+    pool = context.Pool(n_workers, _init_worker,
+                        (scene_func, size, output, mode),
+                        max_jobs_per_worker)
+    try:
+        if ordered:
+            results = pool.imap(_render_job, enumerate(params))
+        else:
+            results = pool.imap_unordered(_render_job, enumerate(params))
+        for result in results:
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -9,8 +9,10 @@ Data sources classes and their associated functions for mlab.
 
 import numpy as np
 
-from traits.api import Bool, HasTraits, Instance, on_trait_change
+from traits.api import Bool, Dict, Float, HasTraits, Instance, \
+        on_trait_change
 from tvtk.api import tvtk
+from tvtk.array_handler import ID_TYPE_CODE
 from tvtk.common import camel2enthought
 
 from mayavi.sources.array_source import ArraySource
@@ -22,7 +24,8 @@ from .engine_manager import get_null_engine, engine_manager
 
 __all__ = ['vector_scatter', 'vector_field', 'scalar_scatter',
     'scalar_field', 'line_source', 'array2d_source', 'grid_source',
-    'open', 'triangular_mesh_source', 'vertical_vectors_source',
+    'open', 'open_many', 'triangular_mesh_source',
+    'vertical_vectors_source',
 ]
 
 
@@ -138,6 +141,17 @@ class MGlyphSource(MlabSource):
     w = ArrayNumberOrNone
     vectors = ArrayOrNone
 
+    ########################################
+    # Private traits.
+
+    # The preallocated buffers used by `stream`, keyed on the name of
+    # the data, with the view of each buffer given to the dataset.
+    _stream_buffers = Dict
+
+    # The factor by which the capacity of the buffers grows when more
+    # points are streamed.
+    _stream_growth = Float(2.0)
+
     ######################################################################
     # `MlabSource` interface.
     ######################################################################
@@ -227,9 +241,139 @@ class MGlyphSource(MlabSource):
         if not new_dataset:
             self.update()
 
+    ######################################################################
+    # `MGlyphSource` interface.
+    ######################################################################
+    def stream(self, points=None, scalars=None, vectors=None):
+        """Updates the data in place, for data streamed at high rates.
+
+        The data is copied into buffers which are allocated once and
+        shared with VTK, so no memory is allocated when the number of
+        points does not change.  When it grows, the capacity of the
+        buffers grows geometrically.  The connectivity of the points is
+        only rebuilt when their number changes, and the visualization
+        is updated once for all the data given.
+
+        **Parameters**
+
+        :points: array of shape (N, 3), optional
+            The positions of the glyphs, the current ones are kept if
+            not given.
+        :scalars: array of size N, optional
+            The scalars shown on the glyphs.
+        :vectors: array of shape (N, 3), optional
+            The vectors shown on the glyphs.
+
+        When the number of points changes, the scalars and vectors of
+        the source, if any, must be given too.
+        """
+        if points is not None:
+            points = np.asarray(points)
+            n = points.size//3
+        elif self.points is not None:
+            n = len(self.points)
+        else:
+            raise ValueError('The points must be given to create the data.')
+        resized = self.points is None or len(self.points) != n
+        if resized:
+            for name, value in (('scalars', scalars), ('vectors', vectors)):
+                if value is None and getattr(self, name) is not None:
+                    raise ValueError('The %s must be given when the number '
+                                     'of points changes.' % name)
+
+        pd = self.dataset
+        new_dataset = pd is None
+        if new_dataset:
+            pd = tvtk.PolyData()
+        # The VTK arrays modified in place.
+        modified = []
+
+        if points is not None:
+            view, attach = self._stream_array('points', points, n, 3)
+            if attach:
+                pd.points = view
+                self.trait_set(points=view, x=view[:, 0], y=view[:, 1],
+                               z=view[:, 2], trait_change_notify=False)
+            else:
+                modified.append(pd.points)
+
+        if resized:
+            # Each point is a vertex, so the connectivity and the
+            # offsets are both the first ids of a preallocated range.
+            ids = self._stream_buffers.get('ids')
+            if ids is None or len(ids) < n + 1:
+                size = n + 1
+                if ids is not None:
+                    size = max(size, int(len(ids)*self._stream_growth))
+                ids = np.arange(size, dtype=ID_TYPE_CODE)
+                self._stream_buffers['ids'] = ids
+            polys = tvtk.CellArray()
+            polys.from_array(ids[:n], offsets=ids[:n + 1])
+            pd.polys = polys
+
+        point_data = pd.point_data
+        if scalars is not None:
+            view, attach = self._stream_array('scalars', scalars, n, 1)
+            if attach:
+                point_data.scalars = view
+                point_data.scalars.name = 'scalars'
+                self.trait_set(scalars=view, trait_change_notify=False)
+            else:
+                modified.append(point_data.scalars)
+
+        if vectors is not None:
+            view, attach = self._stream_array('vectors', vectors, n, 3)
+            if attach:
+                point_data.vectors = view
+                point_data.vectors.name = 'vectors'
+                self.trait_set(vectors=view, u=view[:, 0], v=view[:, 1],
+                               w=view[:, 2], trait_change_notify=False)
+            else:
+                modified.append(point_data.vectors)
+
+        for arr in modified:
+            arr.modified()
+        if new_dataset:
+            self.dataset = pd
+        else:
+            self.update()
+
     ######################################################################
     # Non-public interface.
     ######################################################################
+    def _get_stream_buffer(self, name, n, n_comp):
+        """Returns a view of the first `n` items of the buffer called
+        `name`, and if the view is not the one currently in use.  The
+        buffer is reallocated with a larger capacity if needed.
+        """
+        info = self._stream_buffers.get(name)
+        if info is None or len(info[0]) < n:
+            capacity = n
+            if info is not None:
+                capacity = max(n, int(len(info[0])*self._stream_growth))
+            shape = (capacity, n_comp) if n_comp > 1 else (capacity,)
+            info = [np.empty(shape), None]
+            self._stream_buffers[name] = info
+        view = info[1]
+        if view is not None and len(view) == n:
+            return view, False
+        info[1] = view = info[0][:n]
+        return view, True
+
+    def _stream_array(self, name, data, n, n_comp):
+        """Copies `data` in the stream buffer of the trait called
+        `name` and returns its view, and if the view must be given to
+        the dataset.
+        """
+        if data.size != n*n_comp:
+            raise ValueError('The %s must have %d values, not %d.'
+                             % (name, n*n_comp, data.size))
+        view, attach = self._get_stream_buffer(name, n, n_comp)
+        np.copyto(view, np.reshape(data, view.shape))
+        # The dataset holds another array if the trait has been
+        # changed since the last call.
+        return view, attach or getattr(self, name) is not view
+
     def _x_changed(self, x):
         x = np.atleast_1d(x)
         self.points[:, 0] = x.ravel()
@@ -301,6 +445,17 @@ class MVerticalGlyphSource(MGlyphSource):
                 traits['w'] = s
         super(MVerticalGlyphSource, self).reset(**traits)
 
+    def stream(self, points=None, scalars=None, vectors=None):
+        """Updates the data in place, see `MGlyphSource.stream`.  The
+        vectors are created from the scalars if they are not given.
+        """
+        if scalars is not None and vectors is None:
+            scalars = np.asarray(scalars)
+            vectors = self._get_stream_buffer('vertical', scalars.size, 3)[0]
+            vectors[:, :2] = 1.0
+            vectors[:, 2] = scalars.ravel()
+        super(MVerticalGlyphSource, self).stream(points, scalars, vectors)
+
     def _scalars_changed(self, s):
         self.dataset.point_data.scalars = s
         self.dataset.point_data.scalars.name = 'scalars'
@@ -1415,6 +1570,26 @@ def open(filename, figure=None):
     return src
 
 
+def open_many(filenames, figure=None, n_workers=None):
+    """Open many supported data files at once, reading them in parallel
+    in `n_workers` threads.  Returns the list of source objects, with
+    None for the files that could not be read.
+
+    The sources are added to the pipeline in one batch, with rendering
+    disabled.  If 'figure' is False, no view is opened, and the code
+    does not need GUI or openGL context.
+    """
+    if figure is None:
+        engine = tools.get_engine()
+    elif figure is False:
+        # Get a null engine that we can use.
+        engine = get_null_engine()
+    else:
+        engine = engine_manager.find_figure_engine(figure)
+        engine.current_scene = figure
+    return engine.open_many(filenames, n_workers=n_workers)
+
+
 ############################################################################
 # Automatically generated sources from registry.
 ############################################################################
@@ -0,0 +1,497 @@
+/* A small WebGL renderer for the scenes displayed in Jupyter notebooks by
+ * the webgl backend of mayavi.tools.notebook.
+ *
+ * The arrays of the scenes are sent as base64 encoded binary buffers and
+ * are kept in `MayaviWebGL.buffers` by the hash of their contents, so they
+ * are only decoded once.  Every output carries this script and all its
+ * arrays so that it displays on its own.  Positions are quantized to uint16
+ * and are dequantized in the vertex shader, normals are quantized to int8.
+ */
+(function(root) {
+    "use strict";
+    if (root.MayaviWebGL) {
+        return;
+    }
+
+    var ARRAY_TYPES = {
+        int8: Int8Array, uint8: Uint8Array, int16: Int16Array,
+        uint16: Uint16Array, uint32: Uint32Array, float32: Float32Array
+    };
+    var GL_TYPES = {
+        int8: 0x1400, uint8: 0x1401, int16: 0x1402, uint16: 0x1403,
+        uint32: 0x1405, float32: 0x1406
+    };
+
+    var buffers = {};
+
+    function addBuffers(data) {
+        for (var key in data) {
+            if (!data.hasOwnProperty(key) || buffers[key] !== undefined) {
+                continue;
+            }
+            var bin = atob(data[key]);
+            var bytes = new Uint8Array(bin.length);
+            for (var i = 0; i < bin.length; i++) {
+                bytes[i] = bin.charCodeAt(i);
+            }
+            buffers[key] = bytes.buffer;
+        }
+    }
+
+    function getArray(ref) {
+        var buffer = buffers[ref.hash];
+        if (buffer === undefined) {
+            throw new Error("The data of this scene is no longer " +
+                            "available, please display it again.");
+        }
+        return new ARRAY_TYPES[ref.dtype](buffer);
+    }
+
+    //////////////////////////////////////////////////////////////////////
+    // Vectors and matrices, the matrices are column major.
+    //////////////////////////////////////////////////////////////////////
+    function add(a, b) { return [a[0] + b[0], a[1] + b[1], a[2] + b[2]]; }
+    function sub(a, b) { return [a[0] - b[0], a[1] - b[1], a[2] - b[2]]; }
+    function scale(a, s) { return [a[0]*s, a[1]*s, a[2]*s]; }
+    function dot(a, b) { return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]; }
+    function cross(a, b) {
+        return [a[1]*b[2] - a[2]*b[1], a[2]*b[0] - a[0]*b[2],
+                a[0]*b[1] - a[1]*b[0]];
+    }
+    function normalize(a) {
+        var n = Math.sqrt(dot(a, a));
+        return n > 0 ? scale(a, 1/n) : a;
+    }
+    // Rotates `v` by `angle` around the unit vector `axis`.
+    function rotate(v, axis, angle) {
+        var c = Math.cos(angle), s = Math.sin(angle);
+        return add(add(scale(v, c), scale(cross(axis, v), s)),
+                   scale(axis, dot(axis, v)*(1 - c)));
+    }
+
+    function multiply(a, b) {
+        var r = new Float32Array(16);
+        for (var i = 0; i < 4; i++) {
+            for (var j = 0; j < 4; j++) {
+                var s = 0;
+                for (var k = 0; k < 4; k++) {
+                    s += a[k*4 + j]*b[i*4 + k];
+                }
+                r[i*4 + j] = s;
+            }
+        }
+        return r;
+    }
+
+    // The inverse transpose of the upper 3x3 part of `m`, to transform
+    // the normals.
+    function normalMatrix(m) {
+        var a = m[0], b = m[4], c = m[8],
+            d = m[1], e = m[5], f = m[9],
+            g = m[2], h = m[6], i = m[10];
+        var A = e*i - f*h, B = f*g - d*i, C = d*h - e*g;
+        var det = a*A + b*B + c*C;
+        det = det !== 0 ? 1/det : 0;
+        return new Float32Array([
+            A*det, (c*h - b*i)*det, (b*f - c*e)*det,
+            B*det, (a*i - c*g)*det, (c*d - a*f)*det,
+            C*det, (b*g - a*h)*det, (a*e - b*d)*det
+        ]);
+    }
+
+    function lookAt(eye, center, up) {
+        var f = normalize(sub(center, eye));
+        var s = normalize(cross(f, up));
+        var u = cross(s, f);
+        return new Float32Array([
+            s[0], u[0], -f[0], 0,
+            s[1], u[1], -f[1], 0,
+            s[2], u[2], -f[2], 0,
+            -dot(s, eye), -dot(u, eye), dot(f, eye), 1
+        ]);
+    }
+
+    function perspective(viewAngle, aspect, near, far) {
+        var f = 1/Math.tan(viewAngle*Math.PI/360), nf = 1/(near - far);
+        return new Float32Array([
+            f/aspect, 0, 0, 0,
+            0, f, 0, 0,
+            0, 0, (far + near)*nf, -1,
+            0, 0, 2*far*near*nf, 0
+        ]);
+    }
+
+    function ortho(parallelScale, aspect, near, far) {
+        var nf = 1/(near - far);
+        return new Float32Array([
+            1/(parallelScale*aspect), 0, 0, 0,
+            0, 1/parallelScale, 0, 0,
+            0, 0, 2*nf, 0,
+            0, 0, (far + near)*nf, 1
+        ]);
+    }
+
+    // The row major matrices of VTK to column major.
+    function transpose(m) {
+        var r = new Float32Array(16);
+        for (var i = 0; i < 4; i++) {
+            for (var j = 0; j < 4; j++) {
+                r[j*4 + i] = m[i*4 + j];
+            }
+        }
+        return r;
+    }
+
+    //////////////////////////////////////////////////////////////////////
+    // Shaders.
+    //////////////////////////////////////////////////////////////////////
+    var VERTEX_SHADER = [
+        "attribute vec3 a_position;",
+        "attribute vec3 a_normal;",
+        "attribute vec4 a_color;",
+        "uniform vec3 u_offset;",
+        "uniform vec3 u_scale;",
+        "uniform mat4 u_model_view;",
+        "uniform mat3 u_normal_matrix;",
+        "uniform mat4 u_projection;",
+        "uniform float u_point_size;",
+        "varying vec3 v_position;",
+        "varying vec3 v_normal;",
+        "varying vec4 v_color;",
+        "void main() {",
+        "    vec4 p = u_model_view*vec4(a_position*u_scale + u_offset, 1.0);",
+        "    v_position = p.xyz;",
+        "    v_normal = u_normal_matrix*a_normal;",
+        "    v_color = a_color;",
+        "    gl_PointSize = u_point_size;",
+        "    gl_Position = u_projection*p;",
+        "}"
+    ].join("\n");
+
+    var FRAGMENT_SHADER = [
+        "#extension GL_OES_standard_derivatives : enable",
+        "precision highp float;",
+        "uniform float u_has_normals;",
+        "uniform float u_lit;",
+        "uniform float u_opacity;",
+        "uniform vec4 u_material;",
+        "varying vec3 v_position;",
+        "varying vec3 v_normal;",
+        "varying vec4 v_color;",
+        "void main() {",
+        "    vec3 color = v_color.rgb;",
+        "    if (u_lit > 0.5) {",
+        "        vec3 n = u_has_normals > 0.5 ? normalize(v_normal) :",
+        "            normalize(cross(dFdx(v_position), dFdy(v_position)));",
+        "        // A two sided head light.",
+        "        float d = abs(dot(n, normalize(-v_position)));",
+        "        float s = pow(max(2.0*d*d - 1.0, 0.0), u_material.w);",
+        "        color = color*(u_material.x + u_material.y*d) +",
+        "            vec3(u_material.z*s);",
+        "    }",
+        "    gl_FragColor = vec4(color, v_color.a*u_opacity);",
+        "}"
+    ].join("\n");
+
+    function compileShader(gl, type, source) {
+        var shader = gl.createShader(type);
+        gl.shaderSource(shader, source);
+        gl.compileShader(shader);
+        if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) {
+            throw new Error(gl.getShaderInfoLog(shader));
+        }
+        return shader;
+    }
+
+    function createProgram(gl) {
+        var program = gl.createProgram();
+        gl.attachShader(program,
+                        compileShader(gl, gl.VERTEX_SHADER, VERTEX_SHADER));
+        gl.attachShader(program,
+                        compileShader(gl, gl.FRAGMENT_SHADER,
+                                      FRAGMENT_SHADER));
+        // Attribute 0 must always be an enabled array.
+        gl.bindAttribLocation(program, 0, "a_position");
+        gl.linkProgram(program);
+        if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+            throw new Error(gl.getProgramInfoLog(program));
+        }
+        var names = ["a_position", "a_normal", "a_color"];
+        var uniforms = ["u_offset", "u_scale", "u_model_view",
+                        "u_normal_matrix", "u_projection", "u_point_size",
+                        "u_has_normals", "u_lit", "u_opacity", "u_material"];
+        var locations = {program: program};
+        names.forEach(function(name) {
+            locations[name] = gl.getAttribLocation(program, name);
+        });
+        uniforms.forEach(function(name) {
+            locations[name] = gl.getUniformLocation(program, name);
+        });
+        return locations;
+    }
+
+    //////////////////////////////////////////////////////////////////////
+    // Actors.
+    //////////////////////////////////////////////////////////////////////
+    function createBuffer(gl, target, array) {
+        var buffer = gl.createBuffer();
+        gl.bindBuffer(target, buffer);
+        gl.bufferData(target, array, gl.STATIC_DRAW);
+        return buffer;
+    }
+
+    // The edges of the triangles, for the wireframe representation.
+    function triangleEdges(triangles) {
+        var edges = new triangles.constructor(triangles.length*2);
+        for (var i = 0, j = 0; i < triangles.length; i += 3, j += 6) {
+            edges[j] = triangles[i];
+            edges[j + 1] = edges[j + 2] = triangles[i + 1];
+            edges[j + 3] = edges[j + 4] = triangles[i + 2];
+            edges[j + 5] = triangles[i];
+        }
+        return edges;
+    }
+
+    function createActor(gl, info) {
+        var actor = {info: info, draws: []};
+        var positions = getArray(info.positions);
+        actor.nPoints = positions.length/3;
+        actor.positions = createBuffer(gl, gl.ARRAY_BUFFER, positions);
+        if (info.normals) {
+            actor.normals = createBuffer(gl, gl.ARRAY_BUFFER,
+                                         getArray(info.normals));
+        }
+        if (info.colors) {
+            actor.colors = createBuffer(gl, gl.ARRAY_BUFFER,
+                                        getArray(info.colors));
+        }
+
+        var addDraw = function(mode, ref, indices, lit) {
+            actor.draws.push({
+                mode: mode, lit: lit, count: indices.length,
+                type: GL_TYPES[ref.dtype],
+                indices: createBuffer(gl, gl.ELEMENT_ARRAY_BUFFER, indices)
+            });
+        };
+        if (info.representation === "points") {
+            actor.draws.push({mode: gl.POINTS, lit: false,
+                              count: actor.nPoints});
+            return actor;
+        }
+        if (info.triangles) {
+            var triangles = getArray(info.triangles);
+            if (info.representation === "wireframe") {
+                addDraw(gl.LINES, info.triangles, triangleEdges(triangles),
+                        false);
+            } else {
+                addDraw(gl.TRIANGLES, info.triangles, triangles, true);
+            }
+        }
+        if (info.lines) {
+            addDraw(gl.LINES, info.lines, getArray(info.lines), false);
+        }
+        return actor;
+    }
+
+    function drawActor(gl, loc, actor, view) {
+        var info = actor.info;
+        var modelView = multiply(view, transpose(info.matrix));
+        gl.uniformMatrix4fv(loc.u_model_view, false, modelView);
+        gl.uniformMatrix3fv(loc.u_normal_matrix, false,
+                            normalMatrix(modelView));
+        gl.uniform3fv(loc.u_offset, info.offset);
+        gl.uniform3fv(loc.u_scale, info.scale);
+        gl.uniform1f(loc.u_point_size, info.point_size);
+        gl.uniform1f(loc.u_opacity, info.opacity);
+        gl.uniform4f(loc.u_material, info.ambient, info.diffuse,
+                     info.specular, info.specular_power);
+        gl.lineWidth(info.line_width);
+
+        gl.bindBuffer(gl.ARRAY_BUFFER, actor.positions);
+        gl.vertexAttribPointer(loc.a_position, 3,
+                               GL_TYPES[info.positions.dtype], false, 0, 0);
+        gl.enableVertexAttribArray(loc.a_position);
+        if (actor.normals) {
+            gl.bindBuffer(gl.ARRAY_BUFFER, actor.normals);
+            gl.vertexAttribPointer(loc.a_normal, 3,
+                                   GL_TYPES[info.normals.dtype], true, 0, 0);
+            gl.enableVertexAttribArray(loc.a_normal);
+        } else {
+            gl.disableVertexAttribArray(loc.a_normal);
+            gl.vertexAttrib3f(loc.a_normal, 0, 0, 1);
+        }
+        gl.uniform1f(loc.u_has_normals, actor.normals ? 1 : 0);
+        if (actor.colors) {
+            gl.bindBuffer(gl.ARRAY_BUFFER, actor.colors);
+            gl.vertexAttribPointer(loc.a_color, info.colors.size,
+                                   GL_TYPES[info.colors.dtype], true, 0, 0);
+            gl.enableVertexAttribArray(loc.a_color);
+        } else {
+            var c = info.color;
+            gl.disableVertexAttribArray(loc.a_color);
+            gl.vertexAttrib4f(loc.a_color, c[0], c[1], c[2], 1);
+        }
+
+        actor.draws.forEach(function(draw) {
+            gl.uniform1f(loc.u_lit, draw.lit ? 1 : 0);
+            if (draw.indices) {
+                gl.bindBuffer(gl.ELEMENT_ARRAY_BUFFER, draw.indices);
+                gl.drawElements(draw.mode, draw.count, draw.type, 0);
+            } else {
+                gl.drawArrays(draw.mode, 0, draw.count);
+            }
+        });
+    }
+
+    //////////////////////////////////////////////////////////////////////
+    // Scenes.
+    //////////////////////////////////////////////////////////////////////
+    function Scene(element, info) {
+        var canvas = document.createElement("canvas");
+        canvas.width = info.width;
+        canvas.height = info.height;
+        element.appendChild(canvas);
+        var gl = canvas.getContext("webgl", {antialias: true}) ||
+            canvas.getContext("experimental-webgl");
+        if (!gl) {
+            element.textContent = "WebGL is not available.";
+            return;
+        }
+        gl.getExtension("OES_element_index_uint");
+        gl.getExtension("OES_standard_derivatives");
+        this.gl = gl;
+        this.canvas = canvas;
+        this.info = info;
+        this.camera = JSON.parse(JSON.stringify(info.camera));
+        this.loc = createProgram(gl);
+        this.actors = info.actors.map(function(a) {
+            return createActor(gl, a);
+        });
+        this._bindEvents();
+        this.draw();
+    }
+
+    Scene.prototype.draw = function() {
+        var gl = this.gl, loc = this.loc, cam = this.camera;
+        var bg = this.info.background;
+        gl.viewport(0, 0, this.canvas.width, this.canvas.height);
+        gl.clearColor(bg[0], bg[1], bg[2], 1);
+        gl.clear(gl.COLOR_BUFFER_BIT | gl.DEPTH_BUFFER_BIT);
+        gl.enable(gl.DEPTH_TEST);
+        gl.useProgram(loc.program);
+
+        var dist = Math.sqrt(dot(sub(this.info.center, cam.position),
+                                 sub(this.info.center, cam.position)));
+        var far = dist + this.info.radius*1.01 + 1e-6;
+        var near = Math.max(dist - this.info.radius*1.01, far*1e-3);
+        var aspect = this.canvas.width/this.canvas.height;
+        var projection = cam.parallel_projection ?
+            ortho(cam.parallel_scale, aspect, near, far) :
+            perspective(cam.view_angle, aspect, near, far);
+        gl.uniformMatrix4fv(loc.u_projection, false, projection);
+        var view = lookAt(cam.position, cam.focal_point, cam.view_up);
+
+        // The opaque actors first, then the translucent ones.
+        var opaque = this.actors.filter(function(a) {
+            return a.info.opacity >= 1;
+        });
+        var translucent = this.actors.filter(function(a) {
+            return a.info.opacity < 1;
+        });
+        gl.disable(gl.BLEND);
+        gl.depthMask(true);
+        opaque.forEach(function(a) { drawActor(gl, loc, a, view); });
+        gl.enable(gl.BLEND);
+        gl.blendFunc(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA);
+        gl.depthMask(false);
+        translucent.forEach(function(a) { drawActor(gl, loc, a, view); });
+        gl.depthMask(true);
+    };
+
+    // Left drag rotates around the focal point, right or shift and left
+    // drag pans and the wheel zooms.
+    Scene.prototype._bindEvents = function() {
+        var self = this, canvas = this.canvas, last = null;
+        canvas.addEventListener("contextmenu", function(e) {
+            e.preventDefault();
+        });
+        canvas.addEventListener("mousedown", function(e) {
+            last = {x: e.clientX, y: e.clientY,
+                    pan: e.button !== 0 || e.shiftKey};
+            e.preventDefault();
+        });
+        window.addEventListener("mouseup", function() { last = null; });
+        window.addEventListener("mousemove", function(e) {
+            if (last === null) {
+                return;
+            }
+            var dx = e.clientX - last.x, dy = e.clientY - last.y;
+            last.x = e.clientX;
+            last.y = e.clientY;
+            if (last.pan) {
+                self.pan(dx, dy);
+            } else {
+                self.rotate(dx, dy);
+            }
+            self.draw();
+        });
+        canvas.addEventListener("wheel", function(e) {
+            e.preventDefault();
+            self.zoom(e.deltaY < 0 ? 1.1 : 1/1.1);
+            self.draw();
+        });
+    };
+
+    Scene.prototype.rotate = function(dx, dy) {
+        var cam = this.camera;
+        var delta = 2*Math.PI/Math.min(this.canvas.width,
+                                       this.canvas.height);
+        var up = normalize(cam.view_up);
+        var offset = sub(cam.position, cam.focal_point);
+        var right = normalize(cross(scale(offset, -1), up));
+        offset = rotate(offset, up, -dx*delta);
+        right = rotate(right, up, -dx*delta);
+        offset = rotate(offset, right, -dy*delta);
+        cam.view_up = rotate(up, right, -dy*delta);
+        cam.position = add(cam.focal_point, offset);
+    };
+
+    Scene.prototype.pan = function(dx, dy) {
+        var cam = this.camera;
+        var offset = sub(cam.position, cam.focal_point);
+        var dist = Math.sqrt(dot(offset, offset));
+        var height = cam.parallel_projection ? 2*cam.parallel_scale :
+            2*dist*Math.tan(cam.view_angle*Math.PI/360);
+        var factor = height/this.canvas.height;
+        var up = normalize(cam.view_up);
+        var right = normalize(cross(scale(offset, -1), up));
+        var move = add(scale(right, -dx*factor), scale(up, dy*factor));
+        cam.position = add(cam.position, move);
+        cam.focal_point = add(cam.focal_point, move);
+    };
+
+    Scene.prototype.zoom = function(factor) {
+        var cam = this.camera;
+        if (cam.parallel_projection) {
+            cam.parallel_scale /= factor;
+        } else {
+            var offset = sub(cam.position, cam.focal_point);
+            cam.position = add(cam.focal_point, scale(offset, 1/factor));
+        }
+    };
+
+    function render(element, info) {
+        try {
+            return new Scene(element, info);
+        } catch (e) {
+            element.textContent = e.message;
+        }
+    }
+
+    root.MayaviWebGL = {
+        buffers: buffers,
+        addBuffers: addBuffers,
+        render: render,
+        Scene: Scene
+    };
+})(window);
@@ -222,50 +222,243 @@ def _find_module_manager(object=None, data_type=None):
     return None
 
 
-def _typical_distance(data_obj):
+def point_spacing(points, method='euclidean', sample_size=None):
+    """ Return the spacing of a cloud of points.
+
+        The spacing is computed without building the matrix of the
+        distances between all the points, so that it can be used for
+        millions of points.
+
+        **Parameters**
+
+        :points: array of shape (N, 3)
+            The positions of the points.
+        :method: 'euclidean', 'axis' or 'typical', optional
+            'euclidean' returns the minimum non-zero distance between
+            two points.  It uses a KD-tree if scipy is available, else
+            a grid of cells the size of an upper bound of the spacing.
+            'axis' returns the minimum non-zero difference between the
+            coordinates of two points along one of the axes, found by
+            sorting the coordinates.  'typical' returns an estimate of
+            the spacing from the size of the bounding box and the
+            number of points.
+        :sample_size: int, optional
+            With the 'euclidean' method, only the distances from this
+            number of randomly chosen points to all the points are
+            computed.  This gives an approximate answer, which is never
+            smaller than the exact one, in a time linear in N.
+
+        **Returns**
+
+        The spacing as a float, 1 if all the points are at the same
+        position.
+    """
+    points = numpy.asarray(points, dtype=float).reshape((-1, 3))
+    if method == 'typical':
+        spacing = _typical_distance(points)
+    elif method == 'axis':
+        spacing = min(_min_axis_distance(points[:, i]) for i in range(3))
+    elif method == 'euclidean':
+        # Coincident points do not count.
+        points = numpy.unique(points, axis=0)
+        if len(points) < 2:
+            spacing = numpy.inf
+        elif sample_size is not None and sample_size < len(points):
+            spacing = _sampled_min_distance(points, sample_size)
+        else:
+            spacing = _min_distance(points)
+    else:
+        raise ValueError("Invalid method, must be 'euclidean', 'axis' or "
+                         "'typical', but '%s' was given." % method)
+    if spacing == numpy.inf or spacing == 0:
+        return 1
+    return float(spacing)
+
+
+def _typical_distance(points):
     """ Returns a typical distance in a cloud of points.
         This is done by taking the size of the bounding box, and dividing it
         by the cubic root of the number of points.
     """
-    x_min, x_max, y_min, y_max, z_min, z_max = data_obj.bounds
-    distance = numpy.sqrt(((x_max - x_min) ** 2 + (y_max - y_min) ** 2 +
-                           (z_max - z_min) ** 2) / (4 *
-                           data_obj.number_of_points ** (0.33)))
-    if distance == 0:
+    if len(points) == 0:
         return 1
-    else:
-        return 0.4 * distance
+    extent = points.max(axis=0) - points.min(axis=0)
+    distance = numpy.sqrt((extent ** 2).sum() /
+                          (4 * len(points) ** (0.33)))
+    return 0.4 * distance
 
 
-def _min_distance(x, y, z):
-    """ Return the minimum interparticle distance in a cloud of points.
-        This is done by brute force calculation of all the distances
-        between particle couples.
+def _min_axis_distance(a):
+    """ Return the minimum non-zero difference between the values of
+        an array, by sorting it.
     """
-    distances = numpy.sqrt((x.reshape((-1,)) - x.reshape((1, -1))) ** 2
-                           + (y.reshape((-1,)) - y.reshape((1, -1))) ** 2
-                           + (z.reshape((-1,)) - z.reshape((1, -1))) ** 2
-                          )
-    return distances[distances != 0].min()
-
-
-def _min_axis_distance(x, y, z):
-    """ Return the minimum interparticle distance in a cloud of points
-        along one of the axis.
-        This is done by brute force calculation of all the distances with
-        norm infinity between particle couples.
+    a = numpy.diff(numpy.sort(a.reshape((-1,))))
+    a = a[a > 0]
+    if a.size == 0:
+        return numpy.inf
+    return a.min()
+
+
+def _sampled_min_distance(points, sample_size, chunk_size=2**16):
+    """ Return the minimum distance between randomly chosen points and
+        all the distinct points of a cloud.
     """
-    def axis_min(a):
-        a = numpy.abs(a.reshape((-1,)) - a.reshape((-1, 1)))
-        a = a[a > 0]
-        if a.size == 0:
-            return numpy.inf
-        return a.min()
-    distances = min(axis_min(x), axis_min(y), axis_min(z))
-    if distances == numpy.inf:
-        return 1
-    else:
-        return distances
+    sample = points[numpy.random.choice(len(points), sample_size,
+                                        replace=False)]
+    best = numpy.inf
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        for p in sample:
+            d = chunk - p
+            d = numpy.einsum('ij,ij->i', d, d)
+            d = d[d > 0]
+            if d.size > 0:
+                best = min(best, d.min())
+    return numpy.sqrt(best)
+
+
+def _min_distance(points, chunk_size=2**20, max_pairs=64):
+    """ Return the minimum distance between the distinct points of a
+        cloud.
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        cKDTree = None
+    if cKDTree is not None:
+        distances = cKDTree(points).query(points, k=2)[0]
+        return distances[:, 1].min()
+
+    # Any pair of points closer than an upper bound of the spacing lies
+    # in the same or in neighboring cells of a grid of that size, so only
+    # these pairs are compared.
+    size = _sampled_min_distance(points, min(len(points), 16))
+    p_min = points.min(axis=0)
+    extent = points.max(axis=0) - p_min
+    # Keep the number of cells representable.
+    size = max(size, extent.max() / 2e6)
+    cells = numpy.floor((points - p_min) / size).astype(numpy.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = numpy.argsort(keys, kind='mergesort')
+    keys = keys[order]
+    points = points[order]
+
+    n = len(points)
+    neighbors = []
+    for offset in _half_neighborhood():
+        delta = (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        if delta == 0:
+            # Pairs in the same cell, each counted once.
+            start = numpy.arange(1, n + 1)
+        else:
+            start = numpy.searchsorted(keys, keys + delta, 'left')
+        neighbors.append((start, delta))
+    n_pairs = sum(numpy.maximum(numpy.searchsorted(keys, keys + delta,
+                                                   'right') - start,
+                                0).sum()
+                  for start, delta in neighbors)
+    if n_pairs > max_pairs * n:
+        # The points are clustered in a few cells: the grid does not
+        # fit the cloud, split it instead.
+        return numpy.sqrt(_tree_min_distance(_kd_tree(points), numpy.inf))
+
+    best = numpy.inf
+    for start, delta in neighbors:
+        end = numpy.searchsorted(keys, keys + delta, 'right')
+        counts = numpy.maximum(end - start, 0)
+        # Compare the points with their neighbors, in chunks of pairs.
+        first = 0
+        while first < n:
+            cum = numpy.cumsum(counts[first:])
+            last = first + max(numpy.searchsorted(cum, chunk_size), 1)
+            last = min(last, n)
+            c = counts[first:last]
+            total = c.sum()
+            if total > 0:
+                i = numpy.repeat(numpy.arange(first, last), c)
+                pos = numpy.arange(total) - numpy.repeat(numpy.cumsum(c) - c,
+                                                         c)
+                j = start[i] + pos
+                d = points[j] - points[i]
+                best = min(best, numpy.einsum('ij,ij->i', d, d).min())
+            first = last
+    return numpy.sqrt(best)
+
+
+def _kd_tree(points, leaf_size=64):
+    """ Return a k-d tree of the points, split in halves at the median
+        of their widest axis, as nested tuples `(lower, upper, points,
+        children)` where only the leaves keep their points.
+    """
+    lower = points.min(axis=0)
+    upper = points.max(axis=0)
+    if len(points) <= leaf_size:
+        return lower, upper, points, ()
+    axis = numpy.argmax(upper - lower)
+    half = len(points) // 2
+    order = numpy.argpartition(points[:, axis], half)
+    children = (_kd_tree(points[order[:half]], leaf_size),
+                _kd_tree(points[order[half:]], leaf_size))
+    return lower, upper, None, children
+
+
+def _box_distance2(a, b):
+    """ Return the squared distance between the bounding boxes of two
+        nodes of a k-d tree.
+    """
+    gap = numpy.maximum(numpy.maximum(a[0] - b[1], b[0] - a[1]), 0)
+    return gap.dot(gap)
+
+
+def _tree_min_distance(node, best):
+    """ Return the minimum squared distance between the points of a
+        node of a k-d tree, or `best` if it is smaller.
+    """
+    points, children = node[2], node[3]
+    if not children:
+        d = points[:, numpy.newaxis] - points
+        d = numpy.einsum('ijk,ijk->ij', d, d)
+        d = d[numpy.triu_indices(len(points), 1)]
+        if d.size > 0:
+            best = min(best, d.min())
+        return best
+    best = _tree_min_distance(children[0], best)
+    best = _tree_min_distance(children[1], best)
+    return _tree_cross_distance(children[0], children[1], best)
+
+
+def _tree_cross_distance(a, b, best):
+    """ Return the minimum squared distance between the points of two
+        nodes of a k-d tree, or `best` if it is smaller.  Nodes further
+        apart than `best` are not visited.
+    """
+    if _box_distance2(a, b) >= best:
+        return best
+    if not a[3] and not b[3]:
+        d = a[2][:, numpy.newaxis] - b[2]
+        return min(best, numpy.einsum('ijk,ijk->ij', d, d).min())
+    # Split the largest node, visiting the closest half first.
+    if not a[3] or (b[3] and (b[1] - b[0]).max() > (a[1] - a[0]).max()):
+        a, b = b, a
+    near, far = a[3]
+    if _box_distance2(far, b) < _box_distance2(near, b):
+        near, far = far, near
+    best = _tree_cross_distance(near, b, best)
+    return _tree_cross_distance(far, b, best)
+
+
+def _half_neighborhood():
+    """ Return the offsets of a cell and of half of its 26 neighbors,
+        so that each pair of neighboring cells is visited once.
+    """
+    offsets = []
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            for k in (-1, 0, 1):
+                if (i, j, k) >= (0, 0, 0):
+                    offsets.append((i, j, k))
+    return offsets
 
 
 def set_extent(module, extents):
@@ -15,7 +15,7 @@ import numpy as np
 from matplotlib.cm import datad, get_cmap
 from matplotlib._cm_listed import cmaps
 from mayavi.core import lut as destination_module
-from apptools.persistence import state_pickler
+from mayavi.core.lut_manager import save_colormaps
 target_dir = os.path.dirname(destination_module.__file__)
 
 values = np.linspace(0., 1., 256)
@@ -31,6 +31,6 @@ for name in cmap_names:
         continue
     lut_dic[name] = get_cmap(name)(values.copy())
 
-out_name = os.path.join(target_dir, 'pylab_luts.pkl')
-state_pickler.dump(lut_dic, out_name)
+out_name = os.path.join(target_dir, 'pylab_luts')
+save_colormaps(lut_dic, out_name)
 
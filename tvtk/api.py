@@ -10,8 +10,18 @@ from tvtk.version import version, version as __version__
 # The TVTK pseudo-module.
 from tvtk.tvtk_access import tvtk
 
-# Handy colors from VTK.
-from vtk.util import colors
-
 # Some miscellaneous functionality.
 from tvtk.misc import write_data
+
+# Handy colors from VTK, imported on first use since this imports VTK.
+import sys as _sys
+if _sys.version_info[:2] < (3, 7):
+    from vtk.util import colors
+
+
+def __getattr__(name):
+    if name == 'colors':
+        from vtk.util import colors
+        globals()['colors'] = colors
+        return colors
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
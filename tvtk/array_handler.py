@@ -13,7 +13,9 @@ seems no unique one-to-one VTK data array type to map it to.
 # Copyright (c) 2004-2015,  Enthought, Inc.
 # License: BSD Style.
 
+import itertools
 import sys
+import warnings
 
 import vtk
 from vtk.util import vtkConstants
@@ -45,6 +47,10 @@ elif VTK_LONG_TYPE_SIZE == 8:
 
 BASE_REFERENCE_COUNT = vtk.vtkObject().GetReferenceCount()
 
+# VTK 9 stores cells as separate offsets and connectivity arrays which
+# may be set directly without converting to the legacy layout.
+HAS_CELL_ARRAY_SET_DATA = hasattr(vtk.vtkCellArray, 'GetOffsetsArray')
+
 if sys.version_info[0] > 2:
     unicode = str
 
@@ -61,14 +67,34 @@ class ArrayCache(object):
     of which are converted to VTK arrays.  The caching prevents the user
     from deleting or resizing the numpy array after it has been sent
     down to VTK.  The cached arrays are automatically removed when the
-    VTK array destructs."""
+    VTK array destructs.
+
+    The cache also keeps track of the memory pinned by the cached
+    arrays.  Use `stats` for a summary and `snapshot` for details on
+    each cached array.  If `max_bytes` is set, a `RuntimeWarning` is
+    issued (or `callback` is called if set) every time an array is
+    added and the total pinned memory exceeds it.
+    """
 
     ######################################################################
     # `object` interface.
     ######################################################################
-    def __init__(self):
+    def __init__(self, max_bytes=None, callback=None):
         # The cache.
         self._cache = {}
+        # Information on each cached entry: (class name, nbytes, dtypes).
+        self._info = {}
+        # The upper limit of pinned bytes, `None` means no limit.
+        self.max_bytes = max_bytes
+        # Called as callback(cache, nbytes) when `max_bytes` is
+        # exceeded.  If `None` a warning is issued instead.
+        self.callback = callback
+        self._nbytes = 0
+        self._dtype_counts = {}
+        self._hits = 0
+        self._misses = 0
+        self._n_added = 0
+        self._n_removed = 0
 
     def __len__(self):
         return len(self._cache)
@@ -82,7 +108,8 @@ class ArrayCache(object):
     ######################################################################
     def add(self, vtk_arr, np_arr):
         """Add numpy array corresponding to the vtk array to the
-        cache."""
+        cache.  `np_arr` may also be a tuple of numpy arrays that must
+        be kept alive together."""
         key = vtk_arr.__this__
         cache = self._cache
 
@@ -91,16 +118,61 @@ class ArrayCache(object):
         # `lambda` function is necessary because the callback will not
         # receive the object (it will receive `None`) and thus there
         # is no way to know which array reference one has to remove.
-        vtk_arr.AddObserver('DeleteEvent', lambda o, e, key=key: \
-                            self._remove_array(key))
+        # The observer is only added once per VTK object, re-adding
+        # simply replaces the cached reference.
+        if key in cache:
+            self._forget(key)
+        else:
+            vtk_arr.AddObserver('DeleteEvent', lambda o, e, key=key: \
+                                self._remove_array(key))
 
         # Cache the array
         cache[key] = np_arr
+        self._account(key, vtk_arr.GetClassName(), np_arr)
+        self._check_limit()
 
     def get(self, vtk_arr):
         """Return the cached numpy array given a VTK array."""
         key = vtk_arr.__this__
-        return self._cache[key]
+        try:
+            result = self._cache[key]
+        except KeyError:
+            self._misses += 1
+            raise
+        self._hits += 1
+        return result
+
+    def stats(self):
+        """Return a dictionary summarizing the state of the cache.
+
+        The keys are `n_arrays`, `nbytes` (the total pinned memory),
+        `max_bytes`, `dtype_counts` (number of arrays per dtype),
+        `class_nbytes` (pinned memory per VTK class), `hits`,
+        `misses`, `n_added` and `n_removed`.
+        """
+        class_nbytes = {}
+        for cname, nbytes, dtypes in self._info.values():
+            class_nbytes[cname] = class_nbytes.get(cname, 0) + nbytes
+        return dict(n_arrays=len(self._cache), nbytes=self._nbytes,
+                    max_bytes=self.max_bytes,
+                    dtype_counts=dict(self._dtype_counts),
+                    class_nbytes=class_nbytes,
+                    hits=self._hits, misses=self._misses,
+                    n_added=self._n_added, n_removed=self._n_removed)
+
+    def snapshot(self):
+        """Return a list of `(key, class_name, nbytes, dtypes)` tuples,
+        one for each cached entry, sorted by decreasing size.  The key
+        is the `__this__` attribute of the VTK object.
+        """
+        result = [(key,) + info for key, info in self._info.items()]
+        result.sort(key=lambda x: x[2], reverse=True)
+        return result
+
+    def reset_stats(self):
+        """Reset the hit/miss and add/remove counters."""
+        self._hits = self._misses = 0
+        self._n_added = self._n_removed = 0
 
     ######################################################################
     # Non-public interface.
@@ -112,6 +184,50 @@ class ArrayCache(object):
             del self._cache[key]
         except KeyError:
             pass
+        else:
+            self._forget(key)
+            self._n_removed += 1
+
+    def _account(self, key, class_name, np_arr):
+        """Record the memory used by the cached `np_arr`."""
+        if isinstance(np_arr, tuple):
+            arrays = np_arr
+        else:
+            arrays = (np_arr,)
+        nbytes = sum(getattr(a, 'nbytes', 0) for a in arrays)
+        dtypes = tuple(str(getattr(a, 'dtype', '')) for a in arrays)
+        self._info[key] = (class_name, nbytes, dtypes)
+        self._nbytes += nbytes
+        counts = self._dtype_counts
+        for dt in dtypes:
+            counts[dt] = counts.get(dt, 0) + 1
+        self._n_added += 1
+
+    def _forget(self, key):
+        """Remove the accounting information for `key`."""
+        info = self._info.pop(key, None)
+        if info is None:
+            return
+        self._nbytes -= info[1]
+        counts = self._dtype_counts
+        for dt in info[2]:
+            counts[dt] -= 1
+            if counts[dt] == 0:
+                del counts[dt]
+
+    def _check_limit(self):
+        """Warn or call the callback if the pinned memory exceeds
+        `max_bytes`."""
+        max_bytes = self.max_bytes
+        if max_bytes is None or self._nbytes <= max_bytes:
+            return
+        if self.callback is not None:
+            self.callback(self, self._nbytes)
+        else:
+            msg = 'ArrayCache holds %d bytes in %d arrays, exceeding the '\
+                  'limit of %d bytes.'%(self._nbytes, len(self._cache),
+                                        max_bytes)
+            warnings.warn(msg, RuntimeWarning, stacklevel=3)
 
 
 ######################################################################
@@ -429,21 +545,87 @@ def vtk2array(vtk_array):
     return im_arr
 
 
-def array2vtkCellArray(num_array, vtk_array=None):
+def _get_id_array(arr):
+    """Return `arr` as a flat integer array suitable for the
+    offsets/connectivity arrays of a vtkCellArray.  32 and 64 bit
+    integer arrays are returned as is (no copy is made if they are
+    contiguous), anything else is cast to `ID_TYPE_CODE`.
+    """
+    arr = numpy.asarray(arr)
+    if arr.dtype not in (numpy.dtype(numpy.int32), numpy.dtype(numpy.int64)):
+        arr = arr.astype(ID_TYPE_CODE)
+    return numpy.ravel(arr)
+
+
+def _offsets2legacy(offsets, connectivity):
+    """Given offsets and connectivity arrays, return the legacy
+    interleaved `(npts, p0, p1, ...)` connectivity as an `ID_TYPE_CODE`
+    array along with the number of cells.
+    """
+    offsets = numpy.asarray(offsets, ID_TYPE_CODE)
+    n_cells = len(offsets) - 1
+    counts = numpy.diff(offsets)
+    legacy = numpy.empty((n_cells + len(connectivity),), ID_TYPE_CODE)
+    starts = offsets[:-1] + numpy.arange(n_cells, dtype=ID_TYPE_CODE)
+    mask = numpy.ones(len(legacy), dtype=bool)
+    mask[starts] = False
+    legacy[starts] = counts
+    legacy[mask] = connectivity
+    return n_cells, legacy
+
+
+def _set_cells_from_offsets(cells, offsets, connectivity):
+    """Set the cells of the vtkCellArray `cells` given the `offsets`
+    and `connectivity` arrays.
+
+    With VTK >= 9 the arrays are handed to `vtkCellArray.SetData`
+    without any copy, otherwise they are converted to the legacy
+    layout and copied.
+    """
+    offsets = _get_id_array(offsets)
+    connectivity = _get_id_array(connectivity)
+    if offsets.dtype != connectivity.dtype:
+        offsets = offsets.astype(ID_TYPE_CODE)
+        connectivity = connectivity.astype(ID_TYPE_CODE)
+
+    assert len(offsets) > 0, "Offsets array must have n_cells + 1 entries."
+    assert offsets[0] == 0 and offsets[-1] == len(connectivity), \
+           "Offsets must start at 0 and end at the length of the "\
+           "connectivity array."
+
+    if HAS_CELL_ARRAY_SET_DATA:
+        vtk_offsets = array2vtk(offsets)
+        vtk_conn = array2vtk(connectivity)
+        cells.SetData(vtk_offsets, vtk_conn)
+        # The cell array may share the buffers without holding on to
+        # the VTK arrays, so keep the numpy arrays alive for as long as
+        # the cell array lives.
+        global _array_cache
+        _array_cache.add(cells, (offsets, connectivity))
+    else:
+        n_cells, legacy = _offsets2legacy(offsets, connectivity)
+        vtk_arr = vtk.vtkIdTypeArray()
+        array2vtk(legacy, vtk_arr)
+        cells.SetCells(n_cells, vtk_arr)
+
+
+def array2vtkCellArray(num_array, vtk_array=None, offsets=None):
     """Given a nested Python list or a numpy array, this method
     creates a vtkCellArray instance and returns it.
 
     A variety of input arguments are supported as described in the
     Parameter documentation.  If numpy arrays are given, this method
     is highly efficient.  This function is most efficient if the
-    passed numpy arrays have a typecode `ID_TYPE_CODE`.  Otherwise a
-    typecast is necessary and this involves an extra copy.  This
-    method *always copies* the input data.
+    passed numpy arrays have an integer typecode of 32 or 64 bits.
+    Otherwise a typecast is necessary and this involves an extra copy.
 
-    An alternative and more efficient way to build the connectivity
-    list is to create a vtkIdTypeArray having data of the form
-    (npts,p0,p1,...p(npts-1), repeated for each cell) and then call
-    <vtkCellArray_instance>.SetCells(n_cell, id_list).
+    With VTK 9 and above the cells are set using the offsets and
+    connectivity arrays of the vtkCellArray.  In this case, when
+    `offsets` are passed or when a contiguous 2D integer array is
+    given, *no copy* of the connectivity data is made and a reference
+    to the arrays is cached.  With older versions of VTK this method
+    *always copies* the input data into the legacy
+    (npts,p0,p1,...p(npts-1), repeated for each cell) layout.
 
     Parameters
     ----------
@@ -453,8 +635,8 @@ def array2vtkCellArray(num_array, vtk_array=None):
       Valid values are:
 
         1. A Python list of 1D lists.  Each 1D list can contain one
-           cell connectivity list.  This is very slow and is to be
-           used only when efficiency is of no consequence.
+           cell connectivity list.  This is slower than using numpy
+           arrays but allows cells of different sizes.
 
         2. A 2D numpy array with the cell connectivity list.
 
@@ -462,12 +644,22 @@ def array2vtkCellArray(num_array, vtk_array=None):
            have a different shape.  This makes it easy to generate a
            cell array having cells of different kinds.
 
+        4. A 1D numpy array with the connectivity of all the cells
+           when `offsets` is also passed.
+
     - vtk_array : `vtkCellArray` (default: `None`)
 
       If an optional `vtkCellArray` instance, is passed as an argument
       then a new array is not created and returned.  The passed array
       is itself modified and returned.
 
+    - offsets : numpy array or Python list/tuple (default: `None`)
+
+      If given, `num_array` is treated as the flat connectivity array
+      and `offsets` as the `n_cells + 1` offsets into it, where the
+      ids of cell `i` are `num_array[offsets[i]:offsets[i+1]]`.  This
+      is the most efficient way to create cells of mixed sizes.
+
     Example
     -------
 
@@ -477,6 +669,8 @@ def array2vtkCellArray(num_array, vtk_array=None):
        >>> cells = array_handler.array2vtkCellArray(a)
        >>> l_a = [a[:,:1], a[:2,:2], a]
        >>> cells = array_handler.array2vtkCellArray(l_a)
+       >>> conn = numpy.arange(10)
+       >>> cells = array_handler.array2vtkCellArray(conn, offsets=[0, 1, 3, 6, 10])
 
     """
     if vtk_array:
@@ -486,20 +680,15 @@ def array2vtkCellArray(num_array, vtk_array=None):
     assert cells.GetClassName() == 'vtkCellArray', \
            'Second argument must be a `vtkCellArray` instance.'
 
+    if offsets is not None:
+        _set_cells_from_offsets(cells, offsets, num_array)
+        return cells
+
     if len(num_array) == 0:
         return cells
 
     ########################################
     # Internal functions.
-    def _slow_array2cells(z, cells):
-        cells.Reset()
-        vtk_ids = vtk.vtkIdList()
-        for i in z:
-            vtk_ids.Reset()
-            for j in i:
-                vtk_ids.InsertNextId(j)
-            cells.InsertNextCell(vtk_ids)
-
     def _get_tmp_array(arr):
         try:
             tmp_arr = numpy.asarray(arr, ID_TYPE_CODE)
@@ -511,6 +700,10 @@ def array2vtkCellArray(num_array, vtk_array=None):
         vtk_arr = vtk.vtkIdTypeArray()
         array2vtk(id_typ_arr, vtk_arr)
         cells.SetCells(n_cells, vtk_arr)
+
+    def _get_offsets(n_cells, cell_size, dtype, start=0):
+        return numpy.arange(start, start + n_cells*cell_size + 1,
+                            cell_size, dtype=dtype)
     ########################################
 
     msg = "Invalid argument.  Valid types are a Python list of lists,"\
@@ -520,7 +713,15 @@ def array2vtkCellArray(num_array, vtk_array=None):
         assert len(num_array[0]) > 0, "Input array must be 2D."
         tp = type(num_array[0])
         if issubclass(tp, list): # Pure Python list.
-            _slow_array2cells(num_array, cells)
+            # Build the offsets and connectivity in one pass each
+            # instead of inserting the ids one at a time.
+            sizes = numpy.fromiter((len(x) for x in num_array),
+                                   ID_TYPE_CODE, len(num_array))
+            offs = numpy.zeros((len(num_array) + 1,), ID_TYPE_CODE)
+            numpy.cumsum(sizes, out=offs[1:])
+            conn = numpy.fromiter(itertools.chain.from_iterable(num_array),
+                                  ID_TYPE_CODE, offs[-1])
+            _set_cells_from_offsets(cells, offs, conn)
             return cells
         elif issubclass(tp, numpy.ndarray):  # List of arrays.
             # Check shape of array and find total size.
@@ -531,6 +732,20 @@ def array2vtkCellArray(num_array, vtk_array=None):
                 shp = arr.shape
                 tot_size += shp[0]*(shp[1] + 1)
                 n_cells += shp[0]
+            if HAS_CELL_ARRAY_SET_DATA:
+                # Mixed cell sizes: concatenate the connectivity and
+                # compute the offsets of each block without
+                # interleaving the cell sizes.
+                conn = numpy.concatenate([numpy.ravel(_get_tmp_array(arr))
+                                          for arr in num_array])
+                offs = [numpy.zeros((1,), ID_TYPE_CODE)]
+                start = 0
+                for arr in num_array:
+                    n, size = arr.shape
+                    offs.append(_get_offsets(n, size, ID_TYPE_CODE, start)[1:])
+                    start += n*size
+                _set_cells_from_offsets(cells, numpy.concatenate(offs), conn)
+                return cells
             # Create an empty array.
             id_typ_arr = numpy.empty((tot_size,), ID_TYPE_CODE)
             # Now populate it with the ids.
@@ -548,6 +763,12 @@ def array2vtkCellArray(num_array, vtk_array=None):
             raise TypeError(msg)
     elif issubclass(type(num_array), numpy.ndarray):
         assert len(num_array.shape) == 2, "Input array must be 2D."
+        if HAS_CELL_ARRAY_SET_DATA:
+            conn = _get_id_array(num_array)
+            n_cells, size = num_array.shape
+            offs = _get_offsets(n_cells, size, conn.dtype)
+            _set_cells_from_offsets(cells, offs, conn)
+            return cells
         tmp_arr = _get_tmp_array(num_array)
         shp = tmp_arr.shape
         id_typ_arr = numpy.empty((shp[0]*(shp[1] + 1),), ID_TYPE_CODE)
@@ -615,12 +836,132 @@ def array2vtkIdList(num_array, vtk_idlist=None):
 
     arr = numpy.asarray(num_array)
     assert len(arr.shape) == 1, "Array for vtkIdList must be 1D"
-    ids.SetNumberOfIds(len(arr))
-    for i, j in enumerate(arr):
-        ids.SetId(i, j)
+    _set_id_list(ids, arr)
     return ids
 
 
+def vtkIdList2array(vtk_idlist):
+    """Returns a copy of the ids of a vtkIdList as a 1D numpy array."""
+    if numpy_support is None or not HAS_CELL_ARRAY_SET_DATA:
+        n = vtk_idlist.GetNumberOfIds()
+        return numpy.array([vtk_idlist.GetId(i) for i in range(n)],
+                           ID_TYPE_CODE)
+    # VTK copies the ids in bulk into the connectivity of a cell.
+    cells = vtk.vtkCellArray()
+    cells.InsertNextCell(vtk_idlist)
+    conn = numpy_support.vtk_to_numpy(cells.GetConnectivityArray())
+    return conn.astype(ID_TYPE_CODE)
+
+
+def extend_vtk_array(vtk_array, num_array):
+    """Appends the tuples of a numpy array/Python list to a VTK data
+    array.
+
+    The VTK array is resized once and the data is copied with a single
+    numpy assignment through the buffer interface of the VTK array.
+    If the buffer interface is not available, the tuples are inserted
+    one by one.
+
+    Parameters
+    ----------
+
+    - vtk_array : `vtkDataArray`
+
+      The array extended, it keeps its number of components.
+
+    - num_array : numpy array or Python list/tuple
+
+      The tuples to append, their total number of values must be a
+      multiple of the number of components of `vtk_array`.
+
+    """
+    nc = vtk_array.GetNumberOfComponents()
+    arr = numpy.asarray(num_array)
+    if arr.size % nc != 0:
+        raise ValueError('Cannot append %d values to an array with %d '
+                         'components.'%(arr.size, nc))
+    m = arr.size//nc
+    if m == 0:
+        return vtk_array
+    arr = arr.reshape((m, nc))
+    n = vtk_array.GetNumberOfTuples()
+    typ = vtk_array.GetDataType()
+
+    if numpy_support is None or typ == vtkConstants.VTK_BIT or \
+       typ not in get_vtk_to_numeric_typemap():
+        for i in range(m):
+            for x in range(nc):
+                vtk_array.InsertComponent(n + i, x, arr[i, x])
+        return vtk_array
+
+    # Resizing copies the data out of any cached numpy array, which is
+    # then not used by the VTK array anymore.  The cached array is only
+    # released after the copy since it may be the only reference to it.
+    vtk_array.SetNumberOfTuples(n + m)
+    if vtk_array in _array_cache:
+        _array_cache._remove_array(vtk_array.__this__)
+    result = numpy.frombuffer(vtk_array,
+                              dtype=get_numeric_array_type(typ))
+    result.shape = (n + m, nc)
+    result[n:] = arr
+    vtk_array.Modified()
+    return vtk_array
+
+
+def extend_vtk_id_list(vtk_idlist, num_array):
+    """Appends the ids in a numpy array/Python list to a vtkIdList,
+    copying them in bulk when possible."""
+    arr = numpy.asarray(num_array).ravel()
+    if len(arr) == 0:
+        return vtk_idlist
+    if numpy_support is None or not HAS_CELL_ARRAY_SET_DATA:
+        for i in arr:
+            vtk_idlist.InsertNextId(i)
+        return vtk_idlist
+    old = vtkIdList2array(vtk_idlist)
+    _set_id_list(vtk_idlist, numpy.concatenate((old, arr)))
+    return vtk_idlist
+
+
+def iter_tuples(num_array, chunk_size=4096):
+    """Iterates over the rows of a numpy array as tuples of floats, or
+    as floats if the array is 1D, converting them in chunks."""
+    n = len(num_array)
+    for start in range(0, n, chunk_size):
+        values = num_array[start:start + chunk_size].astype(float).tolist()
+        if num_array.ndim == 1:
+            for x in values:
+                yield x
+        else:
+            for x in values:
+                yield tuple(x)
+
+
+def is_array_key(key):
+    """Returns True if `key` is a slice, a sequence or an array which
+    indexes the tuples of an array in bulk rather than a single one."""
+    if isinstance(key, (slice, list, tuple)):
+        return True
+    return isinstance(key, numpy.ndarray) and key.ndim > 0
+
+
+def _set_id_list(vtk_idlist, arr):
+    """Sets the ids of `vtk_idlist` to those of the 1D array `arr`.
+
+    With VTK >= 9 the ids are set as the connectivity of a single cell
+    and copied in bulk by `vtkCellArray.GetCellAtId`, otherwise they
+    are set one by one.
+    """
+    if not HAS_CELL_ARRAY_SET_DATA:
+        vtk_idlist.SetNumberOfIds(len(arr))
+        for i, j in enumerate(arr):
+            vtk_idlist.SetId(i, j)
+        return
+    cells = vtk.vtkCellArray()
+    _set_cells_from_offsets(cells, [0, len(arr)], arr)
+    cells.GetCellAtId(0, vtk_idlist)
+
+
 ######################################################################
 # Array argument handling functions.
 ######################################################################
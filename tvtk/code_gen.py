@@ -17,21 +17,79 @@ import glob
 import logging
 from optparse import OptionParser
 import sys
+import collections
+import compileall
+from contextlib import contextmanager
+import hashlib
+import multiprocessing
+import pickle
+import time
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
 
 # Local imports -- these should be relative imports since these are
 # imported before the package is installed.
 try:
     from .common import get_tvtk_name, camel2enthought
-    from .wrapper_gen import WrapperGenerator
+    from .wrapper_gen import WrapperGenerator, PROPERTY_DELEGATES
     from .special_gen import HelperGenerator
 except SystemError:
     from common import get_tvtk_name, camel2enthought
-    from wrapper_gen import WrapperGenerator
+    from wrapper_gen import WrapperGenerator, PROPERTY_DELEGATES
     from special_gen import HelperGenerator
 
 
 logger = logging.getLogger(__name__)
 
+# The modules whose code determines the generated wrappers.  A change in
+# any of them invalidates the cached classes.
+_GENERATOR_MODULES = ('code_gen.py', 'wrapper_gen.py', 'special_gen.py',
+                      'indenter.py', 'vtk_parser.py', 'class_tree.py',
+                      'common.py')
+
+# The wrapper generator used by the worker processes.
+_worker_state = {}
+
+
+######################################################################
+# Worker functions.
+######################################################################
+
+def _init_worker():
+    """Creates the wrapper generator of a worker process, unless it was
+    inherited from the parent process.
+    """
+    if 'wrap_gen' not in _worker_state:
+        _worker_state['wrap_gen'] = WrapperGenerator()
+
+
+def _generate_class(job, wrap_gen=None):
+    """Given the name of a VTK class, the data of its parent node and
+    the data of the other nodes its code depends on, by class name,
+    return the wrapper code and the data of the class node.  The
+    wrapper generator of the worker process is used if `wrap_gen` is
+    None.
+    """
+    name, parent_data, other_data = job
+    if wrap_gen is None:
+        wrap_gen = _worker_state['wrap_gen']
+    tree = wrap_gen.get_tree()
+    node = tree.get_node(name)
+    if parent_data is not None:
+        node.parents[0].data = parent_data
+    for other_name, data in other_data.items():
+        tree.get_node(other_name).data = data
+    out = StringIO()
+    wrap_gen.generate_code(node, out)
+    return out.getvalue(), node.data
+
+
 ######################################################################
 # `TVTKGenerator`
 ######################################################################
@@ -40,7 +98,7 @@ logger = logging.getLogger(__name__)
 class TVTKGenerator:
     """Generates all the TVTK code."""
 
-    def __init__(self, out_dir=''):
+    def __init__(self, out_dir='', cache_dir=None):
         """Initializes the instance.
 
         Parameters
@@ -55,6 +113,13 @@ class TVTKGenerator:
           overwritten.  If no out_dir is specified, a temporary one is
           created using `tempfile.mkdtemp`.
 
+        - cache_dir -  `string`
+
+          The directory in which the generated code of each class is
+          cached.  Only the classes whose VTK methods, parents or
+          generator code changed since they were cached are
+          generated again.  No cache is used if None.
+
         """
         if not out_dir:
             out_dir = tempfile.mkdtemp()
@@ -64,15 +129,44 @@ class TVTKGenerator:
             os.makedirs(self.out_dir)
         self.zip_name = 'tvtk_classes.zip'
 
-        self.wrap_gen = WrapperGenerator()
+        self.cache_dir = cache_dir
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        # The time taken by each phase, in seconds.
+        self.timings = collections.OrderedDict()
+        # The number of classes generated and read from the cache.
+        self.n_generated = 0
+        self.n_cached = 0
+        # The cache keys of the classes.
+        self._class_keys = {}
+
+        with self._timed('class tree'):
+            self.wrap_gen = WrapperGenerator()
         self.helper_gen = HelperGenerator()
 
     #################################################################
     # `TVTKGenerator` interface.
     #################################################################
 
-    def generate_code(self):
+    def generate_code(self, n_workers=None, names=None):
         """Generate all the wrapper code in `self.out_dir`.
+
+        Parameters
+        ----------
+
+        - n_workers -  `int`
+
+          The number of processes the classes are parsed and generated
+          in, the number of CPUs if None.  The classes of one level of
+          the class tree are generated in parallel, since the code of a
+          class depends on the data of its parent.
+
+        - names -  `list`
+
+          The names of the VTK classes to generate, with the classes
+          they depend on.  All the classes are generated if None.
+
         """
         out_dir = self.out_dir
         helper_gen = self.helper_gen
@@ -99,69 +193,55 @@ class TVTKGenerator:
             # Write the wrapper files.
             tree = wrap_gen.get_tree().tree
 
-            classes = []
-            for node in wrap_gen.get_tree():
-                name = node.name
-                # This is another class we should not wrap and exists
-                # in version 8.1.0.
-                ignore = ['vtkOpenGLGL2PSHelperImpl']
-                if name in ignore:
-                    continue
-                if not name.startswith('vtk') or name.startswith('vtkQt'):
-                    continue
-                if not hasattr(vtk, name) or not hasattr(getattr(vtk, name), 'IsA'):  # noqa
-                    # We need to wrap VTK classes that are derived
-                    # from vtkObjectBase, the others are
-                    # straightforward VTK classes that can be used as
-                    # such.  All of these have an 'IsA' method so we
-                    # check for that.  Only the vtkObjectBase
-                    # subclasses support observers etc. and hence only
-                    # those make sense to wrap into TVTK.
-                    continue
-                classes.append(name)
-
-            for nodes in tree:
-                for node in nodes:
-                    if node.name in classes:
-                        tvtk_name = get_tvtk_name(node.name)
-                        logger.debug(
-                            'Wrapping %s as %s' % (node.name, tvtk_name))
-                        self._write_wrapper_class(node, tvtk_name)
-                        helper_gen.add_class(tvtk_name, helper_file)
-
-    def write_wrapper_classes(self, names):
+            with self._timed('class list'):
+                classes = set(self._get_class_names())
+                if names is not None:
+                    classes &= self._get_required_names(names)
+
+            if n_workers is None:
+                n_workers = multiprocessing.cpu_count()
+            pool = None
+            if n_workers > 1 and ProcessPoolExecutor is not None:
+                # Forked workers inherit the wrapper generator.
+                _worker_state['wrap_gen'] = wrap_gen
+                pool = ProcessPoolExecutor(n_workers,
+                                           initializer=_init_worker)
+            try:
+                for nodes in tree:
+                    nodes = [node for node in nodes if node.name in classes]
+                    codes = self._generate_classes(nodes, pool)
+                    with self._timed('write'):
+                        for node in nodes:
+                            tvtk_name = get_tvtk_name(node.name)
+                            logger.debug(
+                                'Wrapping %s as %s' % (node.name, tvtk_name))
+                            self._write_code(tvtk_name, codes[node.name])
+                            helper_gen.add_class(tvtk_name, helper_file)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+                    _worker_state.clear()
+
+        logger.info('%d classes generated, %d read from the cache.',
+                    self.n_generated, self.n_cached)
+
+    def write_wrapper_classes(self, names, n_workers=None):
         """Given VTK class names in the list `names`, write out the
         wrapper classes to a suitable file.  This is a convenience
         method so one can generate a just a few of the wrapper classes
         if desired.  This is useful when debugging.  Please note that
         the method also generates code for all the ancestors of the
-        specified classes.
+        specified classes and for the classes their code depends on,
+        see `generate_code`.
 
         """
-        # Wrappers for the accesors are generated in order to get the
-        # _updateable_traits_ information correctly.
-        nodes = []
+        tree = self.wrap_gen.get_tree()
         for name in names:
-            node = self.wrap_gen.get_tree().get_node(name)
-            if node is None:
+            if tree.get_node(name) is None:
                 print('ERROR: Cannot find class: %s' % name)
-            nodes.append(node)
-
-        # Get ancestors.
-        for node in nodes[:]:
-            anc = node.get_ancestors()
-            for i in anc:
-                if i not in nodes:
-                    nodes.insert(0, i)
-        # Sort them as per their level.
-        nodes.sort(key=lambda x: x.level)
-
-        # Write code.
-        for node in nodes:
-            tvtk_name = get_tvtk_name(node.name)
-            self._write_wrapper_class(node, tvtk_name)
-
-    def build_zip(self, include_src=False):
+        self.generate_code(n_workers, names)
+
+    def build_zip(self, include_src=False, n_workers=None):
         """Build the zip file (with name `self.zip_name`) in the
         current directory.
 
@@ -171,7 +251,29 @@ class TVTKGenerator:
           If True, also includes all the ``*.py`` files in the ZIP file.
           By default only the ``*.pyc`` files are included.
 
+        n_workers : `int` (default: None)
+          The number of processes the files are compiled in, the
+          number of CPUs if None.  Only the files changed since they
+          were last compiled are compiled.
+
         """
+        with self._timed('compile'):
+            if sys.version_info[:2] >= (3, 5):
+                compileall.compile_dir(self.out_dir, quiet=1,
+                                       workers=n_workers or 0)
+            else:
+                compileall.compile_dir(self.out_dir, quiet=1)
+        with self._timed('zip'):
+            self._build_zip(include_src)
+
+    def print_timings(self):
+        """Print the time taken by each phase of the code generation."""
+        for phase, elapsed in self.timings.items():
+            print('%-12s %8.2f s' % (phase, elapsed))
+        print('%d classes generated, %d read from the cache.' %
+              (self.n_generated, self.n_cached))
+
+    def _build_zip(self, include_src):
         cwd = os.getcwd()
         d = os.path.dirname(self.out_dir)
         os.chdir(d)
@@ -207,17 +309,185 @@ class TVTKGenerator:
     #################################################################
     # Non-public interface.
     #################################################################
-    def _write_wrapper_class(self, node, tvtk_name):
-        """Write the wrapper code to a file."""
-        # The only reason this method is separate is to generate code
-        # for an individual class when debugging.
-        fname = camel2enthought(tvtk_name) + '.py'
-        if sys.version_info[0] > 2:
-            out = open(os.path.join(self.out_dir, fname), 'w', encoding='utf-8')
+    @contextmanager
+    def _timed(self, phase):
+        """Adds the time taken by the body to that of the phase."""
+        t0 = time.time()
+        yield
+        elapsed = time.time() - t0
+        self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+        logger.info('%s: %.2f s', phase, elapsed)
+
+    def _get_class_names(self):
+        """Returns the names of the VTK classes to wrap."""
+        classes = []
+        for node in self.wrap_gen.get_tree():
+            name = node.name
+            # This is another class we should not wrap and exists
+            # in version 8.1.0.
+            ignore = ['vtkOpenGLGL2PSHelperImpl']
+            if name in ignore:
+                continue
+            if not name.startswith('vtk') or name.startswith('vtkQt'):
+                continue
+            if not hasattr(vtk, name) or not hasattr(getattr(vtk, name), 'IsA'):  # noqa
+                # We need to wrap VTK classes that are derived
+                # from vtkObjectBase, the others are
+                # straightforward VTK classes that can be used as
+                # such.  All of these have an 'IsA' method so we
+                # check for that.  Only the vtkObjectBase
+                # subclasses support observers etc. and hence only
+                # those make sense to wrap into TVTK.
+                continue
+            classes.append(name)
+        return classes
+
+    def _generate_classes(self, nodes, pool):
+        """Generate the code of the given nodes, all at the same level
+        of the class tree, reading it from the cache where possible.
+        Returns a dictionary mapping the class names to their code.
+        """
+        codes = {}
+        jobs = []
+        with self._timed('cache'):
+            for node in nodes:
+                key = self._get_class_key(node)
+                cached = self._read_cache(node.name, key)
+                if cached is None:
+                    parent_data = None
+                    if node.level != 0 and node.parents[0].name != 'object':
+                        parent_data = getattr(node.parents[0], 'data', None)
+                    other_data = dict(
+                        (n.name, n.data) for n in self._get_dependencies(node)
+                    )
+                    jobs.append((node, (node.name, parent_data, other_data)))
+                else:
+                    codes[node.name], node.data = cached
+        self.n_cached += len(nodes) - len(jobs)
+        self.n_generated += len(jobs)
+
+        with self._timed('generate'):
+            args = [arg for node, arg in jobs]
+            if pool is None:
+                results = [_generate_class(arg, self.wrap_gen)
+                           for arg in args]
+            else:
+                # A worker crashing on a class raises BrokenProcessPool
+                # instead of hanging.
+                results = list(pool.map(_generate_class, args,
+                                        chunksize=8))
+            for (node, arg), (code, data) in zip(jobs, results):
+                node.data = data
+                codes[node.name] = code
+                self._write_cache(node.name, code, data)
+        return codes
+
+    def _get_generator_key(self):
+        """Returns a hash of the VTK and Python versions and of the code
+        of the generator.
+        """
+        h = hashlib.sha1()
+        v = vtk.vtkVersion()
+        h.update(v.GetVTKSourceVersion().encode('utf-8'))
+        h.update(sys.version.encode('utf-8'))
+        d = os.path.dirname(os.path.abspath(__file__))
+        for name in _GENERATOR_MODULES:
+            with open(os.path.join(d, name), 'rb') as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    def _get_class_key(self, node):
+        """Returns the cache key of the class of the given node, a hash
+        of its methods and their signatures, of the key of its parent
+        and of the generator.
+        """
+        if not self.cache_dir:
+            return None
+        h = hashlib.sha1()
+        if node.level != 0 and node.parents[0].name != 'object':
+            parent_key = self._class_keys.get(node.parents[0].name, '')
         else:
-            out = open(os.path.join(self.out_dir, fname), 'w')
-        self.wrap_gen.generate_code(node, out)
-        out.close()
+            parent_key = self._class_keys.get(None)
+            if parent_key is None:
+                parent_key = self._class_keys[None] = \
+                    self._get_generator_key()
+        h.update(parent_key.encode('ascii'))
+        for other in self._get_dependencies(node):
+            h.update(self._class_keys[other.name].encode('ascii'))
+        klass = node.klass
+        for name in sorted(dir(klass)):
+            doc = getattr(getattr(klass, name, None), '__doc__', None)
+            h.update(('%s\n%s\n' % (name, doc)).encode('utf-8'))
+        key = h.hexdigest()
+        self._class_keys[node.name] = key
+        return key
+
+    def _get_required_names(self, names):
+        """Returns the names of the given classes and of all the classes
+        their code depends on.
+        """
+        tree = self.wrap_gen.get_tree()
+        result = set()
+        todo = list(names)
+        while todo:
+            node = tree.get_node(todo.pop())
+            if node is None or node.name in result:
+                continue
+            for other in node.get_ancestors() + [node]:
+                result.add(other.name)
+                todo.extend(n.name for n in self._get_dependencies(other))
+        return result
+
+    def _get_dependencies(self, node):
+        """Returns the nodes, other than its parent, whose data the code
+        of the class of the given node depends on.  These are at a lower
+        level of the class tree so they are generated before it.
+        """
+        name = PROPERTY_DELEGATES.get(node.name)
+        if name is None:
+            return []
+        return [self.wrap_gen.get_tree().get_node(name)]
+
+    def _read_cache(self, name, key):
+        """Returns the cached code and node data of the named class if
+        its key matches `key`, else None.
+        """
+        if key is None:
+            return None
+        fname = os.path.join(self.cache_dir, name + '.pkl')
+        if not os.path.exists(fname):
+            return None
+        try:
+            with open(fname, 'rb') as f:
+                cached_key, code, data = pickle.load(f)
+        except Exception:
+            logger.warning('Ignoring the invalid cache file %s', fname)
+            return None
+        if cached_key != key:
+            return None
+        return code, data
+
+    def _write_cache(self, name, code, data):
+        """Caches the code and node data of the named class."""
+        key = self._class_keys.get(name)
+        if key is None:
+            return
+        fname = os.path.join(self.cache_dir, name + '.pkl')
+        with open(fname, 'wb') as f:
+            pickle.dump((key, code, data), f, pickle.HIGHEST_PROTOCOL)
+
+    def _write_code(self, tvtk_name, code):
+        """Write the code of a wrapper class to its file, unless the file
+        already has this code, so unchanged files are not compiled
+        again.
+        """
+        fname = os.path.join(self.out_dir, camel2enthought(tvtk_name) + '.py')
+        if os.path.exists(fname):
+            with open(fname, 'rb') as f:
+                if f.read() == code.encode('utf-8'):
+                    return
+        with open(fname, 'wb') as f:
+            f.write(code.encode('utf-8'))
 
 
 ######################################################################
@@ -249,6 +519,16 @@ code will be generated for all the VTK classes.
         dest="src", default=False,
         help="Include source files (*.py) in "
              "addition to *.pyc files in the ZIP file.")
+    parser.add_option(
+        "-j", "--jobs", action="store",
+        type="int", dest="jobs", default=None,
+        help="Number of processes to generate the code in "
+             "(default: the number of CPUs).")
+    parser.add_option(
+        "-c", "--cache-dir", action="store",
+        type="string", dest="cache_dir", default=None,
+        help="Directory in which the generated classes are cached, "
+             "only the classes that changed are generated again.")
     parser.add_option(
         "-v", "--verbose", action="store_true",
         dest="verbose", default=False,
@@ -268,15 +548,17 @@ code will be generated for all the VTK classes.
         logger.addHandler(ch)
 
     # Now do stuff.
-    gen = TVTKGenerator(options.out_dir)
+    gen = TVTKGenerator(options.out_dir, options.cache_dir)
 
     if len(args) == 0:
-        gen.generate_code()
+        gen.generate_code(options.jobs)
     else:
-        gen.write_wrapper_classes(args)
+        gen.write_wrapper_classes(args, options.jobs)
 
     if options.zip:
-        gen.build_zip(options.src)
+        gen.build_zip(options.src, options.jobs)
+
+    gen.print_timings()
 
     if options.clean:
         gen.clean()
@@ -8,10 +8,14 @@ import os
 import string
 import sys
 import re
-import vtk
-
-vtk_major_version = vtk.vtkVersion.GetVTKMajorVersion()
-vtk_minor_version = vtk.vtkVersion.GetVTKMinorVersion()
+# Only the VTK core module is needed, importing all of VTK is slow.
+try:
+    from vtkmodules.vtkCommonCore import vtkVersion
+except ImportError:
+    from vtk import vtkVersion
+
+vtk_major_version = vtkVersion.GetVTKMajorVersion()
+vtk_minor_version = vtkVersion.GetVTKMinorVersion()
 
 ######################################################################
 # Utility functions.
@@ -11,6 +11,15 @@ reference counting problem since weak references are used.
 The main functionality of this module is provided by three functions,
 `connect`, `disconnect` and `send`.
 
+The callbacks of each event of a source are collected in a tuple the
+first time the event is sent, and the tuple is reused until a
+connection of that source changes, so `send` does little work for the
+frequent VTK events.  Dead method callbacks are removed by weak
+reference callbacks as soon as their instance is collected.  The
+number of events sent by each source may be counted to find the
+sources that flood the messenger with events, see
+`Messenger.set_event_counting`.
+
 Here is example usage with VTK::
 
     >>> import messenger, vtk
@@ -51,10 +60,12 @@ shows how disconnection works.
 # License: BSD Style.
 
 __all__ = ['Messenger', 'MessengerError',
-           'connect', 'disconnect', 'send']
+           'connect', 'disconnect', 'send', 'set_event_counting',
+           'get_event_rates']
 
 import types
 import sys
+import time
 import weakref
 
 
@@ -112,6 +123,14 @@ class Messenger:
             # First instantiation.
             self._signals = {}
             self._catch_all = ['AnyEvent', 'all']
+        if not hasattr(self, '_dispatch'):
+            # The callbacks of each source and event, built on demand:
+            # {source hash: {event: ((obj ref, name), ...)}}.
+            self._dispatch = {}
+            # {source hash: [number of events, source name]} or None if
+            # the events are not counted.
+            self._event_counts = None
+            self._count_start = 0.0
 
     #################################################################
     # 'Messenger' interface.
@@ -158,7 +177,8 @@ class Messenger:
         if typ is types.FunctionType:
             slots[callback_key] = (None, callback)
         elif typ is types.MethodType:
-            obj = weakref.ref(callback.__self__)
+            obj = weakref.ref(callback.__self__,
+                              self._make_cleanup(key, event, callback_key))
             name = callback.__name__
             slots[callback_key] = (obj, name)
         else:
@@ -166,6 +186,7 @@ class Messenger:
                 "Callback must be a function or method. "\
                 "You passed a %s."%(str(callback))
             )
+        self._dispatch.pop(key, None)
 
     def disconnect(self, obj, event=None, callback=None, obj_is_hash=False):
         """Disconnects the object and its event handlers.
@@ -203,6 +224,7 @@ class Messenger:
             key = hash(obj)
         if not key in signals:
             return
+        self._dispatch.pop(key, None)
         if callback is None:
             if event is None:
                 del signals[key]
@@ -232,27 +254,31 @@ class Messenger:
           or 'all', then any event will invoke these.
 
         """
-        try:
-            sigs = self._get_signals(source)
-        except (MessengerError, KeyError):
-            return
-        events = self._catch_all[:]
-        if event not in events:
-            events.append(event)
-        for evt in events:
-            if evt in sigs:
-                slots = sigs[evt]
-                for key in list(slots.keys()):
-                    obj, meth = slots[key]
-                    if obj: # instance method
-                        inst = obj()
-                        if inst:
-                            getattr(inst, meth)(source, event, *args, **kw_args)
-                        else:
-                            # Oops, dead reference.
-                            del slots[key]
-                    else: # normal function
-                        meth(source, event, *args, **kw_args)
+        key = hash(source)
+        dispatch = self._dispatch.get(key)
+        if dispatch is None:
+            if key not in self._signals:
+                return
+            dispatch = self._dispatch[key] = {}
+        callbacks = dispatch.get(event)
+        if callbacks is None:
+            callbacks = dispatch[event] = self._get_callbacks(key, event)
+
+        counts = self._event_counts
+        if counts is not None:
+            count = counts.get(key)
+            if count is None:
+                counts[key] = [1, source.__class__.__name__]
+            else:
+                count[0] += 1
+
+        for obj, meth in callbacks:
+            if obj is None: # normal function
+                meth(source, event, *args, **kw_args)
+            else: # instance method
+                inst = obj()
+                if inst is not None:
+                    getattr(inst, meth)(source, event, *args, **kw_args)
 
     def is_registered(self, obj):
         """Returns if the given object has registered itself with the
@@ -273,10 +299,69 @@ class Messenger:
         """
         return list(self._get_signals(obj).keys())
 
+    def set_event_counting(self, enabled=True):
+        """Start or stop counting the events sent by each source.
+        Starting resets the counts.  The events are not counted by
+        default.
+
+        """
+        if enabled:
+            self._event_counts = {}
+            self._count_start = time.time()
+        else:
+            self._event_counts = None
+
+    def get_event_rates(self):
+        """Returns the events sent by each source since the counting
+        was started, as a list of `(rate, count, name, key)` tuples
+        sorted with the busiest source first.  `rate` is the number of
+        events per second, `name` the class name of the source and
+        `key` its hash, as used by `disconnect`.
+
+        """
+        counts = self._event_counts
+        if counts is None:
+            return []
+        elapsed = max(time.time() - self._count_start, 1e-9)
+        rates = [(count/elapsed, count, name, key)
+                 for key, (count, name) in list(counts.items())]
+        rates.sort(key=lambda x: x[0], reverse=True)
+        return rates
+
     #################################################################
     # Non-public interface.
     #################################################################
 
+    def _get_callbacks(self, key, event):
+        """Returns a tuple of the slots of the source with hash `key`
+        that handle `event`, the catch all slots first.
+
+        """
+        sigs = self._signals[key]
+        events = self._catch_all[:]
+        if event not in events:
+            events.append(event)
+        callbacks = []
+        for evt in events:
+            if evt in sigs:
+                callbacks.extend(sigs[evt].values())
+        return tuple(callbacks)
+
+    def _make_cleanup(self, key, event, callback_key):
+        """Returns a weak reference callback removing the slot of a
+        method whose instance has been garbage collected.
+
+        """
+        def _cleanup(ref):
+            slots = self._signals.get(key, {}).get(event)
+            if slots is not None:
+                slot = slots.get(callback_key)
+                if slot is not None and slot[0] is ref:
+                    del slots[callback_key]
+                    self._dispatch.pop(key, None)
+        return _cleanup
+
+
     def _get_signals(self, obj):
         """Given an object `obj` it returns the signals of that
         object.
@@ -303,11 +388,19 @@ def connect(obj, event, callback):
 connect.__doc__ = _messenger.connect.__doc__
 
 def disconnect(obj, event=None, callback=None, obj_is_hash=False):
-    _messenger.disconnect(obj, event, callback)
+    _messenger.disconnect(obj, event, callback, obj_is_hash)
 disconnect.__doc__ = _messenger.disconnect.__doc__
 
-def send(obj, event, *args, **kw_args):
-    _messenger.send(obj, event, *args, **kw_args)
-send.__doc__ = _messenger.send.__doc__
+# `send` is called for every VTK event observed, so it is the bound
+# method itself rather than a function calling it.
+send = _messenger.send
+
+def set_event_counting(enabled=True):
+    _messenger.set_event_counting(enabled)
+set_event_counting.__doc__ = _messenger.set_event_counting.__doc__
+
+def get_event_rates():
+    return _messenger.get_event_rates()
+get_event_rates.__doc__ = _messenger.get_event_rates.__doc__
 
 del _saved
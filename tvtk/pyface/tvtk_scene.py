@@ -15,6 +15,7 @@ from __future__ import print_function
 
 import os
 import os.path
+import time
 
 from apptools.persistence import state_pickler
 from tvtk.api import tvtk
@@ -23,7 +24,7 @@ from tvtk.tvtk_base import vtk_color_trait
 from tvtk.common import configure_input
 
 from traits.api import HasPrivateTraits, HasTraits, Any, Int, \
-     Property, Instance, Event, Range, Bool, Trait, Str
+     Property, Instance, Event, Range, Bool, Trait, Str, Float, List
 
 from tvtk.pyface import light_manager
 
@@ -64,6 +65,15 @@ class TVTKScene(HasPrivateTraits):
 
     - One can disable rendering by setting `disable_render` to True.
 
+    - Setting `coalesce_renders` to True merges the calls to `render`
+      into at most one render per iteration of the event loop, or per
+      `render_interval`.  `flush_render` renders a pending request at
+      once and `render_stats` counts the renders requested and done.
+
+    - Setting `lod_interaction` to True sets `interacting` while the
+      user interacts with the scene, so that objects may render lighter
+      proxies of their data then, aiming at `lod_frame_rate`.
+
     """
 
     # The version of this class.  Used for persistence.
@@ -100,6 +110,36 @@ class TVTKScene(HasPrivateTraits):
     # Disable rendering.
     disable_render = Bool(False, desc='if rendering is to be disabled')
 
+    # Defer the renders requested by `render` to the event loop, so
+    # that many requests made in a row give a single render.  Scenes
+    # without an event loop always render at once.
+    coalesce_renders = Bool(False, desc='if render requests are coalesced')
+
+    # The minimum time between two coalesced renders, in seconds.
+    render_interval = Range(0.0, 10.0, 0.0,
+                            desc='the minimum time between coalesced renders')
+
+    # Render level-of-detail proxies of the large datasets while the
+    # user interacts with the scene, and the full data otherwise.
+    lod_interaction = Bool(False, desc='if lighter proxies of the data '
+                                       'are rendered while interacting')
+
+    # The frame rate aimed at while interacting.  This is the desired
+    # update rate of the interactor, which VTK's own level-of-detail
+    # objects (e.g. volume mappers) adapt to.
+    lod_frame_rate = Range(1.0, 120.0, 15.0,
+                           desc='the frame rate aimed at while interacting')
+
+    # The maximum number of points of the proxies rendered while
+    # interacting.  Objects with fewer points are rendered as is.
+    lod_max_points = Range(1000, 100000000, 200000,
+                           desc='the maximum number of points rendered '
+                                'while interacting')
+
+    # True while the user interacts with the scene in the
+    # `lod_interaction` mode.
+    interacting = Bool(False)
+
     # Enable off-screen rendering.  This allows a user to render the
     # scene to an image without the need to have the window active.
     # For example, the application can be minimized and the saved
@@ -208,6 +248,17 @@ class TVTKScene(HasPrivateTraits):
     _camera = Instance(tvtk.Camera)
     _busy_count = Int(0)
 
+    # True when a coalesced render is scheduled.
+    _render_pending = Bool(False)
+    _last_render_time = Float(0.0)
+
+    # The number of renders requested and done, see `render_stats`.
+    _renders_requested = Int(0)
+    _renders_done = Int(0)
+
+    # The ids of the interactor observers of the `lod_interaction` mode.
+    _lod_observer_ids = List
+
     ###########################################################################
     # 'object' interface.
     ###########################################################################
@@ -221,6 +272,7 @@ class TVTKScene(HasPrivateTraits):
         self._def_pos = 1
         self.control = self._create_control(parent)
         self._renwin.update_traits()
+        self._setup_lod_observers()
 
     def __get_pure_state__(self):
         """Allows us to pickle the scene."""
@@ -231,7 +283,10 @@ class TVTKScene(HasPrivateTraits):
                   '_busy_count', '__sync_trait__', 'recorder',
                   '_last_camera_state', '_camera_observer_id',
                   '_saved_light_manager_state',
-                  '_script_id', '__traits_listener__']:
+                  '_script_id', '__traits_listener__',
+                  '_render_pending', '_last_render_time',
+                  '_renders_requested', '_renders_done',
+                  '_lod_observer_ids', 'interacting']:
             d.pop(x, None)
         # Additionally pickle these.
         d['camera'] = self.camera
@@ -261,9 +316,40 @@ class TVTKScene(HasPrivateTraits):
     ###########################################################################
     def render(self):
         """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._renwin.render()
+        `disable_render` trait is set to True.  If `coalesce_renders` is
+        True the render is done later by the event loop, along with any
+        other render requested in the mean time."""
+        if self.disable_render:
+            return
+        self._renders_requested += 1
+        if self.coalesce_renders:
+            if self._render_pending:
+                return
+            delay = self._last_render_time + self.render_interval - \
+                    time.time()
+            if self._schedule_render(max(delay, 0.0)):
+                self._render_pending = True
+                return
+        self._render_now()
+
+    def flush_render(self):
+        """ Do the coalesced render pending, if any, right away."""
+        if self._render_pending:
+            self._render_pending = False
+            if not self.disable_render and self._renwin is not None:
+                self._render_now()
+
+    def render_stats(self):
+        """ Return a dictionary with the number of renders `requested`
+        through `render` and the number actually `done` since the
+        scene was created or `reset_render_stats` was called."""
+        return dict(requested=self._renders_requested,
+                    done=self._renders_done)
+
+    def reset_render_stats(self):
+        """ Reset the counts returned by `render_stats`."""
+        self._renders_requested = 0
+        self._renders_done = 0
 
     def add_actors(self, actors):
         """ Adds a single actor or a tuple or list of actors to the
@@ -337,6 +423,8 @@ class TVTKScene(HasPrivateTraits):
         self.closing = True
         # Disable any renders through traits listner callbacks.
         self.disable_render = True
+        # Remove the interactor observers.
+        self.lod_interaction = False
         # Remove sync trait listeners.
         self.sync_trait('background', self._renderer, remove=True)
         self.sync_trait('parallel_projection', self.camera, remove=True)
@@ -831,6 +919,56 @@ class TVTKScene(HasPrivateTraits):
 
         return self._interactor
 
+    def _render_now(self):
+        """Render the scene and count it."""
+        self._renders_done += 1
+        self._last_render_time = time.time()
+        self._do_render()
+
+    def _do_render(self):
+        """Render the window.  Toolkit specific scenes render their
+        control."""
+        self._renwin.render()
+
+    def _schedule_render(self, delay):
+        """Arrange for `flush_render` to be called by the event loop in
+        `delay` seconds.  Returns False if this is not possible, in
+        which case the scene is rendered at once.  There is no event
+        loop here, toolkit specific scenes override this."""
+        return False
+
+    def _lod_interaction_changed(self):
+        self._setup_lod_observers()
+
+    def _lod_frame_rate_changed(self, value):
+        if self.lod_interaction and self._interactor is not None:
+            self._interactor.desired_update_rate = value
+
+    def _setup_lod_observers(self):
+        """Observe the start and end of the interactions in the
+        `lod_interaction` mode, stop otherwise."""
+        iren = self._interactor
+        if iren is None:
+            return
+        ids = self._lod_observer_ids
+        if self.lod_interaction and len(ids) == 0:
+            iren.desired_update_rate = self.lod_frame_rate
+            ids.append(iren.add_observer('StartInteractionEvent',
+                                         self._start_interaction))
+            ids.append(iren.add_observer('EndInteractionEvent',
+                                         self._end_interaction))
+        elif not self.lod_interaction and len(ids) > 0:
+            for ob_id in ids:
+                iren.remove_observer(ob_id)
+            del ids[:]
+            self.interacting = False
+
+    def _start_interaction(self, vtk_obj, event):
+        self.interacting = True
+
+    def _end_interaction(self, vtk_obj, event):
+        self.interacting = False
+
     def _get_window_to_image(self):
         w2if = tvtk.WindowToImageFilter(
             read_front_buffer=not self.off_screen_rendering
@@ -341,12 +341,6 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # 'Scene' interface.
     ###########################################################################
-    def render(self):
-        """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._vtk_control.Render()
-
     def get_size(self):
         """Return size of the render window."""
         sz = self._vtk_control.size()
@@ -389,6 +383,15 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # Non-public interface.
     ###########################################################################
+    def _do_render(self):
+        """Render the scene through the control."""
+        self._vtk_control.Render()
+
+    def _schedule_render(self, delay):
+        """Render from the Qt event loop after `delay` seconds."""
+        QtCore.QTimer.singleShot(int(delay*1000), self.flush_render)
+        return True
+
     def _create_control(self, parent):
         """ Create the toolkit-specific control that represents the widget. """
 
@@ -300,12 +300,6 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # 'Scene' interface.
     ###########################################################################
-    def render(self):
-        """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._vtk_control.Render()
-
     def get_size(self):
         """Return size of the render window."""
         return self._vtk_control.GetSize()
@@ -561,6 +555,18 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # Non-public interface.
     ###########################################################################
+    def _do_render(self):
+        """Render the scene through the control."""
+        self._vtk_control.Render()
+
+    def _schedule_render(self, delay):
+        """Render from the wx event loop after `delay` seconds."""
+        if delay > 0:
+            wx.CallLater(int(delay*1000), self.flush_render)
+        else:
+            wx.CallAfter(self.flush_render)
+        return True
+
     def _create_control(self, parent):
         """ Create the toolkit-specific control that represents the widget. """
 
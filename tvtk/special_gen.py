@@ -209,16 +209,7 @@ class SpecialGenerator:
             return self._vtk_obj.GetNumberOfTuples()
 
         def __iter__(self):
-            obj = self._vtk_obj
-            n = obj.GetNumberOfTuples()
-            nc = obj.GetNumberOfComponents()
-            if nc in [1,2,3,4,9]:
-                meth = getattr(obj, 'GetTuple%d'%nc)
-                for i in range(n):
-                    yield meth(i)
-            else:
-                for i in range(n):
-                    yield tuple([obj.GetComponent(i, x) for x in range(nc)])
+            return array_handler.iter_tuples(self.to_array())
 
         def _check_key(self, key, n):
             if type(key) not in [int, long]:
@@ -230,6 +221,9 @@ class SpecialGenerator:
             return key
 
         def __getitem__(self, key):
+            if array_handler.is_array_key(key):
+                # A view of the data for slices.
+                return self.to_array()[key]
             obj = self._vtk_obj
             n = obj.GetNumberOfTuples()
             key = self._check_key(key, n)
@@ -278,20 +272,7 @@ class SpecialGenerator:
             self.update_traits()
 
         def extend(self, arr):
-            obj = self._vtk_obj
-            nc = obj.GetNumberOfComponents()
-            if nc == 1:
-                for i in arr:
-                    obj.InsertNextTuple1(i)
-            elif nc in [2,3,4,9]:
-                meth = getattr(obj, 'InsertNextTuple%d'%nc)
-                for i in arr:
-                    meth(*i)
-            else:
-                n = obj.GetNumberOfTuples()
-                for i in range(len(arr)):
-                    for x in range(nc):
-                        obj.InsertComponent(n+i, x, arr[i][x])
+            array_handler.extend_vtk_array(self._vtk_obj, arr)
             self.update_traits()
 
         def from_array(self, arr):
@@ -315,10 +296,7 @@ class SpecialGenerator:
             return self._vtk_obj.GetNumberOfPoints()
 
         def __iter__(self):
-            obj = self._vtk_obj
-            n = obj.GetNumberOfPoints()
-            for i in range(n):
-                yield obj.GetPoint(i)
+            return array_handler.iter_tuples(self.to_array())
 
         def _check_key(self, key, n):
             ##############################################
@@ -333,6 +311,9 @@ class SpecialGenerator:
             return key
 
         def __getitem__(self, key):
+            if array_handler.is_array_key(key):
+                # A view of the data for slices.
+                return self.to_array()[key]
             obj = self._vtk_obj
             n = obj.GetNumberOfPoints()
             key = self._check_key(key, n)
@@ -360,8 +341,8 @@ class SpecialGenerator:
 
         def extend(self, arr):
             obj = self._vtk_obj
-            for i in arr:
-                obj.InsertNextPoint(i)
+            array_handler.extend_vtk_array(obj.GetData(), arr)
+            obj.Modified()
             self.update_traits()
 
         def from_array(self, arr):
@@ -385,10 +366,7 @@ class SpecialGenerator:
             return self._vtk_obj.GetNumberOfIds()
 
         def __iter__(self):
-            obj = self._vtk_obj
-            n = obj.GetNumberOfIds()
-            for i in range(n):
-                yield obj.GetId(i)
+            return iter(self.to_array().tolist())
 
         def _check_key(self, key, n):
             if type(key) != type(1):
@@ -400,6 +378,8 @@ class SpecialGenerator:
             return key
 
         def __getitem__(self, key):
+            if array_handler.is_array_key(key):
+                return self.to_array()[key]
             obj = self._vtk_obj
             n = obj.GetNumberOfIds()
             key = self._check_key(key, n)
@@ -426,9 +406,7 @@ class SpecialGenerator:
             self.update_traits()
 
         def extend(self, arr):
-            obj = self._vtk_obj
-            for i in arr:
-                obj.InsertNextId(i)
+            array_handler.extend_vtk_id_list(self._vtk_obj, arr)
             self.update_traits()
 
         def from_array(self, arr):
@@ -439,17 +417,23 @@ class SpecialGenerator:
             array_handler.array2vtkIdList(arr, self._vtk_obj)
             self.update_traits()
 
+        def to_array(self):
+            '''Return a copy of the ids as a Numeric array.'''
+            return array_handler.vtkIdList2array(self._vtk_obj)
+
         """
         out.write(self.indent.format(code))
 
     def _write_CellArray(self, out):
         code = """
-        def from_array(self, arr):
+        def from_array(self, arr, offsets=None):
             '''Set the value of the data array using the passed
             Numeric array or Python list.  This is implemented
-            efficiently.
+            efficiently.  If `offsets` are given, `arr` is the flat
+            connectivity array of the cells.
             '''
-            array_handler.array2vtkCellArray(arr, self._vtk_obj)
+            array_handler.array2vtkCellArray(arr, self._vtk_obj,
+                                             offsets=offsets)
             self.update_traits()
 
         def to_array(self):
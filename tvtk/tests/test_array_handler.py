@@ -6,6 +6,7 @@ Tests for array_handler.py.
 # License: BSD Style.
 
 import unittest
+import warnings
 import vtk
 import numpy
 
@@ -222,6 +223,39 @@ class TestArrayHandler(unittest.TestCase):
         cells = array_handler.array2vtkCellArray(a)
         self.assertEqual(cells.GetNumberOfCells(), N)
 
+    def test_arr2cell_array_offsets(self):
+        """Test vtkCellArray creation from offsets and connectivity."""
+        conn = numpy.arange(10)
+        offsets = numpy.array([0, 1, 3, 6, 10])
+        cells = array_handler.array2vtkCellArray(conn, offsets=offsets)
+        self.assertEqual(cells.GetNumberOfCells(), 4)
+        z = numpy.array([1, 0, 2, 1,2, 3, 3,4,5, 4, 6,7,8,9])
+        arr = array_handler.vtk2array(cells.GetData())
+        self.assertEqual(numpy.all(numpy.equal(arr, z)), True)
+
+        # Passing an existing cell array resets it.
+        ident = id(cells)
+        cells = array_handler.array2vtkCellArray(conn[:3], cells,
+                                                 offsets=[0, 3])
+        self.assertEqual(id(cells), ident)
+        self.assertEqual(cells.GetNumberOfCells(), 1)
+
+        # Bad offsets are caught.
+        self.assertRaises(AssertionError, array_handler.array2vtkCellArray,
+                          conn, offsets=[0, 1, 3])
+
+        if array_handler.HAS_CELL_ARRAY_SET_DATA:
+            # The connectivity should not be copied.
+            conn = numpy.arange(9, dtype=array_handler.ID_TYPE_CODE)
+            a = conn.reshape(3, 3)
+            cells = array_handler.array2vtkCellArray(a)
+            a[0, 0] = 5
+            ids = vtk.vtkIdList()
+            cells.GetCellAtId(0, ids)
+            self.assertEqual(ids.GetId(0), 5)
+            # The arrays are kept alive with the cell array.
+            self.assertEqual(cells in array_handler._array_cache, True)
+
     def test_arr2vtkPoints(self):
         """Test Numeric array to vtkPoints conversion."""
         a = [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
@@ -396,6 +430,60 @@ class TestArrayHandler(unittest.TestCase):
         del varr
         self.assertEqual(len(cache), 0)
 
+    def test_array_cache_stats(self):
+        """Test the memory accounting of the ArrayCache."""
+        cache = array_handler.ArrayCache()
+        arr = numpy.zeros(100, float)
+        varr = vtk.vtkDoubleArray()
+        cache.add(varr, arr)
+        stats = cache.stats()
+        self.assertEqual(stats['n_arrays'], 1)
+        self.assertEqual(stats['nbytes'], arr.nbytes)
+        self.assertEqual(stats['dtype_counts'], {'float64': 1})
+        self.assertEqual(stats['class_nbytes'], {'vtkDoubleArray': 800})
+
+        # Re-adding replaces the entry.
+        arr1 = numpy.zeros(10, numpy.int32)
+        cache.add(varr, arr1)
+        stats = cache.stats()
+        self.assertEqual(stats['nbytes'], arr1.nbytes)
+        self.assertEqual(stats['dtype_counts'], {'int32': 1})
+
+        # Hits and misses.
+        cache.get(varr)
+        self.assertRaises(KeyError, cache.get, vtk.vtkDoubleArray())
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        snap = cache.snapshot()
+        self.assertEqual(len(snap), 1)
+        self.assertEqual(snap[0][1:], ('vtkDoubleArray', 40, ('int32',)))
+
+        del varr
+        stats = cache.stats()
+        self.assertEqual(stats['nbytes'], 0)
+        self.assertEqual(stats['dtype_counts'], {})
+        self.assertEqual(stats['n_removed'], 1)
+
+    def test_array_cache_limit(self):
+        """Test the byte ceiling of the ArrayCache."""
+        calls = []
+        cache = array_handler.ArrayCache(
+            max_bytes=100, callback=lambda c, n: calls.append(n)
+        )
+        v1, v2 = vtk.vtkDoubleArray(), vtk.vtkDoubleArray()
+        cache.add(v1, numpy.zeros(10))
+        self.assertEqual(calls, [])
+        cache.add(v2, numpy.zeros(10))
+        self.assertEqual(calls, [160])
+
+        cache.callback = None
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            cache.add(v2, numpy.zeros(10))
+        self.assertEqual(len(w), 1)
+        self.assertTrue(issubclass(w[0].category, RuntimeWarning))
+
     def test_vtk2array_appended_array(self):
         """Test the vtk2array can tolerate appending a cached array."""
         # array is cached upon array2vtk is called
@@ -425,6 +513,76 @@ class TestArrayHandler(unittest.TestCase):
         np = array_handler.vtk2array(arr)
         self.assertEqual(numpy.all(np == list(range(10))), True)
 
+    def test_extend_vtk_array(self):
+        """Test if tuples are appended in bulk to a VTK array."""
+        arr = numpy.arange(6.0).reshape(2, 3)
+        vtk_arr = array_handler.array2vtk(arr)
+        self.assertTrue(vtk_arr in array_handler._array_cache)
+
+        extra = numpy.random.random((1000, 3))
+        array_handler.extend_vtk_array(vtk_arr, extra)
+        # The VTK array does not use the cached array anymore.
+        self.assertFalse(vtk_arr in array_handler._array_cache)
+        self.assertEqual(vtk_arr.GetNumberOfTuples(), 1002)
+        result = array_handler.vtk2array(vtk_arr)
+        self.assertTrue(numpy.allclose(result[:2], arr))
+        self.assertTrue(numpy.allclose(result[2:], extra))
+
+        # Python lists work too.
+        array_handler.extend_vtk_array(vtk_arr, [[1, 2, 3]])
+        self.assertEqual(vtk_arr.GetTuple3(1002), (1.0, 2.0, 3.0))
+        self.assertRaises(ValueError, array_handler.extend_vtk_array,
+                          vtk_arr, [1, 2])
+
+    def test_extend_vtk_array_without_source(self):
+        """Test if extending a VTK array whose numpy array is only
+        referenced by the cache keeps its data."""
+        vtk_arr = array_handler.array2vtk(numpy.arange(2000000.0))
+        array_handler.extend_vtk_array(vtk_arr, numpy.ones(3))
+        result = array_handler.vtk2array(vtk_arr)
+        self.assertEqual(len(result), 2000003)
+        self.assertTrue(numpy.all(result[:2000000] ==
+                                  numpy.arange(2000000.0)))
+        self.assertTrue(numpy.all(result[2000000:] == 1.0))
+
+    def test_extend_vtk_id_list(self):
+        """Test if ids are appended in bulk to a vtkIdList."""
+        ids = array_handler.array2vtkIdList(numpy.arange(4))
+        array_handler.extend_vtk_id_list(ids, numpy.arange(4, 100))
+        self.assertEqual(ids.GetNumberOfIds(), 100)
+        self.assertEqual(ids.GetId(99), 99)
+        result = array_handler.vtkIdList2array(ids)
+        self.assertEqual(numpy.all(result == numpy.arange(100)), True)
+
+    def test_vtk_id_list_bulk_copy(self):
+        """Test if vtkIdLists are set and read in bulk."""
+        ids = array_handler.array2vtkIdList(numpy.arange(1000))
+        # Setting fewer ids shrinks the list.
+        array_handler.array2vtkIdList(numpy.array([3.0, 2.0, 1.0]), ids)
+        self.assertEqual(ids.GetNumberOfIds(), 3)
+        self.assertEqual([ids.GetId(i) for i in range(3)], [3, 2, 1])
+        result = array_handler.vtkIdList2array(ids)
+        self.assertEqual(result.dtype, array_handler.ID_TYPE_CODE)
+        self.assertEqual(list(result), [3, 2, 1])
+        # The result is a copy.
+        result[0] = 10
+        self.assertEqual(ids.GetId(0), 3)
+
+        array_handler.array2vtkIdList([], ids)
+        self.assertEqual(ids.GetNumberOfIds(), 0)
+        self.assertEqual(len(array_handler.vtkIdList2array(ids)), 0)
+        array_handler.extend_vtk_id_list(ids, [])
+        self.assertEqual(ids.GetNumberOfIds(), 0)
+
+    def test_iter_tuples(self):
+        """Test if the rows of an array are iterated as tuples."""
+        arr = numpy.arange(10000).reshape(5000, 2)
+        result = list(array_handler.iter_tuples(arr, chunk_size=7))
+        self.assertEqual(len(result), 5000)
+        self.assertEqual(result[-1], (9998.0, 9999.0))
+        self.assertEqual(list(array_handler.iter_tuples(numpy.arange(3))),
+                         [0.0, 1.0, 2.0])
+
 
 if __name__ == "__main__":
     unittest.main()
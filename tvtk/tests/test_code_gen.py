@@ -0,0 +1,95 @@
+"""Tests for the caching of the generated classes in code_gen.py.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tvtk.code_gen import TVTKGenerator
+
+
+class TestTVTKGenerator(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+
+    def generate(self, name):
+        gen = TVTKGenerator(self.tmp_dir, self.cache_dir)
+        node = gen.wrap_gen.get_tree().get_node(name)
+        nodes = node.get_ancestors() + [node]
+        nodes.sort(key=lambda x: x.level)
+        codes = {}
+        for node in nodes:
+            codes.update(gen._generate_classes([node], None))
+        return gen, codes
+
+    def test_cache(self):
+        gen, codes = self.generate('vtkProperty')
+        self.assertEqual(gen.n_cached, 0)
+        self.assertEqual(gen.n_generated, len(codes))
+        self.assertTrue('class Property(' in codes['vtkProperty'])
+
+        # The classes are read from the cache the second time.
+        gen, cached_codes = self.generate('vtkProperty')
+        self.assertEqual(gen.n_generated, 0)
+        self.assertEqual(gen.n_cached, len(codes))
+        self.assertEqual(cached_codes, codes)
+        self.assertEqual(list(gen.timings.keys()),
+                         ['class tree', 'cache', 'generate'])
+
+    def test_parallel_with_dependencies(self):
+        # The actor classes depend on the data of their property class,
+        # which may be generated in another process.
+        names = ['vtkActor', 'vtkActor2D']
+        gen = TVTKGenerator(self.tmp_dir, self.cache_dir)
+        required = gen._get_required_names(names)
+        self.assertTrue('vtkProperty' in required)
+        self.assertTrue('vtkProperty2D' in required)
+        gen.generate_code(n_workers=2, names=names)
+        serial = TVTKGenerator(os.path.join(self.tmp_dir, 'serial'))
+        serial.generate_code(n_workers=1, names=names)
+
+        def read(gen, fname):
+            with open(os.path.join(gen.out_dir, fname)) as f:
+                return f.read()
+
+        for fname in ('actor.py', 'actor2d.py', 'property.py'):
+            self.assertEqual(read(gen, fname), read(serial, fname))
+
+    def test_parallel_is_independent_of_parse_order(self):
+        # Creating some viewers changes static settings of the mappers,
+        # the output must not depend on the process a class is parsed in.
+        names = ['vtkPolyDataMapper', 'vtkResliceImageViewer']
+        gen = TVTKGenerator(self.tmp_dir, self.cache_dir)
+        gen.generate_code(n_workers=2, names=names)
+        serial = TVTKGenerator(os.path.join(self.tmp_dir, 'serial'))
+        serial.write_wrapper_classes(names, n_workers=1)
+
+        fnames = sorted(os.listdir(serial.out_dir))
+        self.assertEqual(sorted(os.listdir(gen.out_dir)), fnames)
+        for fname in fnames:
+            if not fname.endswith('.py'):
+                continue
+            with open(os.path.join(gen.out_dir, fname)) as f:
+                parallel_code = f.read()
+            with open(os.path.join(serial.out_dir, fname)) as f:
+                self.assertEqual(parallel_code, f.read(), fname)
+
+    def test_cache_key_of_delegates(self):
+        gen = TVTKGenerator(self.tmp_dir, self.cache_dir)
+        tree = gen.wrap_gen.get_tree()
+        actor = tree.get_node('vtkActor')
+        prop = tree.get_node('vtkProperty')
+        nodes = actor.get_ancestors() + prop.get_ancestors() + [prop]
+        for node in sorted(set(nodes), key=lambda x: x.level):
+            gen._get_class_key(node)
+        key = gen._get_class_key(actor)
+        gen._class_keys['vtkProperty'] = 'changed'
+        self.assertNotEqual(gen._get_class_key(actor), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
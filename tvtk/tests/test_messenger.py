@@ -146,6 +146,54 @@ class TestMessenger(unittest.TestCase):
         # Clean up.
         messenger.disconnect(c1)
 
+    def test_dead_ref_removed_on_collection(self):
+        """Test if the slot of a gc'd callback is removed at once."""
+        b = B()
+        m = messenger.Messenger()
+        slots = m._signals[hash(b)]['method']
+        self.assertEqual(len(slots), 1)
+        a = b.a
+        b.a = None
+        del a
+        self.assertEqual(len(slots), 0)
+        b.send()
+
+    def test_connect_after_send(self):
+        """Tests if connections made after a send are used."""
+        b = B()
+        b.send()
+        self.assertEqual(b.a.did_catch_all, 0)
+        a = A()
+        messenger.connect(b, 'method', a.callback)
+        messenger.connect(b, 'all', b.a.catch_all_cb)
+        b.send(2)
+        self.assertEqual(a.event, 'method')
+        self.assertEqual(a.args, (2,))
+        self.assertEqual(b.a.did_catch_all, 1)
+        messenger.disconnect(b, 'method', a.callback)
+        b.send(3)
+        self.assertEqual(a.args, (2,))
+        self.assertEqual(b.a.args, (3,))
+
+    def test_event_rates(self):
+        """Tests the counting of the events sent."""
+        b = B()
+        self.assertEqual(messenger.get_event_rates(), [])
+        messenger.set_event_counting()
+        try:
+            for i in range(5):
+                b.send()
+            rates = messenger.get_event_rates()
+            self.assertEqual(len(rates), 1)
+            rate, count, name, key = rates[0]
+            self.assertEqual(count, 10)
+            self.assertEqual(name, 'B')
+            self.assertEqual(key, hash(b))
+            self.assertTrue(rate > 0)
+        finally:
+            messenger.set_event_counting(False)
+        self.assertEqual(messenger.get_event_rates(), [])
+
 
 if __name__ == "__main__":
     unittest.main()
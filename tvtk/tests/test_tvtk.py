@@ -469,6 +469,13 @@ class TestTVTK(unittest.TestCase):
         self.assertRaises(IndexError, f.__getitem__, 100)
         self.assertRaises(IndexError, f.__setitem__, 100, 100)
 
+        # Slices return views and numpy arrays are appended in bulk.
+        f.extend(numpy.ones((1000, 5)))
+        self.assertEqual(len(f), 1005)
+        self.assertEqual(f[1:3].shape, (2, 5))
+        self.assertEqual(mysum(f[1:3] - f.to_array()[1:3]), 0)
+        self.assertEqual(f[[0, -1]].shape, (2, 5))
+
     def test_points(self):
         """Test if vtkPoints behaves in a Pythonic fashion."""
         f = tvtk.Points()
@@ -492,6 +499,9 @@ class TestTVTK(unittest.TestCase):
         self.assertEqual(f[1], (-1.0, -1.0, -1.0))
         self.assertRaises(IndexError, f.__getitem__, 100)
         self.assertRaises(IndexError, f.__setitem__, 100, 100)
+        f.extend(numpy.ones((1000, 3)))
+        self.assertEqual(len(f), 1005)
+        self.assertEqual(f[3:5].tolist(), [[3, 3, 3], [4, 4, 4]])
 
     def test_idlist(self):
         """Test if vtkIdList behaves in a Pythonic fashion."""
@@ -512,6 +522,8 @@ class TestTVTK(unittest.TestCase):
         f.append(4)
         f.extend([5, 6])
         self.assertEqual(len(f), 7)
+        self.assertEqual(f[4:].tolist(), [4, 5, 6])
+        self.assertEqual(list(f.to_array()), list(range(7)))
         f[1] = -1
         self.assertEqual(f[1], -1)
         self.assertRaises(IndexError, f.__getitem__, 100)
@@ -138,6 +138,72 @@ class TestTVTKBase(unittest.TestCase):
         obj.SetSpecularColor(val)
         self.assertEqual(p.specular_color, val)
 
+    def test_update_skips_unchanged(self):
+        """Test that unchanged traits are not reset on update."""
+        p = Prop()
+        changes = []
+        p.on_trait_change(lambda n, v: changes.append(n), 'opacity')
+        p.on_trait_change(lambda n, v: changes.append(n), 'representation')
+        p._vtk_obj.SetEdgeVisibility(1)
+        self.assertEqual(p.edge_visibility, 1)
+        self.assertEqual(changes, [])
+
+        # Observers do nothing if the VTK object is not modified.
+        mtime = p._updated_mtime
+        self.assertEqual(mtime, p._vtk_obj.GetMTime())
+        p.update_traits(p._vtk_obj, 'ModifiedEvent')
+        self.assertEqual(p._updated_mtime, mtime)
+
+    def test_explicit_update_ignores_mtime(self):
+        """Test that explicit updates are done even if the VTK object
+        does not appear modified."""
+        p = Prop()
+        obj = p._vtk_obj
+        p.teardown_observers()
+        obj.SetOpacity(0.5)
+        # Pretend the change did not modify the object, like some VTK
+        # methods do.
+        p._updated_mtime = obj.GetMTime()
+        p.update_traits(obj, 'ModifiedEvent')
+        self.assertEqual(p.opacity, 1.0)
+        p.update_traits()
+        self.assertEqual(p.opacity, 0.5)
+
+    def test_deferred_updates(self):
+        """Test the deferred trait update mode."""
+        p = Prop()
+        obj = p._vtk_obj
+        with tvtk_base.deferred_updates():
+            obj.SetOpacity(0.5)
+            obj.SetRepresentationToPoints()
+            # Traits are stale until flushed.
+            self.assertEqual(p.opacity, 1.0)
+            self.assertEqual(p.representation, 'surface')
+        self.assertEqual(p.opacity, 0.5)
+        self.assertEqual(p.representation, 'points')
+
+        # Explicit flushes and updates.
+        tvtk_base.defer_updates()
+        try:
+            obj.SetOpacity(0.25)
+            tvtk_base.flush_updates()
+            self.assertEqual(p.opacity, 0.25)
+            obj.SetOpacity(0.75)
+            p.update_traits()
+            self.assertEqual(p.opacity, 0.75)
+        finally:
+            tvtk_base.resume_updates()
+
+        # A scheduler is called once per batch of modifications.
+        scheduled = []
+        with tvtk_base.deferred_updates(scheduled.append):
+            obj.SetOpacity(0.1)
+            obj.SetEdgeVisibility(1)
+            self.assertEqual(scheduled, [tvtk_base.flush_updates])
+            scheduled[0]()
+            self.assertEqual(p.opacity, 0.1)
+            self.assertEqual(p.edge_visibility, 1)
+
     def test_setup_teardown_observers(self):
         """If setup_observers and teardown_observers work correctly."""
         p = Prop()
@@ -38,6 +38,46 @@ class TestTVTKScene(unittest.TestCase):
         # The TVTK Scene should have been collected.
         self.assertTrue(scene_collected[0])
 
+    def test_coalesced_renders(self):
+        scene = TVTKScene(off_screen_rendering=True)
+        self.addCleanup(scene.close)
+        scheduled = []
+        scene._schedule_render = lambda delay: scheduled.append(delay) or True
+        scene.coalesce_renders = True
+        scene.reset_render_stats()
+
+        for i in range(10):
+            scene.render()
+        self.assertEqual(len(scheduled), 1)
+        self.assertEqual(scene.render_stats(), dict(requested=10, done=0))
+
+        scene.flush_render()
+        self.assertEqual(scene.render_stats(), dict(requested=10, done=1))
+        # Nothing is pending any more.
+        scene.flush_render()
+        self.assertEqual(scene.render_stats()['done'], 1)
+
+        # Without an event loop the scene renders at once.
+        scene._schedule_render = lambda delay: False
+        scene.render()
+        self.assertEqual(scene.render_stats(), dict(requested=11, done=2))
+
+
+    def test_lod_interaction(self):
+        scene = TVTKScene(off_screen_rendering=True)
+        self.addCleanup(scene.close)
+        iren = scene.interactor
+        scene.lod_interaction = True
+        self.assertEqual(iren.desired_update_rate, scene.lod_frame_rate)
+        iren.invoke_event('StartInteractionEvent')
+        self.assertTrue(scene.interacting)
+        iren.invoke_event('EndInteractionEvent')
+        self.assertFalse(scene.interacting)
+
+        scene.lod_interaction = False
+        iren.invoke_event('StartInteractionEvent')
+        self.assertFalse(scene.interacting)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -263,6 +263,22 @@ class TestVTKParser(unittest.TestCase):
         self.assertTrue('DataExtent' not in p.get_state_methods())
         self.assertTrue('DataExtent' in p.get_get_set_methods())
 
+    def test_parse_restores_global_settings(self):
+        """Check if parsing a class does not change the static settings
+        seen by the classes parsed later."""
+        p = self.p
+        p.parse(vtk.vtkMapper)
+        default = p.get_state_methods()['ResolveCoincidentTopology'][0]
+        value = vtk.vtkMapper.GetResolveCoincidentTopology()
+        # Some viewers and widgets change the coincident topology
+        # resolution of all the mappers when created.
+        if hasattr(vtk, 'vtkResliceImageViewer'):
+            p.parse(vtk.vtkResliceImageViewer)
+        self.assertEqual(vtk.vtkMapper.GetResolveCoincidentTopology(), value)
+        p.parse(vtk.vtkMapper)
+        self.assertEqual(p.get_state_methods()['ResolveCoincidentTopology'][0],
+                         default)
+
     def test_no_tree(self):
         """Check if parser is usable without the tree."""
         p = vtk_parser.VTKMethodParser(use_tree=False)
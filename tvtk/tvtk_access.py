@@ -2,6 +2,9 @@
 classes in a clean and quick manner.  The `TVTK` class is instantiated
 and this instance serves as the `tvtk` 'module'.  For more details on
 this see the devel.txt in the TVTK documentation directory.
+
+VTK and the wrapper classes are only imported on the first attribute
+access of the `tvtk` 'module', so importing it is cheap.
 """
 # Author: Prabhu Ramachandran <prabhu [at] aero.iitb.ac.in>
 # Copyright (c) 2007-2015,  Enthought, Inc.
@@ -30,27 +33,60 @@ if not ( exists(tvtk_class_dir) and isdir(tvtk_class_dir)
         "Unable to find either a directory: %s or a file: %s "
         "with the TVTK classes." % (tvtk_class_dir, _zip) )
 
-# Check if the VTK version is the same as that used to build TVTK.
-from tvtk.tvtk_classes.vtk_version import vtk_build_version
-
-# Make sure VTK is installed.
-try:
-    import vtk
-except ImportError as m:
-    msg = '%s\n%s\nDo you have vtk installed properly?\n' \
-          'VTK (and build instructions) can be obtained from http://www.vtk.org\n' \
-         % (m, '_'*80)
-    raise ImportError(msg)
-
-vtk_version = vtk.vtkVersion().GetVTKVersion()[:3]
-if vtk_version != vtk_build_version:
-    msg = '*'*80 + "\n" + \
-          'WARNING: Imported VTK version (%s) does not match the one used\n'\
-          '         to build the TVTK classes (%s). This may cause problems.\n'\
-          '         Please rebuild TVTK.\n'%(vtk_version, vtk_build_version) +\
-          '*'*80 + '\n'
-    print(msg)
+
+def _load_tvtk():
+    """Imports VTK and the TVTK helper and returns the `TVTK` instance.
+    """
+    # Check if the VTK version is the same as that used to build TVTK.
+    from tvtk.tvtk_classes.vtk_version import vtk_build_version
+
+    # Make sure VTK is installed.
+    try:
+        import vtk
+    except ImportError as m:
+        msg = '%s\n%s\nDo you have vtk installed properly?\n' \
+              'VTK (and build instructions) can be obtained from http://www.vtk.org\n' \
+             % (m, '_'*80)
+        raise ImportError(msg)
+
+    vtk_version = vtk.vtkVersion().GetVTKVersion()[:3]
+    if vtk_version != vtk_build_version:
+        msg = '*'*80 + "\n" + \
+              'WARNING: Imported VTK version (%s) does not match the one used\n'\
+              '         to build the TVTK classes (%s). This may cause problems.\n'\
+              '         Please rebuild TVTK.\n'%(vtk_version, vtk_build_version) +\
+              '*'*80 + '\n'
+        print(msg)
+
+    from tvtk.tvtk_classes import tvtk_helper
+    return tvtk_helper.TVTK()
+
+
+class LazyTVTK(object):
+    """The `tvtk` 'module'.  The TVTK helper is loaded on the first
+    attribute access and the attributes looked up are then stored on
+    the instance, so later lookups are plain attribute accesses.
+    """
+
+    def __init__(self):
+        self.__dict__['_tvtk'] = None
+
+    def _get_tvtk(self):
+        tvtk = self.__dict__['_tvtk']
+        if tvtk is None:
+            tvtk = self.__dict__['_tvtk'] = _load_tvtk()
+        return tvtk
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = getattr(self._get_tvtk(), name)
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._get_tvtk())
+
 
 # Now setup TVTK itself.
-from tvtk.tvtk_classes import tvtk_helper
-tvtk = tvtk_helper.TVTK()
+tvtk = LazyTVTK()
@@ -11,6 +11,7 @@ import sys
 import weakref
 import os
 import logging
+from contextlib import contextmanager
 
 import vtk
 
@@ -131,6 +132,87 @@ def get_tvtk_object_from_cache(vtk_obj):
     return _object_cache.get(vtk_obj.__this__)
 
 
+######################################################################
+# Deferred trait updates.
+######################################################################
+
+class _DeferredUpdates(object):
+    """Holds the state of the deferred trait update mode.
+
+    When updates are deferred, the `ModifiedEvent` observer of a TVTK
+    object only marks the object as dirty.  The traits of all dirty
+    objects are updated in one go when `flush_updates` is called or
+    when the outermost `resume_updates` is called.
+    """
+    def __init__(self):
+        self.level = 0
+        self.dirty = weakref.WeakSet()
+        # An optional callable that is passed `flush_updates` when the
+        # first object is marked dirty, for example
+        # `pyface.api.GUI.invoke_later`.  This allows the traits to be
+        # updated once per event loop iteration.
+        self.scheduler = None
+        self.scheduled = False
+
+_deferred = _DeferredUpdates()
+
+
+def defer_updates(scheduler=None):
+    """Defer the trait updates of all TVTK objects triggered by VTK
+    `ModifiedEvent`s until `flush_updates` or the matching call to
+    `resume_updates`.  Calls may be nested.
+
+    If `scheduler` is given, it is called with `flush_updates` as its
+    argument whenever an object is first marked dirty so the updates
+    may be performed later, for example once per event loop tick by
+    passing `pyface.api.GUI.invoke_later`.
+
+    Note that the trait values of the objects may be stale until the
+    updates are flushed.  Calling `update_traits` explicitly on an
+    object always updates it.
+    """
+    _deferred.level += 1
+    if scheduler is not None:
+        _deferred.scheduler = scheduler
+
+
+def resume_updates():
+    """Undo a call to `defer_updates`.  When the outermost call is
+    undone, the traits of all dirty objects are updated."""
+    if _deferred.level > 0:
+        _deferred.level -= 1
+    if _deferred.level == 0:
+        _deferred.scheduler = None
+        flush_updates()
+
+
+def flush_updates():
+    """Update the traits of all objects that received a
+    `ModifiedEvent` while updates were deferred."""
+    dirty = _deferred.dirty
+    _deferred.scheduled = False
+    while dirty:
+        obj = dirty.pop()
+        obj.update_traits()
+
+
+@contextmanager
+def deferred_updates(scheduler=None):
+    """A context manager that defers trait updates in its body, see
+    `defer_updates`.  For example::
+
+      >>> with deferred_updates():
+      ...     for i in range(100):
+      ...         actor.property.opacity = i*0.01
+
+    """
+    defer_updates(scheduler)
+    try:
+        yield
+    finally:
+        resume_updates()
+
+
 ######################################################################
 # Special traits used by the tvtk objects.
 ######################################################################
@@ -238,6 +320,9 @@ vtk_property_delegate = traits.Delegate('property', modify=True)
 ######################################################################
 # Utility functions.
 ######################################################################
+# A marker for traits that have not been set.
+_missing = object()
+
 def deref_vtk(obj):
     """Dereferences the VTK object from the object if possible."""
     if isinstance(obj, TVTKBase):
@@ -282,6 +367,10 @@ class TVTKBase(traits.HasStrictTraits):
     # Stores the names of the traits that need to be updated.
     _updateable_traits_ = traits.Tuple
 
+    # The MTime of the wrapped VTK object when the traits were last
+    # updated.  Used to skip redundant updates.
+    _updated_mtime = traits.Python
+
     # List of trait names that are to be included in the full traits view of this object.
     _full_traitnames_list_ = traits.List
 
@@ -319,8 +408,9 @@ class TVTKBase(traits.HasStrictTraits):
           creating the object.
 
         """
-        # Initialize the Python attribute.
+        # Initialize the Python attributes.
         self._in_set = 0
+        self._updated_mtime = None
         if obj:
             assert obj.IsA(klass.__name__)
             self._vtk_obj = obj
@@ -361,8 +451,9 @@ class TVTKBase(traits.HasStrictTraits):
         """
         self.update_traits()
         d = self.__dict__.copy()
-        for i in ['_vtk_obj', '_in_set', 'reference_count',
-                  'global_warning_display', '__sync_trait__']:
+        for i in ['_vtk_obj', '_in_set', '_updated_mtime',
+                  'reference_count', 'global_warning_display',
+                  '__sync_trait__']:
             d.pop(i, None)
         return d
 
@@ -458,11 +549,18 @@ class TVTKBase(traits.HasStrictTraits):
         The method works by getting the current value from the wrapped
         VTK object.  `self._updateable_traits_` stores a tuple of
         tuples containing the trait name followed by the name of the
-        get method to use on the wrapped VTK object.
+        get method to use on the wrapped VTK object.  Traits whose
+        value has not changed are not set so no notifications are
+        fired for them.  When called as an observer, nothing is done if
+        the VTK object has not been modified since the last update.
+        Explicit calls always update, since some VTK methods change the
+        state of the object without modifying it.
 
         The `obj` and `event` parameters may be ignored and are not
         used in the function.  They exist only for compatibility with
-        the VTK observer callback functions.
+        the VTK observer callback functions.  If they are passed (the
+        method is called as an observer) and updates are deferred (see
+        `defer_updates`), the object is only marked as dirty.
 
         """
         if self._in_set:
@@ -470,13 +568,26 @@ class TVTKBase(traits.HasStrictTraits):
         if not hasattr(self, '_updateable_traits_'):
             return
 
-        self._in_set = self.DOING_UPDATE
+        if event is not None and _deferred.level > 0:
+            _deferred.dirty.add(self)
+            if _deferred.scheduler is not None and not _deferred.scheduled:
+                _deferred.scheduled = True
+                _deferred.scheduler(flush_updates)
+            return
+        _deferred.dirty.discard(self)
+
         vtk_obj = self._vtk_obj
+        mtime = self._wrapped_mtime(vtk_obj)
+        if event is not None and mtime and mtime == self._updated_mtime:
+            return
+
+        self._in_set = self.DOING_UPDATE
 
         # Save the warning state and turn it off!
         warn = vtk.vtkObject.GetGlobalWarningDisplay()
         vtk.vtkObject.GlobalWarningDisplayOff()
 
+        cdict = self.__dict__
         for name, getter in self._updateable_traits_:
             if name == 'global_warning_display':
                 setattr(self, name, warn)
@@ -492,6 +603,15 @@ class TVTKBase(traits.HasStrictTraits):
                 # value (e.g. vtkImageConvolve.GetKernel3x3 and alike)
                 pass
             else:
+                # Skip unchanged values, mapped traits store the
+                # value returned by VTK in the shadow trait.
+                old = cdict.get(name + '_', cdict.get(name, _missing))
+                try:
+                    if type(old) is type(val) and old == val:
+                        continue
+                except ValueError:
+                    # Comparison of arrays.
+                    pass
                 try:
                     setattr(self, name, val)
                 except traits.TraitError:
@@ -502,6 +622,7 @@ class TVTKBase(traits.HasStrictTraits):
 
         # Reset the warning state.
         vtk.vtkObject.SetGlobalWarningDisplay(warn)
+        self._updated_mtime = self._wrapped_mtime(vtk_obj)
         self._in_set = 0
 
     #################################################################
@@ -540,7 +661,10 @@ class TVTKBase(traits.HasStrictTraits):
             else:
                 raise
         self._in_set -= 1
-        if force_update or self._wrapped_mtime(vtk_obj) > mtime:
+        if force_update:
+            self._updated_mtime = None
+            self.update_traits()
+        elif self._wrapped_mtime(vtk_obj) > mtime:
             self.update_traits()
 
 
@@ -2,9 +2,16 @@
 # as an egg.  What do we do then?  For now, we just punt since we don't want
 # to define the version number in two places.
 try:
-    import pkg_resources
-    version = pkg_resources.require('Mayavi')[0].version
+    # Much faster to import than pkg_resources.
+    from importlib.metadata import version as _get_version
+except ImportError:
+    _get_version = None
+
+try:
+    if _get_version is not None:
+        version = _get_version('Mayavi')
+    else:
+        import pkg_resources
+        version = pkg_resources.require('Mayavi')[0].version
 except:
     version = ''
-
-
@@ -18,6 +18,11 @@ from . import vtk_module as vtk
 from .common import is_version_62
 
 
+# The `(getter, setter)` pairs of the static settings of the VTK classes,
+# found on the first parse.
+_global_settings = None
+
+
 class VTKMethodParser:
     """This class provides useful methods for parsing methods of a VTK
     class or instance.
@@ -153,7 +158,26 @@ class VTKMethodParser:
             if klass.__name__ != 'vtkObject':
                 vtk.vtkObject.GlobalWarningDisplayOff()
 
-        self._organize_methods(klass, methods)
+        # The instances created and the states tried while parsing may
+        # change the static settings of any class, e.g. the widgets set
+        # the coincident topology resolution of all the mappers.  These
+        # are restored so the defaults found for the classes parsed
+        # later do not depend on the order they are parsed in.
+        settings = _get_global_settings()
+        saved = [getter() for getter, setter in settings]
+        try:
+            self._organize_methods(klass, methods)
+        finally:
+            for (getter, setter), value in zip(settings, saved):
+                if getter() == value:
+                    continue
+                try:
+                    if isinstance(value, tuple):
+                        setter(*value)
+                    else:
+                        setter(value)
+                except (TypeError, ValueError):
+                    pass
 
         if no_warn:
             # Reset warning status.
@@ -715,3 +739,43 @@ class VTKMethodParser:
                         if obj:
                             break
         return obj
+
+
+######################################################################
+# Utility functions.
+######################################################################
+
+def _get_global_settings():
+    """Returns the `(getter, setter)` pairs of the static Get/Set<Prop>
+    methods of the VTK classes whose getter takes no argument and
+    returns a number, a string or a tuple of these.
+    """
+    global _global_settings
+    if _global_settings is not None:
+        return _global_settings
+    static = re.compile(r'^C\+\+: static ', re.M)
+    settings = []
+    for name in dir(vtk):
+        klass = getattr(vtk, name)
+        if not name.startswith('vtk') or not hasattr(klass, '__bases__'):
+            continue
+        d = klass.__dict__
+        for method in d:
+            if method[:3] != 'Get' or method == 'GetInstance' or \
+               ('Set' + method[3:]) not in d:
+                continue
+            getter = getattr(klass, method)
+            if not static.search(getattr(getter, '__doc__', None) or ''):
+                continue
+            try:
+                value = getter()
+            except (TypeError, ValueError):
+                continue
+            if isinstance(value, tuple):
+                simple = all(isinstance(x, (int, float)) for x in value)
+            else:
+                simple = isinstance(value, (int, float, str))
+            if simple:
+                settings.append((getter, getattr(klass, 'Set' + method[3:])))
+    _global_settings = settings
+    return settings
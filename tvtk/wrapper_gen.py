@@ -27,6 +27,12 @@ from . import special_gen
 
 PY_VER = sys.version_info[0]
 
+# The classes whose wrappers delegate traits to their property class.
+# The code of these classes depends on the data of the property class.
+PROPERTY_DELEGATES = {'vtkActor': 'vtkProperty',
+                      'vtkActor2D': 'vtkProperty2D',
+                      'vtkVolume': 'vtkVolumeProperty'}
+
 
 def get_trait_def(value, **kwargs):
     """ Return the appropriate trait type, reformatted string and
@@ -519,11 +525,8 @@ class WrapperGenerator:
     def _generate_delegates(self, node, n_data, out):
         """This method generates delegates for specific classes.  It
         modifies the n_data dictionary."""
-        prop_name = {'vtkActor': 'vtkProperty',
-                     'vtkActor2D': 'vtkProperty2D',
-                     'vtkVolume': 'vtkVolumeProperty'}
-        if node.name in prop_name:
-            prop_node = self.get_tree().get_node(prop_name[node.name])
+        if node.name in PROPERTY_DELEGATES:
+            prop_node = self.get_tree().get_node(PROPERTY_DELEGATES[node.name])
             prop_data = prop_node.data
             # Update the data of the node so the view includes the
             # property traits.